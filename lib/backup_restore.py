@@ -1,8 +1,15 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import os
-import shutil
-from datetime import datetime
+import queue
+from datetime import datetime, timedelta
+
+from lib.backup_store import PAGE_SIZE, format_time, format_version, get_backup_store
+from lib.diff_view import open_diff_window
+from lib.scheduler import MINIMIZED, get_scheduler
+
+ALL = "All"
+POLL_INTERVAL = 0.5
 
 
 def get_frame(master):
@@ -16,52 +23,276 @@ def get_frame(master):
         bg="#1e1e1e",
     ).pack(pady=(0, 10))
 
-    os.makedirs("cfg_backups", exist_ok=True)
+    store = get_backup_store()
+    page = {"index": 0, "total": 0}
+    events = queue.Queue()
+
+    # === Filters ===
+    filter_frame = tk.Frame(frame, bg="#1e1e1e")
+    filter_frame.pack(fill="x", pady=(0, 5))
+    server_var = tk.StringVar(value=ALL)
+    config_var = tk.StringVar(value=ALL)
+    since_var = tk.StringVar()
+    until_var = tk.StringVar()
+    config_sources = {}
+
+    def option_menu(label, var):
+        tk.Label(filter_frame, text=label, bg="#1e1e1e", fg="white").pack(side="left")
+        menu = tk.OptionMenu(filter_frame, var, ALL)
+        menu.config(bg="#2b2b2b", fg="white", highlightthickness=0)
+        menu.pack(side="left", padx=(3, 10))
+        return menu
+
+    def date_entry(label, var):
+        tk.Label(filter_frame, text=label, bg="#1e1e1e", fg="white").pack(side="left")
+        entry = tk.Entry(
+            filter_frame,
+            textvariable=var,
+            width=11,
+            bg="#2b2b2b",
+            fg="white",
+            insertbackground="white",
+        )
+        entry.pack(side="left", padx=(3, 10))
+        entry.bind("<Return>", lambda e: apply_filters())
+
+    server_menu = option_menu("Server:", server_var)
+    config_menu = option_menu("Config:", config_var)
+    date_entry("From:", since_var)
+    date_entry("To:", until_var)
+    tk.Button(
+        filter_frame,
+        text="Apply",
+        command=lambda: apply_filters(),
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 9),
+    ).pack(side="left")
+
+    def set_options(menu, var, options):
+        menu["menu"].delete(0, "end")
+        for option in (ALL,) + tuple(options):
+            menu["menu"].add_command(
+                label=option,
+                command=lambda o=option: (var.set(o), apply_filters()),
+            )
+        if var.get() not in (ALL,) + tuple(options):
+            var.set(ALL)
+
+    def refresh_filters():
+        set_options(server_menu, server_var, store.servers())
+        config_sources.clear()
+        sources = store.sources()
+        names = [os.path.basename(s) for s in sources]
+        for source, name in zip(sources, names):
+            # Same file name in several server dirs: disambiguate with the parent
+            if names.count(name) > 1:
+                name = os.path.join(os.path.basename(os.path.dirname(source)), name)
+            config_sources[name] = source
+        set_options(config_menu, config_var, sorted(config_sources))
 
-    backup_listbox = tk.Listbox(
-        frame, bg="#252526", fg="white", font=("Consolas", 10), height=10
+    def parse_day(value, end=False):
+        value = value.strip()
+        if not value:
+            return None
+        day = datetime.strptime(value, "%Y-%m-%d")
+        return (day + timedelta(days=1) if end else day).timestamp()
+
+    def current_filters():
+        return dict(
+            server=None if server_var.get() == ALL else server_var.get(),
+            source=config_sources.get(config_var.get()),
+            since=parse_day(since_var.get()),
+            until=parse_day(until_var.get(), end=True),
+        )
+
+    # === Manifest view ===
+    tree = ttk.Treeview(
+        frame,
+        columns=("time", "server", "config", "size", "hash"),
+        show="headings",
+        height=12,
+    )
+    for column, heading, width in (
+        ("time", "Backed Up", 140),
+        ("server", "Server", 120),
+        ("config", "Config", 260),
+        ("size", "Size", 70),
+        ("hash", "Hash", 80),
+    ):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, stretch=column == "config")
+    tree.pack(fill="x")
+
+    pager = tk.Frame(frame, bg="#1e1e1e")
+    pager.pack(fill="x", pady=(3, 10))
+    prev_btn = tk.Button(
+        pager,
+        text="◀ Prev",
+        command=lambda: show_page(page["index"] - 1),
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 9),
+    )
+    prev_btn.pack(side="left")
+    page_label = tk.Label(pager, text="", bg="#1e1e1e", fg="#bbbbbb")
+    page_label.pack(side="left", padx=10)
+    next_btn = tk.Button(
+        pager,
+        text="Next ▶",
+        command=lambda: show_page(page["index"] + 1),
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 9),
     )
-    backup_listbox.pack(fill="x", pady=(0, 10), expand=False)
+    next_btn.pack(side="left")
+
+    def row_values(row):
+        return (
+            format_time(row["created"]),
+            row["server"] or "-",
+            row["source"],
+            f"{row['size']} B",
+            row["hash"][:8],
+        )
+
+    def update_pager():
+        pages = max(1, -(-page["total"] // PAGE_SIZE))
+        page_label.config(
+            text=f"Page {page['index'] + 1}/{pages} ({page['total']} version(s))"
+        )
+        prev_btn.config(state="normal" if page["index"] > 0 else "disabled")
+        next_btn.config(state="normal" if page["index"] < pages - 1 else "disabled")
+
+    def show_page(index):
+        filters = current_filters()
+        page["total"] = store.count(**filters)
+        pages = max(1, -(-page["total"] // PAGE_SIZE))
+        page["index"] = max(0, min(index, pages - 1))
+        tree.delete(*tree.get_children())
+        for row in store.query(offset=page["index"] * PAGE_SIZE, **filters):
+            tree.insert("", "end", iid=str(row["id"]), values=row_values(row))
+        update_pager()
+
+    def apply_filters():
+        try:
+            show_page(0)
+        except ValueError:
+            messagebox.showwarning("Invalid Date", "Dates must be YYYY-MM-DD.")
 
     def refresh_list():
-        backup_listbox.delete(0, "end")
-        for file in sorted(os.listdir("cfg_backups")):
-            if file.endswith(".cfg"):
-                backup_listbox.insert("end", file)
+        refresh_filters()
+        apply_filters()
+
+    def selected_ids():
+        return [int(iid) for iid in tree.selection()]
+
+    # === Incremental updates from the store ===
+    def on_store_event(event, payload):
+        events.put((event, payload))
+
+    def poll_events():
+        reload = False
+        while True:
+            try:
+                event, payload = events.get_nowait()
+            except queue.Empty:
+                break
+            if event == "added" and payload is not None:
+                if (
+                    payload["source"] not in config_sources.values()
+                    or payload["server"] and payload["server"] not in store.servers()
+                ):
+                    refresh_filters()
+                try:
+                    filters = current_filters()
+                except ValueError:
+                    continue
+                if not store.matches(payload, **filters):
+                    continue
+                page["total"] += 1
+                if page["index"] == 0 and not tree.exists(str(payload["id"])):
+                    tree.insert(
+                        "", 0, iid=str(payload["id"]), values=row_values(payload)
+                    )
+                    extra = tree.get_children()[PAGE_SIZE:]
+                    if extra:
+                        tree.delete(*extra)
+                update_pager()
+            elif event == "deleted":
+                if tree.exists(str(payload)):
+                    reload = True
+            else:
+                reload = True
+        if reload:
+            refresh_filters()
+            try:
+                show_page(page["index"])
+            except ValueError:
+                pass
+
+    store.add_listener(on_store_event)
+    frame.bind(
+        "<Destroy>",
+        lambda e: store.remove_listener(on_store_event) if e.widget is frame else None,
+    )
 
     def backup_file():
         files = filedialog.askopenfilenames(filetypes=[("CFG Files", "*.cfg")])
         if not files:
             return
         for path in files:
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            name = os.path.basename(path).replace(".cfg", "")
-            dest = f"cfg_backups/{name}_{timestamp}.cfg"
-            shutil.copy2(path, dest)
+            try:
+                store.backup(path)
+            except Exception as e:
+                messagebox.showerror("Backup Failed", f"{path}: {e}")
+                return
         messagebox.showinfo("Backup Complete", "Config(s) backed up.")
-        refresh_list()
 
     def restore_file():
-        sel = backup_listbox.curselection()
+        sel = selected_ids()
         if not sel:
             messagebox.showwarning("No Selection", "Select a backup to restore.")
             return
-        selected = backup_listbox.get(sel[0])
-        source = os.path.join("cfg_backups", selected)
-        dest = filedialog.asksaveasfilename(defaultextension=".cfg")
+        row = store.get(sel[0])
+        dest = filedialog.asksaveasfilename(
+            defaultextension=".cfg",
+            initialdir=os.path.dirname(row["source"]) or None,
+            initialfile=os.path.basename(row["source"]),
+        )
         if dest:
-            shutil.copy2(source, dest)
+            store.restore(sel[0], dest)
             messagebox.showinfo("Restored", f"Config restored to:{dest}")
 
     def delete_backup():
-        sel = backup_listbox.curselection()
+        sel = selected_ids()
         if not sel:
             messagebox.showwarning("No Selection", "Select a backup to delete.")
             return
-        selected = backup_listbox.get(sel[0])
-        os.remove(os.path.join("cfg_backups", selected))
-        refresh_list()
-        messagebox.showinfo("Deleted", f"{selected} deleted.")
+        for version_id in sel:
+            store.delete(version_id)
+        messagebox.showinfo("Deleted", f"{len(sel)} backup(s) deleted.")
+
+    def diff_versions():
+        # Two selections are compared directly; one is compared to its predecessor
+        sel = selected_ids()
+        if not sel:
+            messagebox.showwarning("No Selection", "Select a backup to compare.")
+            return
+        if len(sel) >= 2:
+            new, old = store.get(sel[0]), store.get(sel[1])
+        else:
+            new = store.get(sel[0])
+            old = store.previous(sel[0])
+            if old is None:
+                messagebox.showinfo("No History", "This is the oldest version.")
+                return
+        open_diff_window(
+            frame,
+            store.read_text(old["id"]),
+            store.read_text(new["id"]),
+            title=f"{format_version(old)}  ->  {format_version(new)}",
+        )
 
     tk.Button(
         frame,
@@ -81,6 +312,15 @@ def get_frame(master):
         font=("Segoe UI", 10),
     ).pack(pady=2, fill="x")
 
+    tk.Button(
+        frame,
+        text="🔍 Diff Selected",
+        command=diff_versions,
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 10),
+    ).pack(pady=2, fill="x")
+
     tk.Button(
         frame,
         text="🗑 Delete Selected",
@@ -91,4 +331,12 @@ def get_frame(master):
     ).pack(pady=(2, 6), fill="x")
 
     refresh_list()
+    # Store events queue up while the panel is hidden and are applied once
+    # it is shown again
+    get_scheduler(frame).add(
+        ("backup_restore", id(frame)),
+        poll_events,
+        lambda: POLL_INTERVAL if get_scheduler().visible(frame) else MINIMIZED,
+        widget=frame,
+    )
     return frame
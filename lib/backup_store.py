@@ -0,0 +1,340 @@
+import gzip
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from lib.file_utils import atomic_write
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+BACKUP_DIR = "cfg_backups"
+
+# Flat copies written by older versions: <name>_YYYY-MM-DD_HH-MM-SS.cfg
+LEGACY_RE = re.compile(r"^(?P<name>.+)_(?P<stamp>\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.cfg$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    created REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    legacy TEXT
+);
+CREATE INDEX IF NOT EXISTS versions_source ON versions(source, created);
+CREATE INDEX IF NOT EXISTS versions_hash ON versions(hash);
+CREATE INDEX IF NOT EXISTS versions_created ON versions(created);
+CREATE UNIQUE INDEX IF NOT EXISTS versions_legacy ON versions(legacy);
+CREATE TABLE IF NOT EXISTS legacy_deleted (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS source_servers (
+    source TEXT PRIMARY KEY,
+    server TEXT NOT NULL
+);
+"""
+
+COLUMNS = "id, source, server, created, size, hash"
+PAGE_SIZE = 100
+
+
+def content_sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class BackupStore:
+    # Content-addressed config history: every unique file body is stored once
+    # as objects/<ab>/<sha256>.gz, and versions(...) maps source paths to them.
+    def __init__(self, backup_dir=BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self.object_dir = os.path.join(backup_dir, "objects")
+        self.lock = threading.Lock()
+        os.makedirs(self.object_dir, exist_ok=True)
+        self.conn = sqlite3.connect(
+            os.path.join(backup_dir, "manifest.db"), check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row
+        self.listeners = []
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+            columns = [r[1] for r in self.conn.execute("PRAGMA table_info(versions)")]
+            if "server" not in columns:
+                self.conn.execute("ALTER TABLE versions ADD COLUMN server TEXT")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS versions_server ON versions(server, created)"
+            )
+            # Earlier imports keyed legacy copies by bare file name, which
+            # merged unrelated servers' configs; give each its own source again
+            for row in self.conn.execute(
+                "SELECT id, legacy FROM versions"
+                " WHERE legacy IS NOT NULL AND source NOT LIKE ?",
+                ("%" + os.sep + "%",),
+            ).fetchall():
+                self.conn.execute(
+                    "UPDATE versions SET source = ?, server = NULL WHERE id = ?",
+                    (self.legacy_source(row["legacy"]), row["id"]),
+                )
+        self.import_legacy()
+
+    # Listeners get ("added", row) or ("deleted", id), possibly off the Tk thread
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def notify(self, event, payload):
+        for callback in list(self.listeners):
+            try:
+                callback(event, payload)
+            except Exception:
+                logger.exception("Listener failed")
+
+    def assign_server(self, path, server):
+        # Server tabs register their cfg so backups of it are attributed to them
+        if not path or not server:
+            return
+        source = os.path.abspath(path)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO source_servers (source, server) VALUES (?, ?)",
+                (source, server),
+            )
+            self.conn.execute(
+                "UPDATE versions SET server = ? WHERE source = ? AND server IS NULL",
+                (server, source),
+            )
+
+    def object_path(self, digest):
+        return os.path.join(self.object_dir, digest[:2], digest + ".gz")
+
+    def _store_object(self, digest, data):
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, gzip.compress(data))
+
+    def _insert(self, source, data, created, legacy=None, server=None):
+        digest = content_sha256(data)
+        self._store_object(digest, data)
+        if server is None:
+            row = self.conn.execute(
+                "SELECT server FROM source_servers WHERE source = ?", (source,)
+            ).fetchone()
+            server = row["server"] if row else None
+        cur = self.conn.execute(
+            "INSERT INTO versions (source, server, created, size, hash, legacy)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (source, server, created, len(data), digest, legacy),
+        )
+        return cur.lastrowid
+
+    def backup(self, path, data=None, server=None):
+        # Returns the version id; saving unchanged content reuses the latest one
+        source = os.path.abspath(path)
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        digest = content_sha256(data)
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT id, hash FROM versions WHERE source = ?"
+                " ORDER BY created DESC LIMIT 1",
+                (source,),
+            ).fetchone()
+            if row and row["hash"] == digest:
+                return row["id"]
+            version_id = self._insert(source, data, time.time(), server=server)
+        self.notify("added", self.get(version_id))
+        return version_id
+
+    def import_legacy(self):
+        try:
+            names = os.listdir(self.backup_dir)
+        except OSError:
+            return 0
+        imported = []
+        with self.lock, self.conn:
+            # Imported copies, plus ones the user deleted after importing
+            known = {
+                r[0]
+                for r in self.conn.execute(
+                    "SELECT legacy FROM versions WHERE legacy IS NOT NULL"
+                    " UNION SELECT name FROM legacy_deleted"
+                )
+            }
+            for name in names:
+                match = LEGACY_RE.match(name)
+                if not match or name in known:
+                    continue
+                try:
+                    with open(os.path.join(self.backup_dir, name), "rb") as f:
+                        data = f.read()
+                    created = datetime.strptime(
+                        match.group("stamp"), "%Y-%m-%d_%H-%M-%S"
+                    ).timestamp()
+                except (OSError, ValueError):
+                    continue
+                # Original locations weren't recorded, and a bare "server.cfg"
+                # could belong to any tab, so each copy keeps its own path as
+                # the source and stays unattributed. The flat files are left
+                # in place; the legacy column stops them being imported twice.
+                self._insert(self.legacy_source(name), data, created, legacy=name)
+                imported.append(name)
+        if imported:
+            self.notify("added", None)
+        return len(imported)
+
+    def legacy_source(self, name):
+        return os.path.abspath(os.path.join(self.backup_dir, name))
+
+    # === Queries ===
+    def get(self, version_id):
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {COLUMNS} FROM versions WHERE id = ?", (version_id,)
+            ).fetchone()
+
+    def history(self, source):
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {COLUMNS} FROM versions WHERE source = ?"
+                " ORDER BY created DESC",
+                (source,),
+            ).fetchall()
+
+    def _where(self, server=None, source=None, since=None, until=None):
+        clauses, params = [], []
+        if server:
+            clauses.append("server = ?")
+            params.append(server)
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(until)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, server=None, source=None, since=None, until=None,
+              limit=PAGE_SIZE, offset=0):
+        where, params = self._where(server, source, since, until)
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {COLUMNS} FROM versions{where}"
+                " ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+
+    def count(self, server=None, source=None, since=None, until=None):
+        where, params = self._where(server, source, since, until)
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT COUNT(*) FROM versions{where}", params
+            ).fetchone()[0]
+
+    def matches(self, row, server=None, source=None, since=None, until=None):
+        return (
+            (not server or row["server"] == server)
+            and (not source or row["source"] == source)
+            and (since is None or row["created"] >= since)
+            and (until is None or row["created"] < until)
+        )
+
+    def servers(self):
+        with self.lock:
+            return [
+                r[0]
+                for r in self.conn.execute(
+                    "SELECT DISTINCT server FROM versions"
+                    " WHERE server IS NOT NULL ORDER BY server"
+                )
+            ]
+
+    def sources(self):
+        with self.lock:
+            return [
+                r[0]
+                for r in self.conn.execute(
+                    "SELECT DISTINCT source FROM versions ORDER BY source"
+                )
+            ]
+
+    def previous(self, version_id):
+        row = self.get(version_id)
+        if row is None:
+            return None
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {COLUMNS} FROM versions WHERE source = ? AND created < ?"
+                " ORDER BY created DESC LIMIT 1",
+                (row["source"], row["created"]),
+            ).fetchone()
+
+    def read(self, version_id):
+        row = self.get(version_id)
+        if row is None:
+            raise KeyError(version_id)
+        with gzip.open(self.object_path(row["hash"]), "rb") as f:
+            return f.read()
+
+    def read_text(self, version_id):
+        return self.read(version_id).decode("utf-8", errors="replace")
+
+    # === Restore / delete ===
+    def restore(self, version_id, dest):
+        atomic_write(dest, self.read(version_id))
+
+    def delete(self, version_id):
+        with self.lock:
+            with self.conn:
+                row = self.conn.execute(
+                    "SELECT hash, legacy FROM versions WHERE id = ?", (version_id,)
+                ).fetchone()
+                if row is None:
+                    return
+                if row["legacy"]:
+                    # The flat file stays on disk; remember it so it isn't re-imported
+                    self.conn.execute(
+                        "INSERT OR IGNORE INTO legacy_deleted (name) VALUES (?)",
+                        (row["legacy"],),
+                    )
+                self.conn.execute("DELETE FROM versions WHERE id = ?", (version_id,))
+                still_used = self.conn.execute(
+                    "SELECT 1 FROM versions WHERE hash = ? LIMIT 1", (row["hash"],)
+                ).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self.object_path(row["hash"]))
+                except OSError:
+                    pass
+        self.notify("deleted", version_id)
+
+    def disk_usage(self):
+        total = 0
+        for root, _, files in os.walk(self.object_dir):
+            for name in files:
+                total += os.path.getsize(os.path.join(root, name))
+        return total
+
+
+def format_time(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def format_version(row):
+    return f"{format_time(row['created'])}  {os.path.basename(row['source'])}"
+
+
+get_backup_store = lazy_singleton(BackupStore)
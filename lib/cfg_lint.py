@@ -0,0 +1,192 @@
+import os
+from collections import namedtuple
+
+from lib.cfg_parser import load_cfg, parse_text
+
+Issue = namedtuple("Issue", "severity file line message")
+
+# Only definite breakage is an "error" (and stops a server from starting): a
+# missing file or exec target, a non-numeric integer dvar, a rotation entry
+# without its map. The tables below are best guesses about what the game
+# accepts, so anything judged against them is only a warning.
+
+GAMETYPES = {
+    "war", "dm", "dom", "sd", "sab", "koth", "hp", "conf", "ctf", "dd",
+    "gun", "infect", "oic", "gtnw", "vip", "arena", "tdef",
+}
+
+MAPS = {
+    # Modern Warfare 2
+    "mp_afghan", "mp_boneyard", "mp_brecourt", "mp_checkpoint", "mp_derail",
+    "mp_estate", "mp_favela", "mp_highrise", "mp_invasion", "mp_nightshift",
+    "mp_quarry", "mp_rundown", "mp_rust", "mp_subbase", "mp_terminal",
+    "mp_underpass", "mp_abandon", "mp_complex", "mp_compact", "mp_crash",
+    "mp_fuel2", "mp_overgrown", "mp_storm", "mp_strike", "mp_trailerpark",
+    "mp_vacant",
+    # Modern Warfare Remastered
+    "mp_backlot", "mp_bloc", "mp_bog", "mp_broadcast", "mp_cargoship",
+    "mp_carentan", "mp_citystreets", "mp_convoy", "mp_countdown", "mp_creek",
+    "mp_crossfire", "mp_farm", "mp_killhouse", "mp_pipeline", "mp_shipment",
+    "mp_showdown", "mp_crash_snow",
+}
+
+# name -> (type, min, max); "string" and "rotation" ignore the bounds
+DVAR_SCHEMA = {
+    "sv_hostname": ("string", None, None),
+    "rcon_password": ("string", None, None),
+    "g_password": ("string", None, None),
+    "sv_motd": ("string", None, None),
+    "sv_maxclients": ("int", 1, 18),
+    "sv_privateclients": ("int", 0, 18),
+    "party_maxplayers": ("int", 1, 18),
+    "net_port": ("int", 1, 65535),
+    "net_ip": ("string", None, None),
+    "sv_timeout": ("int", 1, 600),
+    "sv_connecttimeout": ("int", 1, 600),
+    "sv_kickbantime": ("int", 0, 86400),
+    "sv_floodprotect": ("bool", None, None),
+    "sv_pure": ("bool", None, None),
+    "sv_allowclientconsole": ("bool", None, None),
+    "sv_allowanonymous": ("bool", None, None),
+    "sv_maxrate": ("int", 0, 100000),
+    "sv_maxping": ("int", 0, 1000),
+    "sv_minping": ("int", 0, 1000),
+    "sv_fps": ("int", 10, 1000),
+    "sv_mapRotation": ("rotation", None, None),
+    "sv_mapRotationCurrent": ("rotation", None, None),
+    "sv_randomMapRotation": ("bool", None, None),
+    "g_gametype": ("gametype", None, None),
+    "g_log": ("string", None, None),
+    "g_logsync": ("int", 0, 3),
+    "g_inactivity": ("int", 0, 3600),
+    "g_deadchat": ("bool", None, None),
+    "g_allowvote": ("bool", None, None),
+    "g_teamname_allies": ("string", None, None),
+    "g_teamname_axis": ("string", None, None),
+    "g_hardcore": ("bool", None, None),
+    "logfile": ("int", 0, 2),
+    "com_maxfps": ("int", 0, 1000),
+}
+SCHEMA = {name.lower(): spec for name, spec in DVAR_SCHEMA.items()}
+
+# Game-mode and UI dvars are too numerous to list; accept them by prefix
+KNOWN_PREFIXES = ("scr_", "ui_", "party_", "perk_", "bg_", "cg_", "sv_hmw", "hmw_")
+
+
+def check_value(dvar, spec):
+    # -> (severity, message) or None
+    kind, low, high = spec
+    value = dvar.value
+    if kind == "int":
+        try:
+            number = int(value)
+        except ValueError:
+            return "error", f"{dvar.name} expects an integer, got {value!r}"
+        if low is not None and number < low or high is not None and number > high:
+            return "warning", f"{dvar.name}={number} is outside {low}..{high}"
+    elif kind == "bool":
+        if value not in ("0", "1"):
+            return "warning", f"{dvar.name} expects 0 or 1, got {value!r}"
+    elif kind == "gametype":
+        if value.lower() not in GAMETYPES:
+            return "warning", f"Unknown gametype {value!r}"
+    return None
+
+
+def check_rotation(dvar):
+    issues = []
+    tokens = dvar.value.split()
+    if len(tokens) % 2:
+        issues.append(
+            Issue("error", dvar.file, dvar.line, f"{dvar.name} has a dangling token")
+        )
+    for key, arg in zip(tokens[::2], tokens[1::2]):
+        key = key.lower()
+        if key == "gametype":
+            if arg.lower() not in GAMETYPES:
+                issues.append(
+                    Issue("warning", dvar.file, dvar.line, f"Unknown gametype {arg!r}")
+                )
+        elif key == "map":
+            if arg.lower() not in MAPS:
+                issues.append(
+                    Issue("warning", dvar.file, dvar.line, f"Unknown map {arg!r}")
+                )
+        else:
+            issues.append(
+                Issue(
+                    "warning",
+                    dvar.file,
+                    dvar.line,
+                    f"Invalid rotation keyword {key!r} (expected gametype/map)",
+                )
+            )
+    return issues
+
+
+def lint_model(model):
+    issues = []
+    first_seen = {}
+    for dvar in model.assignments:
+        name = dvar.name.lower()
+        if name in first_seen:
+            earlier = first_seen[name]
+            where = "" if earlier.file == dvar.file else f" of {os.path.basename(earlier.file)}"
+            issues.append(
+                Issue(
+                    "warning",
+                    dvar.file,
+                    dvar.line,
+                    f"{dvar.name} overrides the value set on line {earlier.line}{where}",
+                )
+            )
+        first_seen[name] = dvar
+
+        spec = SCHEMA.get(name)
+        if spec is None:
+            if not name.startswith(KNOWN_PREFIXES):
+                issues.append(
+                    Issue("warning", dvar.file, dvar.line, f"Unknown dvar {dvar.name}")
+                )
+        elif spec[0] == "rotation":
+            issues.extend(check_rotation(dvar))
+        else:
+            problem = check_value(dvar, spec)
+            if problem:
+                issues.append(Issue(problem[0], dvar.file, dvar.line, problem[1]))
+
+    for include in model.execs:
+        if include.resolved is None:
+            issues.append(
+                Issue(
+                    "error",
+                    include.file,
+                    include.line,
+                    f"exec target {include.target!r} not found",
+                )
+            )
+
+    uses_rotation = any(c.name == "map_rotate" for c in model.commands)
+    if uses_rotation and "sv_maprotation" not in model.dvars:
+        issues.append(
+            Issue("warning", model.path, 0, "map_rotate used but sv_mapRotation is unset")
+        )
+    return sorted(issues, key=lambda i: (i.file != model.path, i.file, i.line))
+
+
+def lint_text(content, path, game_dir=None):
+    return lint_model(parse_text(content, path, game_dir=game_dir))
+
+
+def lint_file(path, game_dir=None):
+    # Cached on the parser's model, so unchanged files are only linted once
+    model = load_cfg(path, game_dir)
+    if model is None:
+        return [Issue("error", path, 0, "Config file not found")]
+    if model.issues is None:
+        model.issues = lint_model(model)
+    return model.issues
+
+
+def errors(issues):
+    return [i for i in issues if i.severity == "error"]
@@ -0,0 +1,234 @@
+import functools
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+SET_COMMANDS = ("set", "seta", "sets", "setu")
+EXEC_COMMAND = "exec"
+CACHE_SIZE = 32
+LINE_CACHE_SIZE = 4096
+
+TOKEN_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+Dvar = namedtuple("Dvar", "name value command file line")
+Exec = namedtuple("Exec", "target resolved file line")
+Command = namedtuple("Command", "name args file line")
+
+
+def split_commands(line):
+    # Strips a trailing // comment and splits on ';' (both outside quotes)
+    commands = []
+    current = []
+    in_quote = False
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if ch == '"':
+            in_quote = not in_quote
+        elif not in_quote and line.startswith("//", i):
+            break
+        elif not in_quote and ch == ";":
+            commands.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+    commands.append("".join(current))
+    return [c.strip() for c in commands if c.strip()]
+
+
+def tokenize(command):
+    return [m.group(1) if m.group(1) is not None else m.group(2)
+            for m in TOKEN_RE.finditer(command)]
+
+
+@functools.lru_cache(maxsize=LINE_CACHE_SIZE)
+def parse_line(line):
+    # Re-parsing an edited buffer only tokenizes the lines that changed
+    return tuple(tuple(tokenize(command)) for command in split_commands(line))
+
+
+def parse_rotation(value):
+    # "gametype war map mp_rust map mp_terminal" -> [("war", "mp_rust"), ...]
+    rotation = []
+    gametype = None
+    tokens = value.split()
+    for key, arg in zip(tokens[::2], tokens[1::2]):
+        if key.lower() == "gametype":
+            gametype = arg
+        elif key.lower() == "map":
+            rotation.append((gametype, arg))
+    return rotation
+
+
+def exec_candidates(target, including_file, game_dir):
+    # The game resolves exec against its own folder, not the including cfg's
+    names = [target] if target.lower().endswith(".cfg") else [target + ".cfg", target]
+    dirs = [os.path.dirname(including_file), game_dir]
+    dirs += [os.path.join(game_dir, sub) for sub in ("main", "players2")]
+    candidates = []
+    for directory in dirs:
+        for name in names:
+            candidate = os.path.abspath(os.path.join(directory, name))
+            if candidate not in candidates:
+                candidates.append(candidate)
+    return candidates
+
+
+def resolve_exec(target, including_file, game_dir):
+    # Returns (path or None, every candidate that was tried)
+    candidates = exec_candidates(target, including_file, game_dir)
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate, candidates
+    return None, candidates
+
+
+class CfgModel:
+    def __init__(self, path):
+        self.path = path
+        self.dvars = {}
+        self.assignments = []
+        self.execs = []
+        self.commands = []
+        self.deps = []
+        self.issues = None
+
+    def get(self, name, default=None):
+        dvar = self.dvars.get(name.lower())
+        return dvar.value if dvar else default
+
+    @property
+    def map_rotation(self):
+        return parse_rotation(self.get("sv_mapRotation", ""))
+
+
+def parse_text(content, path, model=None, game_dir=None, seen=None):
+    # Parses one cfg buffer into `model`, following exec includes from disk.
+    # game_dir is the server executable's folder; without one the cfg's own
+    # folder stands in for it.
+    path = os.path.abspath(path)
+    model = model or CfgModel(path)
+    game_dir = game_dir or os.path.dirname(path)
+    seen = seen if seen is not None else set()
+    seen.add(os.path.normcase(path))
+
+    for number, line in enumerate(content.splitlines(), 1):
+        for tokens in parse_line(line):
+            if not tokens:
+                continue
+            name = tokens[0].lower()
+            if name in SET_COMMANDS and len(tokens) >= 2:
+                value = " ".join(tokens[2:])
+                dvar = Dvar(tokens[1], value, name, path, number)
+                model.dvars[tokens[1].lower()] = dvar
+                model.assignments.append(dvar)
+            elif name == EXEC_COMMAND and len(tokens) >= 2:
+                resolved, candidates = resolve_exec(tokens[1], path, game_dir)
+                model.execs.append(Exec(tokens[1], resolved, path, number))
+                if resolved is None:
+                    # Remember the misses so creating any of them invalidates the cache
+                    model.deps.extend((c, None, None) for c in candidates)
+                elif os.path.normcase(resolved) not in seen:
+                    include_file(resolved, model, game_dir, seen)
+            else:
+                model.commands.append(Command(name, list(tokens[1:]), path, number))
+    return model
+
+
+def include_file(path, model, game_dir, seen):
+    # Merges the cached parse of an exec target, unless it loops back into a
+    # file that is already part of this parse
+    included = None
+    if cache_key(path, game_dir) not in loading_keys():
+        included = load_cfg(path, game_dir)
+    if included is None or any(
+        os.path.normcase(dep) in seen for dep, mtime, _ in included.deps if mtime
+    ):
+        parse_file(path, model, game_dir, seen)
+        return
+    for dvar in included.assignments:
+        model.dvars[dvar.name.lower()] = dvar
+    model.assignments.extend(included.assignments)
+    model.execs.extend(included.execs)
+    model.commands.extend(included.commands)
+    model.deps.extend(included.deps)
+    seen.update(os.path.normcase(dep) for dep, mtime, _ in included.deps if mtime)
+
+
+def parse_file(path, model=None, game_dir=None, seen=None):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read()
+    model = model or CfgModel(path)
+    model.deps.append((path, stat.st_mtime_ns, stat.st_size))
+    return parse_text(content, path, model, game_dir, seen)
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_loading = threading.local()
+
+
+def cache_key(path, game_dir):
+    game_dir = os.path.abspath(game_dir) if game_dir else ""
+    return os.path.normcase(os.path.abspath(path)), os.path.normcase(game_dir)
+
+
+def loading_keys():
+    # Models this thread is parsing right now; an include cycle must not
+    # start loading them again
+    if not hasattr(_loading, "keys"):
+        _loading.keys = set()
+    return _loading.keys
+
+
+def is_fresh(model):
+    for path, mtime, size in model.deps:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            if mtime is None:
+                continue
+            return False
+        if mtime is None:
+            return False
+        if stat.st_mtime_ns != mtime or stat.st_size != size:
+            return False
+    return True
+
+
+def load_cfg(path, game_dir=None):
+    # Cached parse keyed by path and game folder; reused while the file and its
+    # includes keep the same mtime and size. Returns None when the file doesn't
+    # exist.
+    if not path or not os.path.isfile(path):
+        return None
+    if game_dir:
+        game_dir = os.path.abspath(game_dir)
+    key = cache_key(path, game_dir)
+    with _cache_lock:
+        model = _cache.get(key)
+        if model is not None and is_fresh(model):
+            _cache.move_to_end(key)
+            return model
+    loading = loading_keys()
+    loading.add(key)
+    try:
+        model = parse_file(path, game_dir=game_dir)
+    finally:
+        loading.discard(key)
+    with _cache_lock:
+        _cache[key] = model
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return model
+
+
+def get_dvar(path, name, default=None):
+    model = load_cfg(path)
+    return model.get(name, default) if model else default
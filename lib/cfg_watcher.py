@@ -0,0 +1,225 @@
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+from lib.backup_store import get_backup_store
+from lib.cfg_parser import load_cfg
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+# Editors often save in several steps (truncate, write, rename); wait for quiet
+DEBOUNCE = 1.0
+POLL_INTERVAL = 2.0
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    # Minimal ctypes binding; watches directories so atomic-rename saves are seen
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self.wds = {}
+
+    def add_dir(self, directory):
+        if directory in self.dirs:
+            return
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(directory), ctypes.c_uint32(WATCH_MASK)
+        )
+        if wd >= 0:
+            self.dirs[directory] = wd
+            self.wds[wd] = directory
+
+    def remove_dir(self, directory):
+        wd = self.dirs.pop(directory, None)
+        if wd is not None:
+            self.wds.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self):
+        paths = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                directory = self.wds.get(wd)
+                if directory and name:
+                    paths.add(os.path.join(directory, os.fsdecode(name)))
+        return paths
+
+
+def file_stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CfgWatcher:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.owners = {}
+        self.files = {}
+        self.stats = {}
+        self.hashes = {}
+        self.pending = {}
+        self.dirty = True
+        self.wake_event = threading.Event()
+        self.inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                self.inotify = Inotify()
+                self.wake_r, self.wake_w = os.pipe()
+            except (OSError, AttributeError) as e:
+                logger.warning("inotify unavailable, polling instead: %s", e)
+                self.inotify = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # === Registration (any thread) ===
+    def watch(self, key, path, server=None):
+        with self.lock:
+            if path:
+                self.owners[key] = (os.path.abspath(path), server)
+            else:
+                self.owners.pop(key, None)
+            self.dirty = True
+        self.wake()
+
+    def unwatch(self, key):
+        with self.lock:
+            self.owners.pop(key, None)
+            self.dirty = True
+        self.wake()
+
+    def wake(self):
+        if self.inotify:
+            os.write(self.wake_w, b"\0")
+        else:
+            self.wake_event.set()
+
+    # === Watcher thread ===
+    def _rebuild(self):
+        with self.lock:
+            owners = list(self.owners.values())
+            self.dirty = False
+        files = {}
+        for path, server in owners:
+            deps = [path]
+            try:
+                model = load_cfg(path)
+            except Exception:
+                model = None
+            if model:
+                # Missing includes are watched too, so creating one is noticed
+                deps += [dep for dep, _, _ in model.deps]
+            for dep in deps:
+                files.setdefault(os.path.abspath(dep), set()).add(server)
+
+        now = time.monotonic()
+        for path in files:
+            if path not in self.files:
+                # First sight: record a baseline snapshot (deduplicated by the store)
+                self.stats[path] = file_stat(path)
+                self.pending[path] = now
+        for path in set(self.files) - set(files):
+            self.stats.pop(path, None)
+            self.hashes.pop(path, None)
+            self.pending.pop(path, None)
+        self.files = files
+
+        if self.inotify:
+            dirs = {os.path.dirname(p) for p in files}
+            for directory in set(self.inotify.dirs) - dirs:
+                self.inotify.remove_dir(directory)
+            for directory in dirs:
+                self.inotify.add_dir(directory)
+
+    def _wait(self, timeout):
+        changed = set()
+        if self.inotify:
+            ready, _, _ = select.select([self.inotify.fd, self.wake_r], [], [], timeout)
+            if self.wake_r in ready:
+                os.read(self.wake_r, 4096)
+            if self.inotify.fd in ready:
+                changed = self.inotify.read() & set(self.files)
+        else:
+            self.wake_event.wait(timeout)
+            self.wake_event.clear()
+            for path in self.files:
+                stat = file_stat(path)
+                if stat != self.stats.get(path):
+                    self.stats[path] = stat
+                    changed.add(path)
+        return changed
+
+    def _snapshot(self, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return
+        digest = hashlib.sha256(data).hexdigest()
+        if digest == self.hashes.get(path):
+            return
+        self.hashes[path] = digest
+        servers = self.files.get(path, set())
+        # Shared includes aren't attributed to any single server
+        server = next(iter(servers)) if len(servers) == 1 else None
+        get_backup_store().backup(path, data, server=server)
+        # The cfg's exec includes may have changed too
+        self.dirty = True
+
+    def _run(self):
+        while True:
+            try:
+                if self.dirty:
+                    self._rebuild()
+                now = time.monotonic()
+                if self.pending:
+                    timeout = max(0, min(self.pending.values()) - now)
+                else:
+                    timeout = None if self.inotify else POLL_INTERVAL
+                for path in self._wait(timeout):
+                    self.pending[path] = time.monotonic() + DEBOUNCE
+                now = time.monotonic()
+                for path, due in list(self.pending.items()):
+                    if due <= now:
+                        del self.pending[path]
+                        self._snapshot(path)
+            except Exception:
+                logger.exception("Watcher pass failed")
+                time.sleep(POLL_INTERVAL)
+
+
+get_watcher = lazy_singleton(CfgWatcher)
@@ -1,10 +1,106 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
-import shutil
+import queue
 import re
-from datetime import datetime
-from difflib import unified_diff
+import threading
+
+from lib.cfg_lint import Issue, lint_file, lint_text
+from lib.backup_store import get_backup_store
+from lib.cfg_parser import EXEC_COMMAND, SET_COMMANDS, load_cfg
+from lib.diff_view import open_diff_window
+from lib.text_search import TextIndexer, compile_pattern, find_spans
+
+KEYWORDS = SET_COMMANDS + (EXEC_COMMAND, "bind", "map_rotate")
+TOKEN_RE = re.compile(
+    r"(?P<comment>//.*)"
+    r'|(?P<quote>"[^"]+")'
+    rf"|(?P<keyword>\b(?:{'|'.join(KEYWORDS)})\b)"
+)
+HIGHLIGHT_DELAY = 120
+HIGHLIGHT_CHUNK = 400
+LINT_DELAY = 500
+COUNT_DELAY = 250
+DIRTY_DELAY = 300
+STATUS_DELAY = 200
+
+
+def install_change_hook(text, on_change):
+    # Route the widget's Tcl command through a proxy so every insert/delete
+    # reports the line range it touched: on_change(first_line, last_line, delta)
+    orig = text._w + "_orig"
+    text.tk.call("rename", text._w, orig)
+
+    def line_of(index):
+        return int(str(text.tk.call(orig, "index", index)).split(".")[0])
+
+    def proxy(cmd, *args):
+        first = last = None
+        if cmd in ("insert", "delete", "replace") and args:
+            first = line_of(args[0])
+            last = line_of(args[1]) if cmd != "insert" and len(args) > 1 else first
+        # Errors propagate so callers (and Tk's own bindings) still see them;
+        # only edits that actually happened are reported
+        result = text.tk.call((orig, cmd) + args)
+        if first is not None:
+            if cmd == "insert":
+                added = sum(chunk.count("\n") for chunk in args[1::2])
+            elif cmd == "replace":
+                added = args[2].count("\n") if len(args) > 2 else 0
+            else:
+                added = 0
+            on_change(first, last, added - (last - first))
+        return result
+
+    text.tk.createcommand(text._w, proxy)
+
+
+class SyntaxHighlighter:
+    def __init__(self, text):
+        self.text = text
+        self.dirty = None
+        self.job = None
+
+    def mark_dirty(self, first, last, delta):
+        end = first + max(0, last - first + delta)
+        if self.dirty:
+            lo, hi = self.dirty
+            if hi > last:
+                hi += delta
+            elif hi >= first:
+                hi = end
+            self.dirty = (min(lo, first), max(hi, end))
+        else:
+            self.dirty = (first, end)
+        if self.job:
+            self.text.after_cancel(self.job)
+        self.job = self.text.after(HIGHLIGHT_DELAY, self.run)
+
+    def mark_all(self):
+        self.mark_dirty(1, int(self.text.index("end-1c").split(".")[0]), 0)
+
+    def run(self):
+        self.job = None
+        if not self.dirty:
+            return
+        lo, hi = self.dirty
+        hi = min(hi, int(self.text.index("end-1c").split(".")[0]))
+        stop = min(hi, lo + HIGHLIGHT_CHUNK - 1)
+        self.highlight_lines(lo, stop)
+        # Large ranges (e.g. a freshly opened file) are done in slices
+        self.dirty = (stop + 1, hi) if stop < hi else None
+        if self.dirty:
+            self.job = self.text.after(1, self.run)
+
+    def highlight_lines(self, lo, hi):
+        text = self.text
+        for tag in ("keyword", "comment", "quote"):
+            text.tag_remove(tag, f"{lo}.0", f"{hi}.end")
+        chunk = text.get(f"{lo}.0", f"{hi}.end")
+        for i, line in enumerate(chunk.split("\n"), lo):
+            for match in TOKEN_RE.finditer(line):
+                kind = match.lastgroup
+                text.tag_add(kind, f"{i}.{match.start()}", f"{i}.{match.end()}")
 
 
 def get_frame(master):
@@ -41,26 +137,6 @@ def get_frame(master):
     def get_colors():
         return DARK if theme["dark"] else LIGHT
 
-    def highlight_syntax(event=None):
-        c = get_colors()
-        text.tag_remove("keyword", "1.0", "end")
-        text.tag_remove("comment", "1.0", "end")
-        text.tag_remove("quote", "1.0", "end")
-        for i, line in enumerate(text.get("1.0", "end-1c").split("\n"), 1):
-            if "//" in line:
-                start = line.index("//")
-                text.tag_add("comment", f"{i}.{start}", f"{i}.end")
-            for match in re.finditer(r'"[^"]+"', line):
-                text.tag_add("quote", f"{i}.{match.start()}", f"{i}.{match.end()}")
-            for kw in ("set", "bind", "exec", "map_rotate"):
-                for match in re.finditer(rf"\b{kw}\b", line):
-                    text.tag_add(
-                        "keyword", f"{i}.{match.start()}", f"{i}.{match.end()}"
-                    )
-        text.tag_config("keyword", foreground=c["keyword"])
-        text.tag_config("comment", foreground=c["comment"])
-        text.tag_config("quote", foreground=c["quote"])
-
     tk.Label(
         frame,
         text="📝 Config Editor",
@@ -93,7 +169,84 @@ def get_frame(master):
     v_scroll.config(command=text.yview)
     h_scroll.config(command=text.xview)
 
-    text.bind("<KeyRelease>", highlight_syntax)
+    text.tag_config("keyword", foreground=get_colors()["keyword"])
+    text.tag_config("comment", foreground=get_colors()["comment"])
+    text.tag_config("quote", foreground=get_colors()["quote"])
+    highlighter = SyntaxHighlighter(text)
+
+    def on_text_change(first, last, delta):
+        highlighter.mark_dirty(first, last, delta)
+        update_line_hashes(first, last, delta)
+        schedule_lint()
+        schedule_dirty_check()
+
+    def buffer():
+        return text.get("1.0", "end-1c")
+
+    def hash_lines(content):
+        return [hash(line) for line in content.split("\n")]
+
+    # One hash per line, kept in step with the buffer from the change hook so
+    # an edit only re-reads the lines it touched
+    line_hashes = {"saved": hash_lines(""), "current": hash_lines("")}
+
+    def update_line_hashes(first, last, delta):
+        current = line_hashes["current"]
+        end = max(first, last + delta)
+        # "end" indexes one line past the last; clamp to the pre-edit buffer
+        first = min(first, max(1, len(current)))
+        last = min(last, len(current))
+        end = max(first, min(end, int(text.index("end-1c").split(".")[0])))
+        current[first - 1:last] = hash_lines(text.get(f"{first}.0", f"{end}.end"))
+        if len(current) != int(text.index("end-1c").split(".")[0]):
+            line_hashes["current"] = hash_lines(buffer())
+
+    # The Text modified flag answers most dirty checks in O(1). While it is
+    # set, the debounced check compares line hashes to clear it again, e.g.
+    # after undoing back to the saved state; only save and close compare the
+    # full text.
+    def is_dirty():
+        if not text.edit_modified():
+            return False
+        if buffer() == current_file["original"]:
+            text.edit_modified(False)
+            return False
+        return True
+
+    dirty_job = {"id": None}
+
+    def schedule_dirty_check():
+        if dirty_job["id"]:
+            text.after_cancel(dirty_job["id"])
+        dirty_job["id"] = text.after(DIRTY_DELAY, check_dirty)
+
+    def check_dirty():
+        dirty_job["id"] = None
+        if text.edit_modified() and line_hashes["current"] == line_hashes["saved"]:
+            text.edit_modified(False)
+
+    def mark_saved(content):
+        current_file["original"] = content
+        line_hashes["saved"] = hash_lines(content)
+        line_hashes["current"] = list(line_hashes["saved"])
+        text.edit_modified(False)
+
+    install_change_hook(text, on_text_change)
+
+    status_job = {"id": None}
+
+    def schedule_status():
+        # The status line re-reads the cfg model, so edits only refresh it
+        # after a pause
+        if status_job["id"]:
+            text.after_cancel(status_job["id"])
+        status_job["id"] = text.after(STATUS_DELAY, run_status)
+
+    def run_status():
+        status_job["id"] = None
+        update_status()
+
+    text.bind("<<Modified>>", lambda e: schedule_status())
     text.bind("<Control-z>", lambda e: text.edit_undo())
     text.bind("<Control-y>", lambda e: text.edit_redo())
 
@@ -129,30 +282,102 @@ def get_frame(master):
         insertbackground="white",
     ).pack(side="left", padx=3)
 
-    def search_text():
-        text.tag_remove("highlight", "1.0", "end")
+    regex_var = tk.BooleanVar(value=False)
+    case_var = tk.BooleanVar(value=True)
+    for label, var in (("Regex", regex_var), ("Match case", case_var)):
+        tk.Checkbutton(
+            search_frame,
+            text=label,
+            variable=var,
+            command=lambda: schedule_count(),
+            bg=get_colors()["bg"],
+            fg=get_colors()["fg"],
+            selectcolor=get_colors()["bg"],
+            font=("Segoe UI", 9),
+        ).pack(side="left", padx=3)
+    match_label = tk.Label(
+        search_frame,
+        text="",
+        bg=get_colors()["bg"],
+        fg="gray",
+        font=("Segoe UI", 9),
+    )
+    match_label.pack(side="left", padx=(10, 0))
+    text.tag_config(
+        "highlight", background=get_colors()["highlight"], foreground="yellow"
+    )
+    count_job = {"id": None}
+
+    def current_pattern():
         term = search_var.get()
         if not term:
+            match_label.config(text="")
+            return None
+        try:
+            return compile_pattern(term, regex_var.get(), case_var.get())
+        except re.error as e:
+            match_label.config(text=f"Bad pattern: {e}")
+            return None
+
+    def schedule_count(*_):
+        if count_job["id"]:
+            frame.after_cancel(count_job["id"])
+        count_job["id"] = frame.after(COUNT_DELAY, preview_count)
+
+    def preview_count():
+        count_job["id"] = None
+        pattern = current_pattern()
+        if pattern is not None:
+            spans = find_spans(text.get("1.0", "end-1c"), pattern)
+            match_label.config(text=f"{len(spans)} match(es)")
+
+    search_var.trace_add("write", schedule_count)
+
+    def search_text():
+        text.tag_remove("highlight", "1.0", "end")
+        pattern = current_pattern()
+        if pattern is None:
             return
-        start = "1.0"
-        while True:
-            pos = text.search(term, start, stopindex="end")
-            if not pos:
-                break
-            end_pos = f"{pos}+{len(term)}c"
-            text.tag_add("highlight", pos, end_pos)
-            start = end_pos
-        text.tag_config(
-            "highlight", background=get_colors()["highlight"], foreground="yellow"
-        )
+        content = text.get("1.0", "end-1c")
+        spans = find_spans(content, pattern)
+        indexer = TextIndexer(content)
+        # tag_add accepts many ranges per call; batch them to cut Tcl round trips
+        for i in range(0, len(spans), 500):
+            ranges = []
+            for start, end, _ in spans[i : i + 500]:
+                ranges += [indexer.index(start), indexer.index(end)]
+            text.tag_add("highlight", *ranges)
+        match_label.config(text=f"{len(spans)} match(es)")
+        if spans:
+            text.see(indexer.index(spans[0][0]))
 
     def replace_text():
-        term = search_var.get()
-        repl = replace_var.get()
-        content = text.get("1.0", "end").replace(term, repl)
-        text.delete("1.0", "end")
-        text.insert("1.0", content)
+        pattern = current_pattern()
+        if pattern is None:
+            return
+        content = text.get("1.0", "end-1c")
+        try:
+            spans = find_spans(content, pattern, replace_var.get(), regex_var.get())
+        except (re.error, IndexError) as e:
+            match_label.config(text=f"Bad replacement: {e}")
+            return
+        if not spans:
+            match_label.config(text="0 match(es)")
+            return
+        indexer = TextIndexer(content)
+        view = text.yview()[0]
+        # Edit back to front so earlier indices stay valid, as one undo step
+        text.config(autoseparators=False)
+        text.edit_separator()
+        try:
+            for start, end, new in reversed(spans):
+                text.replace(indexer.index(start), indexer.index(end), new)
+        finally:
+            text.edit_separator()
+            text.config(autoseparators=True)
+        text.yview_moveto(view)
         text.tag_remove("highlight", "1.0", "end")
+        match_label.config(text=f"Replaced {len(spans)} match(es)")
         update_status()
 
     # === File Operations ===
@@ -162,10 +387,11 @@ def get_frame(master):
             with open(path, "r", encoding="utf-8") as f:
                 content = f.read()
             current_file["path"] = path
-            current_file["original"] = content
             text.delete("1.0", "end")
             text.insert("1.0", content)
-            highlight_syntax()
+            text.edit_reset()
+            mark_saved(content)
+            highlighter.mark_all()
             update_status()
 
     def save_cfg():
@@ -182,41 +408,33 @@ def get_frame(master):
             do_save()
 
     def do_save():
-        content = text.get("1.0", "end")
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        os.makedirs("cfg_backups", exist_ok=True)
-        backup_name = f"{os.path.basename(current_file['path']).replace('.cfg', '')}_{timestamp}.cfg"
+        content = buffer()
+        backup = "none (new file)"
         if os.path.exists(current_file["path"]):
-            shutil.copy(current_file["path"], os.path.join("cfg_backups", backup_name))
+            try:
+                backup = f"version #{get_backup_store().backup(current_file['path'])}"
+            except Exception as e:
+                backup = f"failed ({e})"
         with open(current_file["path"], "w", encoding="utf-8") as f:
             f.write(content)
-        current_file["original"] = content
+        mark_saved(content)
         update_status()
         messagebox.showinfo(
-            "Saved", f"Saved to {current_file['path']}\nBackup: {backup_name}"
+            "Saved", f"Saved to {current_file['path']}\nBackup: {backup}"
         )
 
     def diff_and_confirm():
-        original_lines = current_file["original"].splitlines(keepends=True)
-        new_lines = text.get("1.0", "end").splitlines(keepends=True)
-        diff = list(
-            unified_diff(
-                original_lines, new_lines, fromfile="original", tofile="current"
-            )
-        )
-        if not diff:
+        # The diff is only computed if the user asks to see it
+        if not is_dirty():
             do_save()
             return
         confirm = messagebox.askyesno(
             "Review Changes", "Changes detected. View diff before saving?"
         )
         if confirm:
-            diff_win = tk.Toplevel()
-            diff_win.title("Diff Preview")
-            diff_text = tk.Text(diff_win, bg="black", fg="white", font=("Consolas", 10))
-            diff_text.pack(fill="both", expand=True)
-            diff_text.insert("1.0", "".join(diff))
-            diff_text.config(state="disabled")
+            open_diff_window(
+                frame, current_file["original"], buffer(), on_save=do_save
+            )
         else:
             do_save()
 
@@ -279,6 +497,107 @@ def get_frame(master):
         command=toggle_theme,
     ).pack(side="left", padx=5)
 
+    # === Lint ===
+    lint_list = tk.Listbox(
+        frame,
+        height=4,
+        bg=get_colors()["text_bg"],
+        fg=get_colors()["text_fg"],
+        font=("Consolas", 9),
+    )
+    lint_list.pack(fill="x", pady=(0, 5))
+    text.tag_config("lint_error", underline=True, background="#5a1d1d")
+    text.tag_config("lint_warning", underline=True)
+    lint_state = {"generation": 0, "result": None, "job": None, "poll": None}
+    lint_issues = []
+    lint_queue = queue.Queue()
+
+    def lint_worker():
+        while True:
+            request = lint_queue.get()
+            # Only the newest snapshot matters after a burst of edits
+            while not lint_queue.empty():
+                request = lint_queue.get()
+            if request is None:
+                return
+            generation, content, path = request
+            try:
+                # An unmodified buffer is linted from the cached model of the file
+                issues = lint_file(path) if content is None else lint_text(content, path)
+            except Exception as e:
+                issues = [Issue("error", path, 0, f"Lint failed: {e}")]
+            lint_state["result"] = (generation, issues)
+
+    threading.Thread(target=lint_worker, daemon=True).start()
+
+    def stop_lint(event):
+        if event.widget is not frame:
+            return
+        for job in ("job", "poll"):
+            if lint_state[job]:
+                frame.after_cancel(lint_state[job])
+                lint_state[job] = None
+        lint_queue.put(None)
+
+    frame.bind("<Destroy>", stop_lint)
+
+    def lint_path():
+        return os.path.abspath(current_file["path"] or "untitled.cfg")
+
+    def schedule_lint():
+        if lint_state["job"]:
+            frame.after_cancel(lint_state["job"])
+        lint_state["job"] = frame.after(LINT_DELAY, request_lint)
+
+    def request_lint():
+        lint_state["job"] = None
+        lint_state["generation"] += 1
+        unchanged = current_file["path"] and not text.edit_modified()
+        content = None if unchanged else buffer()
+        lint_queue.put((lint_state["generation"], content, lint_path()))
+        if not lint_state["poll"]:
+            poll_lint()
+
+    def poll_lint():
+        lint_state["poll"] = None
+        if not frame.winfo_exists():
+            return
+        result = lint_state["result"]
+        if result is None or result[0] != lint_state["generation"]:
+            lint_state["poll"] = frame.after(100, poll_lint)
+            return
+        lint_state["result"] = None
+        show_issues(result[1])
+
+    def show_issues(issues):
+        text.tag_remove("lint_error", "1.0", "end")
+        text.tag_remove("lint_warning", "1.0", "end")
+        lint_list.delete(0, "end")
+        lint_issues[:] = issues
+        path = os.path.normcase(lint_path())
+        for issue in issues:
+            local = os.path.normcase(issue.file) == path
+            if local and issue.line:
+                text.tag_add(
+                    f"lint_{issue.severity}", f"{issue.line}.0", f"{issue.line}.end"
+                )
+            where = f"L{issue.line}" if local else f"{os.path.basename(issue.file)}:{issue.line}"
+            lint_list.insert("end", f"{issue.severity.upper():7} {where:>6}  {issue.message}")
+            if issue.severity == "error":
+                lint_list.itemconfig("end", fg="#ff6b6b")
+
+    def jump_to_issue(event=None):
+        sel = lint_list.curselection()
+        if not sel:
+            return
+        issue = lint_issues[sel[0]]
+        if os.path.normcase(issue.file) == os.path.normcase(lint_path()) and issue.line:
+            text.see(f"{issue.line}.0")
+            text.mark_set("insert", f"{issue.line}.0")
+            text.focus_set()
+
+    lint_list.bind("<<ListboxSelect>>", jump_to_issue)
+
     # === Status Bar ===
     status_var = tk.StringVar()
     status_bar = tk.Label(
@@ -293,14 +612,21 @@ def get_frame(master):
 
     def update_status():
         status = current_file["path"] or "No file loaded"
-        modified = (
-            "(modified)" if text.get("1.0", "end") != current_file["original"] else ""
-        )
-        status_var.set(f"{status} {modified}")
+        modified = "(modified)" if text.edit_modified() else ""
+        summary = ""
+        try:
+            model = load_cfg(current_file["path"])
+        except Exception:
+            model = None
+        if model:
+            summary = (
+                f" | {len(model.dvars)} dvars, {len(model.execs)} exec(s),"
+                f" {len(model.map_rotation)} map(s) in rotation"
+            )
+        status_var.set(f"{status} {modified}{summary}")
 
     def warn_unsaved_close():
-        current = text.get("1.0", "end")
-        if current != current_file["original"]:
+        if is_dirty():
             if not messagebox.askyesno(
                 "Unsaved Changes", "You have unsaved changes. Close anyway?"
             ):
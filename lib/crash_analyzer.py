@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+
+from lib.singleton import lazy_singleton
+
+INDEX_PATH = os.path.join("cfg", "crash_index.json")
+TAIL_LINES = 50
+SIGNATURE_LINES = 12
+SIMILARITY = 0.85
+# Fuzzy matching only compares against the most recently seen clusters
+MAX_CANDIDATES = 100
+
+NORMALIZERS = [
+    (re.compile(r"^\[\d{2}:\d{2}:\d{2}\] "), ""),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:\.\d+)?"), "<TS>"),
+    (re.compile(r"\b\d{1,2}:\d{2}(?::\d{2})?\b"), "<TIME>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<ADDR>"),
+    (re.compile(r"\b[0-9a-fA-F]{8,}\b"), "<ADDR>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<N>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize(line):
+    for pattern, repl in NORMALIZERS:
+        line = pattern.sub(repl, line)
+    return line.strip()
+
+
+def format_exit_code(code):
+    if code is None:
+        return "?"
+    if code < 0 or code > 0xFFFF:
+        return f"0x{code & 0xFFFFFFFF:08X}"
+    return str(code)
+
+
+def signature(lines, exit_code):
+    normalized = []
+    for line in lines:
+        line = normalize(line)
+        if line and (not normalized or normalized[-1] != line):
+            normalized.append(line)
+    normalized = normalized[-SIGNATURE_LINES:]
+    normalized.append(f"exit {format_exit_code(exit_code)}")
+    return normalized
+
+
+class CrashAnalyzer:
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.clusters = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.clusters = json.load(f).get("clusters", {})
+            except Exception:
+                self.clusters = {}
+
+    def record(self, server, exit_code, lines, when=None):
+        # Fuzzy matching and the index write are slow; call from a worker thread
+        when = when or time.time()
+        tail = list(lines)[-TAIL_LINES:]
+        sig = signature(tail, exit_code)
+        key = hashlib.sha1("\n".join(sig).encode("utf-8")).hexdigest()[:16]
+        with self.lock:
+            cluster_id = key if key in self.clusters else self.closest(sig)
+            if cluster_id is None:
+                cluster_id = key
+                self.clusters[key] = {
+                    "signature": sig,
+                    "count": 0,
+                    "first_seen": when,
+                    "last_seen": when,
+                    "servers": {},
+                    "exit_codes": {},
+                    "sample": tail,
+                }
+            cluster = self.clusters[cluster_id]
+            cluster["count"] += 1
+            cluster["last_seen"] = max(cluster["last_seen"], when)
+            cluster["first_seen"] = min(cluster["first_seen"], when)
+            cluster["servers"][server] = cluster["servers"].get(server, 0) + 1
+            code = format_exit_code(exit_code)
+            cluster["exit_codes"][code] = cluster["exit_codes"].get(code, 0) + 1
+            cluster["sample"] = tail
+            self.save()
+        return cluster_id
+
+    def closest(self, sig):
+        # Caller holds self.lock
+        text = "\n".join(sig)
+        best, best_ratio = None, SIMILARITY
+        recent = sorted(
+            self.clusters.items(), key=lambda item: item[1]["last_seen"], reverse=True
+        )
+        for cluster_id, cluster in recent[:MAX_CANDIDATES]:
+            matcher = SequenceMatcher(None, text, "\n".join(cluster["signature"]))
+            if matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = cluster_id, ratio
+        return best
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"clusters": self.clusters}, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def get(self, cluster_id):
+        with self.lock:
+            cluster = self.clusters.get(cluster_id)
+            return json.loads(json.dumps(cluster)) if cluster else None
+
+    def summary(self):
+        with self.lock:
+            items = [(cid, dict(c)) for cid, c in self.clusters.items()]
+        return sorted(items, key=lambda item: item[1]["last_seen"], reverse=True)
+
+
+get_analyzer = lazy_singleton(CrashAnalyzer)
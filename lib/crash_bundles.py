@@ -0,0 +1,108 @@
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from lib.file_utils import atomic_write
+from lib.singleton import lazy_singleton
+
+BUNDLE_DIR = "crash_bundles"
+INDEX_NAME = "index.json"
+MAX_TOTAL_BYTES = 50 * 1024 * 1024
+MAX_AGE_DAYS = 30
+
+
+class CrashBundleStore:
+    def __init__(self, bundle_dir=BUNDLE_DIR):
+        self.bundle_dir = bundle_dir
+        self.index_path = os.path.join(bundle_dir, INDEX_NAME)
+        self.lock = threading.Lock()
+        self.entries = []
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception:
+                self.entries = []
+
+    def write(self, server, exit_code, log_tail, metrics, cmd, cfg_path, cfg_hash,
+              uptime, cluster=None):
+        when = time.time()
+        bundle = {
+            "server": server,
+            "time": when,
+            "exit_code": exit_code,
+            "uptime": uptime,
+            "cmd": cmd,
+            "cfg_path": cfg_path,
+            "cfg_sha256": cfg_hash,
+            "cluster": cluster,
+            "metrics": metrics,
+            "log_tail": list(log_tail),
+        }
+        data = gzip.compress(json.dumps(bundle).encode("utf-8"))
+        with self.lock:
+            os.makedirs(self.bundle_dir, exist_ok=True)
+            name = self.unique_name(server, when)
+            atomic_write(os.path.join(self.bundle_dir, name), data)
+            self.entries.append(
+                {
+                    "file": name,
+                    "server": server,
+                    "time": when,
+                    "exit_code": exit_code,
+                    "uptime": uptime,
+                    "cluster": cluster,
+                    "size": len(data),
+                }
+            )
+            self.prune()
+            self.save_index()
+        return name
+
+    def unique_name(self, server, when):
+        # Millisecond stamps, plus a counter for crashes within the same one
+        stamp = datetime.fromtimestamp(when).strftime("%Y%m%d-%H%M%S-%f")[:-3]
+        base = f"{server}_{stamp}"
+        name = f"{base}.json.gz"
+        taken = {e["file"] for e in self.entries}
+        counter = 1
+        while name in taken or os.path.exists(os.path.join(self.bundle_dir, name)):
+            name = f"{base}-{counter}.json.gz"
+            counter += 1
+        return name
+
+    def prune(self):
+        cutoff = time.time() - MAX_AGE_DAYS * 86400
+        self.entries.sort(key=lambda e: e["time"])
+        total = sum(e["size"] for e in self.entries)
+        keep = []
+        for i, entry in enumerate(self.entries):
+            newest = i == len(self.entries) - 1
+            if not newest and (entry["time"] < cutoff or total > MAX_TOTAL_BYTES):
+                total -= entry["size"]
+                try:
+                    os.remove(os.path.join(self.bundle_dir, entry["file"]))
+                except OSError:
+                    pass
+                continue
+            keep.append(entry)
+        self.entries = keep
+
+    def save_index(self):
+        atomic_write(
+            self.index_path, json.dumps(self.entries, indent=1).encode("utf-8")
+        )
+
+    def listing(self):
+        with self.lock:
+            return sorted(self.entries, key=lambda e: e["time"], reverse=True)
+
+    def load(self, name):
+        with gzip.open(os.path.join(self.bundle_dir, name), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+get_bundles = lazy_singleton(CrashBundleStore)
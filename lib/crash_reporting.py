@@ -1,14 +1,28 @@
 import tkinter as tk
+from tkinter import ttk
 import os
+import re
 import subprocess
+import threading
+import time
+
+from lib.crash_analyzer import format_exit_code, get_analyzer
+from lib.crash_bundles import get_bundles
+from lib.log_files import LOG_DIR, list_logs
+from lib.log_store import MARK_END, MARK_START, format_ts, get_store
+from lib.log_viewer import PagedLogView
+
+BACKFILL_TIMEOUT = 60
 
 
 def get_frame(master):
     frame = tk.Frame(master, bg="#1e1e1e", padx=20, pady=20)
 
-    log_dir = "logs"
+    log_dir = LOG_DIR
     os.makedirs(log_dir, exist_ok=True)
+    store = get_store()
     selected_file = tk.StringVar()
+    server_filter = tk.StringVar(value="All servers")
 
     tk.Label(
         frame,
@@ -22,52 +36,175 @@ def get_frame(master):
         frame, font=("Segoe UI", 10), bg="#2b2b2b", fg="white", insertbackground="white"
     )
     search_entry.pack(fill="x", pady=(0, 5))
+    search_entry.bind("<Return>", lambda e: search_logs())
+
+    filter_frame = tk.Frame(frame, bg="#1e1e1e")
+    filter_frame.pack(fill="x", pady=(0, 5))
+    server_menu = tk.OptionMenu(filter_frame, server_filter, "All servers")
+    server_menu.config(
+        bg="#2b2b2b", fg="white", font=("Segoe UI", 10), highlightthickness=0
+    )
+    server_menu["menu"].config(bg="#2b2b2b", fg="white")
+    server_menu.pack(side="left")
+    status_label = tk.Label(
+        filter_frame, text="", fg="#bbbbbb", bg="#1e1e1e", font=("Segoe UI", 9)
+    )
+    status_label.pack(side="left", padx=10)
 
     listbox = tk.Listbox(
         frame, height=8, bg="#2b2b2b", fg="white", font=("Consolas", 10)
     )
     listbox.pack(fill="x", pady=(0, 5))
 
+    cluster_tree = ttk.Treeview(
+        frame,
+        columns=("count", "first", "last", "servers", "headline"),
+        show="headings",
+        height=5,
+    )
+    for column, heading, width in (
+        ("count", "Count", 50),
+        ("first", "First Seen", 130),
+        ("last", "Last Seen", 130),
+        ("servers", "Servers", 140),
+        ("headline", "Signature", 400),
+    ):
+        cluster_tree.heading(column, text=heading)
+        cluster_tree.column(column, width=width, stretch=column == "headline")
+    cluster_tree.pack(fill="x", pady=(0, 5))
+
+    display_frame = tk.Frame(frame, bg="#1e1e1e")
+    display_frame.pack(fill="both", expand=True)
+
+    # Search results come from the store; whole files open in the paged viewer
     log_display = tk.Text(
-        frame, height=14, bg="#252526", fg="white", font=("Consolas", 10), wrap="none"
+        display_frame,
+        height=14,
+        bg="#252526",
+        fg="white",
+        font=("Consolas", 10),
+        wrap="none",
     )
     log_display.pack(fill="both", expand=True)
+    log_display.tag_config("highlight", background="#444444", foreground="yellow")
+    file_view = PagedLogView(display_frame)
+
+    def show_results():
+        file_view.close()
+        file_view.pack_forget()
+        log_display.pack(fill="both", expand=True)
+
+    def refresh_servers():
+        menu = server_menu["menu"]
+        menu.delete(0, "end")
+        for name in ["All servers"] + store.servers():
+            menu.add_command(label=name, command=lambda n=name: server_filter.set(n))
+
+    def headline(signature):
+        for line in reversed(signature):
+            if re.search(r"error|exception|fatal|crash|assert", line, re.I):
+                return line
+        return signature[-2] if len(signature) > 1 else signature[0]
+
+    def refresh_clusters():
+        cluster_tree.delete(*cluster_tree.get_children())
+        for cluster_id, cluster in get_analyzer().summary():
+            cluster_tree.insert(
+                "",
+                "end",
+                iid=cluster_id,
+                values=(
+                    cluster["count"],
+                    format_ts(cluster["first_seen"]),
+                    format_ts(cluster["last_seen"]),
+                    ", ".join(sorted(cluster["servers"])),
+                    headline(cluster["signature"]),
+                ),
+            )
+
+    def show_cluster():
+        sel = cluster_tree.selection()
+        if not sel:
+            return
+        cluster = get_analyzer().get(sel[0])
+        if not cluster:
+            return
+        show_results()
+        log_display.delete("1.0", "end")
+        codes = ", ".join(f"{c} ({n})" for c, n in cluster["exit_codes"].items())
+        log_display.insert("end", f"Exit codes: {codes}\n\nSignature:\n")
+        log_display.insert("end", "\n".join(cluster["signature"]), "highlight")
+        log_display.insert("end", "\n\nLast occurrence:\n")
+        log_display.insert("end", "\n".join(cluster["sample"]))
+
+    cluster_tree.bind("<<TreeviewSelect>>", lambda e: show_cluster())
 
     def refresh_list():
+        refresh_clusters()
         listbox.delete(0, "end")
-        for file in sorted(os.listdir(log_dir)):
-            if file.endswith(".log"):
-                listbox.insert("end", file)
+        for file in list_logs(log_dir):
+            listbox.insert("end", file)
+        store.backfill()
+        # The server list is refreshed once the writer has worked through the
+        # backfill (or given up on it)
+        backfilled = threading.Event()
+
+        def wait():
+            store.flush(BACKFILL_TIMEOUT)
+            backfilled.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+        poll_backfill(backfilled)
+
+    def poll_backfill(backfilled):
+        if not frame.winfo_exists():
+            return
+        if not backfilled.is_set():
+            frame.after(100, poll_backfill, backfilled)
+            return
+        refresh_servers()
 
     def load_selected():
-        log_display.delete("1.0", "end")
         sel = listbox.curselection()
         if not sel:
             return
         fname = listbox.get(sel[0])
         selected_file.set(fname)
-        path = os.path.join(log_dir, fname)
+        log_display.pack_forget()
+        file_view.pack(fill="both", expand=True)
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-            log_display.insert("1.0", content)
+            file_view.open(os.path.join(log_dir, fname))
         except Exception as e:
+            show_results()
+            log_display.delete("1.0", "end")
             log_display.insert("1.0", f"[ERROR] {e}")
 
     def search_logs():
-        keyword = search_entry.get().lower()
-        log_display.tag_remove("highlight", "1.0", "end")
+        keyword = search_entry.get().strip()
+        show_results()
+        log_display.delete("1.0", "end")
         if not keyword:
             return
-        start = "1.0"
-        while True:
-            pos = log_display.search(keyword, start, stopindex="end", nocase=True)
-            if not pos:
-                break
-            end_pos = f"{pos}+{len(keyword)}c"
-            log_display.tag_add("highlight", pos, end_pos)
-            start = end_pos
-        log_display.tag_config("highlight", background="#444444", foreground="yellow")
+        server = server_filter.get()
+        started = time.perf_counter()
+        try:
+            rows = store.search(
+                keyword, server=None if server == "All servers" else server
+            )
+        except Exception as e:
+            log_display.insert("1.0", f"[ERROR] {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+        status_label.config(text=f"{len(rows)} match(es) in {elapsed:.0f} ms")
+        for ts, server, level, message in rows:
+            log_display.insert("end", f"{format_ts(ts)} [{server}] ")
+            # Split the FTS highlight markers out into "highlight" tags
+            for i, part in enumerate(message.split(MARK_START)):
+                if i:
+                    hit, _, part = part.partition(MARK_END)
+                    log_display.insert("end", hit, "highlight")
+                log_display.insert("end", part)
+            log_display.insert("end", "\n")
 
     def open_in_folder():
         if not selected_file.get():
@@ -81,10 +218,77 @@ def get_frame(master):
             return
         path = os.path.join(log_dir, selected_file.get())
         if os.path.exists(path):
+            show_results()
             os.remove(path)
+            store.forget(selected_file.get())
             refresh_list()
             log_display.delete("1.0", "end")
 
+    def open_bundles():
+        win = tk.Toplevel(frame)
+        win.title("Crash Bundles")
+        win.configure(bg="#1e1e1e")
+        tree = ttk.Treeview(
+            win,
+            columns=("time", "server", "exit", "uptime", "size"),
+            show="headings",
+            height=8,
+        )
+        for column, heading in (
+            ("time", "Time"),
+            ("server", "Server"),
+            ("exit", "Exit Code"),
+            ("uptime", "Uptime"),
+            ("size", "Size"),
+        ):
+            tree.heading(column, text=heading)
+        tree.pack(fill="x", padx=6, pady=6)
+        details = tk.Text(
+            win, height=20, bg="#252526", fg="white", font=("Consolas", 10), wrap="none"
+        )
+        details.pack(fill="both", expand=True, padx=6, pady=(0, 6))
+
+        for entry in get_bundles().listing():
+            uptime = entry["uptime"]
+            tree.insert(
+                "",
+                "end",
+                iid=entry["file"],
+                values=(
+                    format_ts(entry["time"]),
+                    entry["server"],
+                    format_exit_code(entry["exit_code"]),
+                    f"{uptime / 60:.1f} min" if uptime is not None else "?",
+                    f"{entry['size'] / 1024:.1f} KB",
+                ),
+            )
+
+        def show_bundle(event=None):
+            sel = tree.selection()
+            if not sel:
+                return
+            details.delete("1.0", "end")
+            try:
+                bundle = get_bundles().load(sel[0])
+            except Exception as e:
+                details.insert("1.0", f"[ERROR] {e}")
+                return
+            metrics = bundle["metrics"]
+            mem, cpu = metrics.get("mem_mb", []), metrics.get("cpu_pct", [])
+            details.insert(
+                "end",
+                f"Command: {' '.join(bundle['cmd'])}\n"
+                f"Config: {bundle['cfg_path']} (sha256 {bundle['cfg_sha256']})\n"
+                f"Crash cluster: {bundle['cluster']}\n"
+                f"Memory MB (last {len(mem)}): "
+                f"{', '.join(f'{v:.0f}' for v in mem)}\n"
+                f"CPU % (last {len(cpu)}): "
+                f"{', '.join(f'{v:.0f}' for v in cpu)}\n\n",
+            )
+            details.insert("end", "\n".join(bundle["log_tail"]))
+
+        tree.bind("<<TreeviewSelect>>", show_bundle)
+
     listbox.bind("<<ListboxSelect>>", lambda e: load_selected())
 
     button_frame = tk.Frame(frame, bg="#1e1e1e")
@@ -114,6 +318,14 @@ def get_frame(master):
         fg="white",
         font=("Segoe UI", 10),
     ).pack(side="left", padx=4)
+    tk.Button(
+        button_frame,
+        text="📦 Bundles",
+        command=open_bundles,
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 10),
+    ).pack(side="left", padx=4)
     tk.Button(
         button_frame,
         text="🔄 Refresh",
@@ -0,0 +1,179 @@
+import tkinter as tk
+from difflib import SequenceMatcher, unified_diff
+
+CONTEXT = 3
+RENDER_BATCH = 200
+
+
+def side_by_side_rows(old_lines, new_lines):
+    # Yields (kind, left, right, intra) rows; `intra` holds changed
+    # character spans for replaced line pairs.
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for group in matcher.get_grouped_opcodes(CONTEXT):
+        yield "hunk", f"@@ -{group[0][1] + 1} +{group[0][3] + 1} @@", "", None
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                for left, right in zip(old_lines[i1:i2], new_lines[j1:j2]):
+                    yield "equal", left, right, None
+                continue
+            left = old_lines[i1:i2]
+            right = new_lines[j1:j2]
+            for k in range(max(len(left), len(right))):
+                a = left[k] if k < len(left) else None
+                b = right[k] if k < len(right) else None
+                intra = None
+                if a is not None and b is not None:
+                    intra = intra_line_spans(a, b)
+                yield "change", a, b, intra
+
+
+def intra_line_spans(a, b):
+    old_spans, new_spans = [], []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b).get_opcodes():
+        if tag != "equal":
+            if i2 > i1:
+                old_spans.append((i1, i2))
+            if j2 > j1:
+                new_spans.append((j1, j2))
+    return old_spans, new_spans
+
+
+def open_diff_window(master, old_text, new_text, title="Diff Preview", on_save=None):
+    win = tk.Toplevel(master)
+    win.title(title)
+    win.configure(bg="#1e1e1e")
+    mode = tk.StringVar(value="side")
+    state = {"job": None}
+
+    toolbar = tk.Frame(win, bg="#1e1e1e")
+    toolbar.pack(fill="x", padx=6, pady=4)
+    for label, value in (("Side by side", "side"), ("Unified", "unified")):
+        tk.Radiobutton(
+            toolbar,
+            text=label,
+            value=value,
+            variable=mode,
+            command=lambda: render(),
+            bg="#1e1e1e",
+            fg="white",
+            selectcolor="#1e1e1e",
+        ).pack(side="left", padx=4)
+    status = tk.Label(toolbar, text="", bg="#1e1e1e", fg="#bbbbbb")
+    status.pack(side="left", padx=10)
+    if on_save:
+
+        def save_and_close():
+            win.destroy()
+            on_save()
+
+        tk.Button(
+            toolbar,
+            text="💾 Save",
+            command=save_and_close,
+            bg="#3a3a3a",
+            fg="white",
+            font=("Segoe UI", 10),
+        ).pack(side="right")
+
+    body = tk.Frame(win, bg="#1e1e1e")
+    body.pack(fill="both", expand=True)
+    scroll = tk.Scrollbar(body)
+    scroll.pack(side="right", fill="y")
+    panes = []
+    for _ in range(2):
+        pane = tk.Text(
+            body, bg="black", fg="white", font=("Consolas", 10), wrap="none", width=60
+        )
+        pane.tag_config("hunk", foreground="#0db9d7")
+        pane.tag_config("del", background="#3d1f1f")
+        pane.tag_config("add", background="#1f3d24")
+        pane.tag_config("intra_del", background="#8b2f2f")
+        pane.tag_config("intra_add", background="#2f7d3c")
+        pane.tag_config("blank", background="#2a2a2a")
+        panes.append(pane)
+    left, right = panes
+
+    def sync(*args):
+        for pane in panes:
+            pane.yview(*args)
+
+    def on_left_scroll(first, last):
+        scroll.set(first, last)
+        right.yview_moveto(first)
+
+    scroll.config(command=sync)
+    left.config(yscrollcommand=on_left_scroll)
+    right.config(yscrollcommand=lambda first, last: scroll.set(first, last))
+
+    def wheel(event):
+        sync("scroll", -1 if getattr(event, "delta", 0) > 0 or event.num == 4 else 1, "units")
+        return "break"
+
+    for pane in panes:
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            pane.bind(sequence, wheel)
+
+    def insert_line(pane, line, tag, spans, span_tag):
+        start = pane.index("end-1c")
+        if line is None:
+            pane.insert("end", "\n", "blank")
+            return
+        pane.insert("end", line.rstrip("\n") + "\n", tag)
+        for i1, i2 in spans or ():
+            pane.tag_add(span_tag, f"{start}+{i1}c", f"{start}+{i2}c")
+
+    def render():
+        if state["job"]:
+            win.after_cancel(state["job"])
+        for pane in panes:
+            pane.config(state="normal")
+            pane.delete("1.0", "end")
+            pane.pack_forget()
+        old_lines = old_text.splitlines()
+        new_lines = new_text.splitlines()
+        if mode.get() == "side":
+            left.pack(side="left", fill="both", expand=True)
+            right.pack(side="left", fill="both", expand=True)
+            rows = side_by_side_rows(old_lines, new_lines)
+        else:
+            left.pack(side="left", fill="both", expand=True)
+            rows = (
+                ("unified", line, None, None)
+                for line in unified_diff(
+                    old_lines, new_lines, "original", "current", lineterm=""
+                )
+            )
+        count = {"rows": 0}
+
+        def step():
+            # Render a batch, then yield to the event loop
+            for _ in range(RENDER_BATCH):
+                row = next(rows, None)
+                if row is None:
+                    state["job"] = None
+                    status.config(text=f"{count['rows']} line(s)")
+                    for pane in panes:
+                        pane.config(state="disabled")
+                    return
+                kind, a, b, intra = row
+                count["rows"] += 1
+                if kind == "unified":
+                    tag = {"+": "add", "-": "del", "@": "hunk"}.get(a[:1])
+                    left.insert("end", a + "\n", tag)
+                elif kind == "hunk":
+                    left.insert("end", a + "\n", "hunk")
+                    right.insert("end", a + "\n", "hunk")
+                elif kind == "equal":
+                    left.insert("end", a + "\n")
+                    right.insert("end", b + "\n")
+                else:
+                    old_spans, new_spans = intra or (None, None)
+                    insert_line(left, a, "del", old_spans, "intra_del")
+                    insert_line(right, b, "add", new_spans, "intra_add")
+            status.config(text=f"Rendering... {count['rows']} line(s)")
+            state["job"] = win.after(1, step)
+
+        step()
+
+    render()
+    return win
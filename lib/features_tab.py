@@ -6,12 +6,15 @@ from lib.crash_reporting import get_frame as crash_report_frame
 from lib.backup_restore import get_frame as backup_restore_frame
 from lib.config_editor import get_frame as config_editor_frame
 from lib.port_scan import get_frame as port_scan_frame
+from lib.player_stats import get_frame as player_stats_frame
+from lib.scheduler import get_scheduler
 
 
 def create_features_tab(notebook):
     container = ttk.Notebook(notebook)
     container.configure(style="TNotebook")
     container.pack(fill="both", expand=True)
+    container.bind("<<NotebookTabChanged>>", lambda _: get_scheduler().refresh())
 
     features = [
         ("📊 Averages", resource_avg_frame),
@@ -19,6 +22,7 @@ def create_features_tab(notebook):
         ("🗃 Backups", backup_restore_frame),
         ("📝 Config Editor", config_editor_frame),
         ("📡 Port Scan", port_scan_frame),
+        ("👥 Players", player_stats_frame),
     ]
 
     for label, get_frame in features:
@@ -0,0 +1,247 @@
+import time
+import tkinter as tk
+from datetime import datetime
+
+from lib.scheduler import MINIMIZED, NORMAL, get_scheduler
+
+BG_COLOR = "#1e1e1e"
+ROW_COLOR = "#252526"
+ALT_ROW_COLOR = "#2b2b2b"
+FG_COLOR = "#d4d4d4"
+MUTED_COLOR = "#888888"
+SPARK_COLOR = "lime"
+
+ROW_HEIGHT = 30
+SPARK_WIDTH = 120
+SPARK_POINTS = 30
+
+# (title, x offset) for each column drawn on the canvas
+COLUMNS = (
+    ("Server", 10),
+    ("Status", 200),
+    ("Uptime", 340),
+    ("Players", 430),
+    ("RSS", 510),
+    ("CPU", 600),
+    ("", 600 + SPARK_WIDTH + 10),
+    ("Last Restart", 790),
+)
+
+STATUS_COLORS = (
+    ("Online", "lime"),
+    ("Starting", "gray"),
+    ("Checking", "gray"),
+    ("Stopping", "gray"),
+    ("Timeout", "orange"),
+    ("Crashed", "orange"),
+    ("Stopped", MUTED_COLOR),
+)
+
+
+def format_uptime(seconds):
+    seconds = int(seconds)
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    if seconds < 86400:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    return f"{seconds // 86400}d {seconds % 86400 // 3600:02d}h"
+
+
+def status_color(text):
+    for word, color in STATUS_COLORS:
+        if word in text:
+            return color
+    return "red"
+
+
+def row_values(tab):
+    # Everything shown for one server, read from state the tab already keeps
+    running = tab.process is not None and tab.process.poll() is None
+    status = tab.server_status.get()
+    uptime = "-"
+    if running and tab.started_at:
+        uptime = format_uptime(time.time() - tab.started_at)
+    players = "-" if not running or tab.players is None else str(tab.players)
+    sample = tab.proc_data[-1] if running and tab.proc_data else None
+    restart = "-"
+    if tab.last_restart:
+        when, reason = tab.last_restart
+        restart = f"{datetime.fromtimestamp(when).strftime('%m-%d %H:%M')} {reason}"
+    return (
+        tab.name,
+        status,
+        uptime,
+        players,
+        f"{sample.rss_mb:.0f} MB" if sample else "-",
+        f"{sample.cpu_pct:.0f}%" if sample else "-",
+        restart,
+    )
+
+
+class Row:
+    __slots__ = ("tab", "items", "spark", "values", "spark_ts", "y")
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.items = []
+        self.spark = None
+        self.values = None
+        self.spark_ts = None
+        self.y = None
+
+
+def get_frame(master, manager):
+    frame = tk.Frame(master, bg=BG_COLOR, padx=10, pady=10)
+
+    tk.Label(
+        frame,
+        text="🛰 Fleet Overview",
+        font=("Segoe UI", 14, "bold"),
+        fg="white",
+        bg=BG_COLOR,
+    ).pack(anchor="w", pady=(0, 5))
+
+    summary = tk.StringVar(value="")
+    tk.Label(
+        frame, textvariable=summary, fg=FG_COLOR, bg=BG_COLOR, font=("Segoe UI", 10)
+    ).pack(anchor="w", pady=(0, 8))
+
+    header = tk.Canvas(frame, height=24, bg=BG_COLOR, highlightthickness=0)
+    header.pack(fill="x")
+    for title, x in COLUMNS:
+        header.create_text(
+            x, 12, text=title, anchor="w", fill=MUTED_COLOR, font=("Segoe UI", 10, "bold")
+        )
+
+    body = tk.Frame(frame, bg=BG_COLOR)
+    body.pack(fill="both", expand=True)
+    canvas = tk.Canvas(body, bg=BG_COLOR, highlightthickness=0)
+    scrollbar = tk.Scrollbar(body, command=lambda *args: scroll(*args))
+    canvas.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+
+    # One canvas for the whole fleet; items are created once per server and
+    # only re-configured when a value actually changes
+    rows = {}
+
+    def create_row(tab):
+        row = Row(tab)
+        row.items.append(
+            canvas.create_rectangle(0, 0, 0, 0, outline="", tags=("row_bg",))
+        )
+        for _, x in COLUMNS[:5] + COLUMNS[6:]:
+            row.items.append(
+                canvas.create_text(
+                    x, 0, text="", anchor="w", fill=FG_COLOR, font=("Consolas", 10)
+                )
+            )
+        row.spark = canvas.create_line(0, 0, 0, 0, fill=SPARK_COLOR, width=1)
+        for item in row.items + [row.spark]:
+            canvas.tag_bind(item, "<Button-1>", lambda _, t=tab: open_tab(t))
+        return row
+
+    def delete_row(row):
+        for item in row.items + [row.spark]:
+            canvas.delete(item)
+
+    def place_row(row, index):
+        y = index * ROW_HEIGHT
+        if row.y == y:
+            return
+        row.y = y
+        mid = y + ROW_HEIGHT / 2
+        canvas.coords(row.items[0], 0, y, 4000, y + ROW_HEIGHT)
+        canvas.itemconfig(row.items[0], fill=ROW_COLOR if index % 2 else ALT_ROW_COLOR)
+        for item, (_, x) in zip(row.items[1:], COLUMNS[:5] + COLUMNS[6:]):
+            canvas.coords(item, x, mid)
+        # Force the sparkline to be redrawn at its new position
+        row.spark_ts = None
+
+    def draw_row(row):
+        values = row_values(row.tab)
+        if values != row.values:
+            for i, (item, value) in enumerate(zip(row.items[1:], values)):
+                if row.values is None or row.values[i] != value:
+                    canvas.itemconfig(item, text=value)
+            if row.values is None or row.values[1] != values[1]:
+                canvas.itemconfig(row.items[2], fill=status_color(values[1]))
+            row.values = values
+
+        data = row.tab.cpu_data[-SPARK_POINTS:] if values[5] != "-" else []
+        ts = row.tab.proc_data[-1].ts if data and row.tab.proc_data else None
+        if ts == row.spark_ts:
+            return
+        row.spark_ts = ts
+        if len(data) < 2:
+            canvas.coords(row.spark, 0, 0, 0, 0)
+            canvas.itemconfig(row.spark, state="hidden")
+            return
+        left = COLUMNS[5][1]
+        top = row.y + 5
+        height = ROW_HEIGHT - 10
+        scale = max(100.0, max(data))
+        step = SPARK_WIDTH / (SPARK_POINTS - 1)
+        offset = SPARK_POINTS - len(data)
+        points = []
+        for i, value in enumerate(data):
+            points.append(left + (offset + i) * step)
+            points.append(top + height - value / scale * height)
+        canvas.coords(row.spark, *points)
+        canvas.itemconfig(row.spark, state="normal")
+
+    def open_tab(tab):
+        if tab in manager.tabs:
+            manager.notebook.select(tab.frame)
+
+    def sync_rows():
+        current = {id(tab): tab for tab in manager.tabs}
+        for key in [k for k in rows if current.get(k) is not rows[k].tab]:
+            delete_row(rows.pop(key))
+        for index, tab in enumerate(manager.tabs):
+            row = rows.get(id(tab))
+            if row is None:
+                row = rows[id(tab)] = create_row(tab)
+            place_row(row, index)
+        canvas.configure(scrollregion=(0, 0, 0, len(manager.tabs) * ROW_HEIGHT))
+
+    def update():
+        if not get_scheduler().visible(frame):
+            return
+        sync_rows()
+        # Only rows inside the viewport are refreshed; the rest catch up when
+        # scrolled into view
+        top = canvas.canvasy(0)
+        bottom = top + canvas.winfo_height()
+        running = 0
+        for tab in manager.tabs:
+            if tab.process is not None and tab.process.poll() is None:
+                running += 1
+            row = rows[id(tab)]
+            if row.y + ROW_HEIGHT >= top and row.y <= bottom:
+                draw_row(row)
+        players = sum(tab.players or 0 for tab in manager.tabs if tab.process)
+        summary.set(
+            f"{running}/{len(manager.tabs)} servers running, {players} players"
+        )
+
+    def scroll(*args):
+        canvas.yview(*args)
+        update()
+
+    def on_scroll(event):
+        scroll("scroll", -1 if event.num == 4 or event.delta > 0 else 1, "units")
+
+    canvas.configure(yscrollincrement=ROW_HEIGHT)
+    canvas.bind("<MouseWheel>", on_scroll)
+    canvas.bind("<Button-4>", on_scroll)
+    canvas.bind("<Button-5>", on_scroll)
+    canvas.bind("<Configure>", lambda _: update())
+
+    get_scheduler(frame).add(
+        ("fleet_dashboard", id(frame)),
+        update,
+        lambda: NORMAL if get_scheduler().visible(frame) else MINIMIZED,
+        widget=frame,
+    )
+    return frame
@@ -0,0 +1,250 @@
+import gzip
+import json
+import os
+import re
+import threading
+import tkinter as tk
+from datetime import datetime
+from tkinter import filedialog, ttk
+
+from lib.log_files import (
+    LEVELS,
+    LOG_DIR,
+    is_compressed,
+    list_logs,
+    open_log,
+    parse_line,
+    segment_info,
+)
+
+# Kept out of LOG_DIR itself so exports are never mistaken for log segments
+EXPORT_DIR = os.path.join(LOG_DIR, "exports")
+
+FORMATS = {
+    "Text (.log.gz)": ".log.gz",
+    "JSONL (.jsonl)": ".jsonl",
+    "JSONL (.jsonl.gz)": ".jsonl.gz",
+}
+
+
+def find_segments(server, start_date, end_date, log_dir=LOG_DIR):
+    segments = []
+    for fname in list_logs(log_dir):
+        name, date, _, _ = segment_info(fname)
+        if name == server and start_date <= date <= end_date:
+            segments.append(fname)
+    return segments
+
+
+def parse_clock(value):
+    # "HH:MM[:SS]" -> seconds since midnight, or None when blank
+    value = value.strip()
+    if not value:
+        return None
+    parts = [int(p) for p in value.split(":")] + [0, 0]
+    return parts[0] * 3600 + parts[1] * 60 + parts[2]
+
+
+def export_logs(server, start_date, end_date, dest, time_from=None, time_to=None,
+                level=None, pattern=None, progress=None, cancel=None,
+                log_dir=LOG_DIR):
+    segments = find_segments(server, start_date, end_date, log_dir)
+    sizes = [os.path.getsize(os.path.join(log_dir, f)) for f in segments]
+    total = sum(sizes) or 1
+    done = 0
+    scanned = 0
+    written = 0
+    regex = re.compile(pattern) if pattern else None
+    as_json = ".jsonl" in dest
+    tmp = dest + ".part"
+
+    if dest.endswith(".gz"):
+        out = gzip.open(tmp, "wt", encoding="utf-8")
+    else:
+        out = open(tmp, "w", encoding="utf-8")
+    try:
+        for fname, size in zip(segments, sizes):
+            date = segment_info(fname)[1]
+            midnight = datetime.strptime(date, "%Y-%m-%d").timestamp()
+            prev = None
+            consumed = 0
+            compressed = is_compressed(fname)
+            with open_log(os.path.join(log_dir, fname), "r") as f:
+                for line in f:
+                    if cancel is not None and cancel.is_set():
+                        raise InterruptedError("Export cancelled")
+                    scanned += 1
+                    if not compressed:
+                        consumed += len(line)
+                    if progress and scanned % 20000 == 0:
+                        progress(min(1.0, (done + consumed) / total), written)
+                    line = line.rstrip("\n")
+                    prev = parse_line(line, date, prev)
+                    ts, line_level = prev
+                    clock = ts - midnight
+                    if time_from is not None and clock < time_from:
+                        continue
+                    # The window end is a whole HH:MM minute, so include all of it
+                    if time_to is not None and clock >= time_to + 60:
+                        continue
+                    if level and line_level != level:
+                        continue
+                    if regex and not regex.search(line):
+                        continue
+                    if as_json:
+                        out.write(
+                            json.dumps(
+                                {
+                                    "ts": ts,
+                                    "server": server,
+                                    "level": line_level,
+                                    "message": line,
+                                }
+                            )
+                            + "\n"
+                        )
+                    else:
+                        out.write(line + "\n")
+                    written += 1
+            done += size
+            if progress:
+                progress(done / total, written)
+        out.close()
+        os.replace(tmp, dest)
+    except BaseException:
+        out.close()
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+def open_export_dialog(master, server, on_log=None):
+    win = tk.Toplevel(master)
+    win.title(f"Export Logs - {server}")
+    win.configure(bg="#1e1e1e", padx=10, pady=10)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    fields = {}
+    for row, (key, label, default) in enumerate(
+        (
+            ("start", "From date (YYYY-MM-DD):", today),
+            ("end", "To date (YYYY-MM-DD):", today),
+            ("time_from", "Daily window from (HH:MM):", ""),
+            ("time_to", "Daily window to (HH:MM):", ""),
+            ("pattern", "Regex filter:", ""),
+        )
+    ):
+        tk.Label(win, text=label, bg="#1e1e1e", fg="white", anchor="w").grid(
+            row=row, column=0, sticky="w", pady=2
+        )
+        var = tk.StringVar(value=default)
+        tk.Entry(
+            win, textvariable=var, bg="#2b2b2b", fg="white", insertbackground="white"
+        ).grid(row=row, column=1, sticky="ew", pady=2)
+        fields[key] = var
+
+    level_var = tk.StringVar(value="Any")
+    fmt_var = tk.StringVar(value=next(iter(FORMATS)))
+    for row, (label, var, options) in enumerate(
+        (("Level:", level_var, ("Any",) + LEVELS), ("Format:", fmt_var, tuple(FORMATS))),
+        start=len(fields),
+    ):
+        tk.Label(win, text=label, bg="#1e1e1e", fg="white", anchor="w").grid(
+            row=row, column=0, sticky="w", pady=2
+        )
+        menu = tk.OptionMenu(win, var, *options)
+        menu.config(bg="#2b2b2b", fg="white", highlightthickness=0)
+        menu.grid(row=row, column=1, sticky="ew", pady=2)
+
+    progress_bar = ttk.Progressbar(win, maximum=1.0, length=320)
+    progress_bar.grid(row=8, column=0, columnspan=2, sticky="ew", pady=(8, 2))
+    status = tk.Label(win, text="", bg="#1e1e1e", fg="#bbbbbb")
+    status.grid(row=9, column=0, columnspan=2, sticky="w")
+    win.columnconfigure(1, weight=1)
+
+    state = {"fraction": 0.0, "written": 0, "result": None}
+    cancel = threading.Event()
+
+    def on_progress(fraction, written):
+        state["fraction"], state["written"] = fraction, written
+
+    def poll():
+        if not win.winfo_exists():
+            return
+        progress_bar["value"] = state["fraction"]
+        status.config(text=f"{state['written']} line(s) written...")
+        result = state["result"]
+        if result is None:
+            win.after(200, poll)
+            return
+        status.config(text=result)
+        export_btn.config(state="normal")
+        if on_log:
+            on_log(f"[INFO] {result}")
+
+    def start_export():
+        try:
+            start_date = fields["start"].get().strip()
+            end_date = fields["end"].get().strip()
+            if datetime.strptime(start_date, "%Y-%m-%d") > datetime.strptime(
+                end_date, "%Y-%m-%d"
+            ):
+                raise ValueError("The start date is after the end date")
+            options = dict(
+                time_from=parse_clock(fields["time_from"].get()),
+                time_to=parse_clock(fields["time_to"].get()),
+                level=None if level_var.get() == "Any" else level_var.get(),
+                pattern=fields["pattern"].get() or None,
+            )
+            if options["pattern"]:
+                re.compile(options["pattern"])
+        except (ValueError, re.error) as e:
+            status.config(text=f"[ERROR] {e}")
+            return
+        ext = FORMATS[fmt_var.get()]
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        dest = filedialog.asksaveasfilename(
+            parent=win,
+            initialdir=os.path.abspath(EXPORT_DIR),
+            initialfile=f"{server}_{start_date}_{end_date}{ext}",
+            defaultextension=ext,
+        )
+        if not dest:
+            return
+
+        def run():
+            try:
+                count = export_logs(
+                    server,
+                    start_date,
+                    end_date,
+                    dest,
+                    progress=on_progress,
+                    cancel=cancel,
+                    **options,
+                )
+                state["result"] = f"Exported {count} line(s) to {dest}"
+            except Exception as e:
+                state["result"] = f"Export failed: {e}"
+
+        cancel.clear()
+        state.update(fraction=0.0, written=0, result=None)
+        export_btn.config(state="disabled")
+        threading.Thread(target=run, daemon=True).start()
+        poll()
+
+    buttons = tk.Frame(win, bg="#1e1e1e")
+    buttons.grid(row=10, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+    export_btn = tk.Button(
+        buttons, text="💾 Export", command=start_export, bg="#0db9d7", fg="white"
+    )
+    export_btn.pack(side="left", padx=(0, 5))
+    tk.Button(
+        buttons, text="✖ Cancel", command=cancel.set, bg="#3a3a3a", fg="white"
+    ).pack(side="left")
+    # Closing the dialog stops a running export instead of leaving it behind
+    win.bind("<Destroy>", lambda e: cancel.set() if e.widget is win else None)
+    return win
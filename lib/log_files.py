@@ -0,0 +1,98 @@
+import gzip
+import io
+import os
+import re
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LOG_DIR = "logs"
+
+LOG_NAME_RE = re.compile(
+    r"^(?P<server>.+)_(?P<date>\d{4}-\d{2}-\d{2})(?:\.(?P<part>\d+))?"
+    r"\.log(?P<ext>\.gz|\.zst)?$"
+)
+COMPRESSED_EXTS = (".gz", ".zst")
+LINE_RE = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})\] (?:\[([A-Z]+)\])?")
+LEVELS = ("ERROR", "WARN", "INFO", "CMD", "ACTION", "RCON")
+
+
+def safe_server_name(name):
+    return re.sub(r'[\\/*?:"<>|]', "_", name).replace(" ", "_")
+
+
+def parse_log_name(fname):
+    info = segment_info(fname)
+    return info[:2] if info else None
+
+
+def segment_info(fname):
+    # (server, date, part, ext); the live file of a day has part None
+    match = LOG_NAME_RE.match(os.path.basename(fname))
+    if not match:
+        return None
+    part = match.group("part")
+    return (
+        match.group("server"),
+        match.group("date"),
+        int(part) if part else None,
+        match.group("ext") or "",
+    )
+
+
+def segment_sort_key(fname):
+    server, date, part, _ = segment_info(fname)
+    # Numbered parts were split off before the unnumbered live file
+    return server, date, part if part is not None else float("inf")
+
+
+def source_name(fname):
+    # Compression doesn't change a segment's identity in the log store
+    name = os.path.basename(fname)
+    for ext in COMPRESSED_EXTS:
+        if name.endswith(ext):
+            return name[: -len(ext)]
+    return name
+
+
+def is_compressed(fname):
+    return fname.endswith(COMPRESSED_EXTS)
+
+
+def open_log(path, mode="rb"):
+    if path.endswith(".gz"):
+        raw = gzip.open(path, "rb")
+    elif path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    else:
+        raw = open(path, "rb")
+    if "b" in mode:
+        return raw
+    return io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+
+
+def parse_line(line, date, prev=None):
+    # Returns (timestamp, level); continuation lines inherit from `prev`
+    match = LINE_RE.match(line)
+    if not match:
+        return prev or (day_start(date), "LOG")
+    h, m, s, tag = match.groups()
+    ts = day_start(date) + int(h) * 3600 + int(m) * 60 + int(s)
+    return ts, tag if tag in LEVELS else "LOG"
+
+
+def day_start(date):
+    return datetime.strptime(date, "%Y-%m-%d").timestamp()
+
+
+def list_logs(log_dir=LOG_DIR):
+    if not os.path.isdir(log_dir):
+        return []
+    return sorted(
+        (f for f in os.listdir(log_dir) if parse_log_name(f)), key=segment_sort_key
+    )
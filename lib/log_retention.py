@@ -0,0 +1,149 @@
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime
+
+from lib.log_files import (
+    LOG_DIR,
+    is_compressed,
+    list_logs,
+    segment_info,
+    zstandard,
+)
+from lib.log_store import get_store
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+MAX_SEGMENT_BYTES = 50 * 1024 * 1024
+SERVER_QUOTA_BYTES = 500 * 1024 * 1024
+GLOBAL_QUOTA_BYTES = 2 * 1024 * 1024 * 1024
+SWEEP_INTERVAL = 600
+COMPRESSION = "zstd" if zstandard else "gzip"
+
+
+class LogRetentionManager:
+    def __init__(self, log_dir=LOG_DIR):
+        self.log_dir = log_dir
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._worker, daemon=True)
+        self.thread.start()
+
+    def maybe_rotate(self, path, size):
+        if size >= MAX_SEGMENT_BYTES:
+            self.rotate(path)
+
+    def request_sweep(self):
+        self.queue.put("sweep")
+
+    def rotate(self, path):
+        # Moves a live file aside as the next numbered part and queues it
+        # for compression; the writer simply starts a fresh file.
+        server, date, part, ext = segment_info(path)
+        if part is not None or ext:
+            return None
+        with self.lock:
+            target = os.path.join(
+                self.log_dir, f"{server}_{date}.{self.next_part(server, date)}.log"
+            )
+            try:
+                os.rename(path, target)
+            except OSError:
+                # Still held open elsewhere (e.g. on Windows); retry next time
+                return None
+            get_store().rename(os.path.basename(path), os.path.basename(target))
+        self.queue.put(target)
+        return target
+
+    def next_part(self, server, date):
+        parts = [0]
+        for fname in list_logs(self.log_dir):
+            info = segment_info(fname)
+            if info[0] == server and info[1] == date and info[2] is not None:
+                parts.append(info[2])
+        return max(parts) + 1
+
+    def _worker(self):
+        while True:
+            try:
+                task = self.queue.get(timeout=SWEEP_INTERVAL)
+            except queue.Empty:
+                task = "sweep"
+            try:
+                if task == "sweep":
+                    self.sweep()
+                else:
+                    self.compress(task)
+            except Exception:
+                logger.exception("%s failed", task)
+
+    def compress(self, path):
+        if not os.path.exists(path) or is_compressed(path):
+            return
+        ext = ".zst" if COMPRESSION == "zstd" else ".gz"
+        target = path + ext
+        tmp = target + ".tmp"
+        with open(path, "rb") as src:
+            if COMPRESSION == "zstd":
+                with open(tmp, "wb") as dst:
+                    zstandard.ZstdCompressor(level=9).copy_stream(src, dst)
+            else:
+                with gzip.open(tmp, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+        os.replace(tmp, target)
+        os.remove(path)
+
+    def sweep(self):
+        today = datetime.now().strftime("%Y-%m-%d")
+        for fname in list_logs(self.log_dir):
+            server, date, part, ext = segment_info(fname)
+            path = os.path.join(self.log_dir, fname)
+            if ext:
+                continue
+            if part is not None:
+                self.compress(path)
+            elif date < today:
+                # Daily rotation: yesterday's live file becomes a part
+                target = self.rotate(path)
+                if target:
+                    self.compress(target)
+        self.enforce_quotas(today)
+
+    def enforce_quotas(self, today):
+        segments = []
+        for fname in list_logs(self.log_dir):
+            server, date, part, ext = segment_info(fname)
+            try:
+                size = os.path.getsize(os.path.join(self.log_dir, fname))
+            except OSError:
+                continue
+            # Today's live file counts towards the quota but is never removed
+            live = part is None and not ext and date == today
+            order = part if part is not None else float("inf")
+            segments.append((date, order, server, fname, size, live))
+        segments.sort()
+
+        per_server = {}
+        for segment in segments:
+            per_server[segment[2]] = per_server.get(segment[2], 0) + segment[4]
+        total = sum(per_server.values())
+
+        for _, _, server, fname, size, live in segments:
+            if live:
+                continue
+            if per_server[server] <= SERVER_QUOTA_BYTES and total <= GLOBAL_QUOTA_BYTES:
+                continue
+            try:
+                os.remove(os.path.join(self.log_dir, fname))
+            except OSError:
+                continue
+            get_store().forget(fname)
+            per_server[server] -= size
+            total -= size
+
+
+get_retention = lazy_singleton(LogRetentionManager)
@@ -0,0 +1,289 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from lib.log_files import (
+    LOG_DIR,
+    is_compressed,
+    list_logs,
+    open_log,
+    parse_line,
+    parse_log_name,
+    source_name,
+)
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join("cfg", "log_store.db")
+BATCH_SIZE = 2000
+BATCH_WAIT = 0.25
+CHUNK_SIZE = 4 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    server TEXT NOT NULL,
+    level TEXT NOT NULL,
+    source TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lines_server_ts ON lines(server, ts);
+CREATE INDEX IF NOT EXISTS lines_source ON lines(source, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(
+    message, content='lines', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS lines_ai AFTER INSERT ON lines BEGIN
+    INSERT INTO lines_fts(rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS lines_ad AFTER DELETE ON lines BEGIN
+    INSERT INTO lines_fts(lines_fts, rowid, message)
+    VALUES ('delete', old.id, old.message);
+END;
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    sealed INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+MARK_START = "\x02"
+MARK_END = "\x03"
+
+
+class LogStore:
+    def __init__(self, db_path=DB_PATH, log_dir=LOG_DIR):
+        self.db_path = db_path
+        self.log_dir = log_dir
+        self.queue = queue.Queue()
+        self.local = threading.local()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            columns = [r[1] for r in conn.execute("PRAGMA table_info(sources)")]
+            if "sealed" not in columns:
+                conn.execute(
+                    "ALTER TABLE sources ADD COLUMN sealed INTEGER NOT NULL DEFAULT 0"
+                )
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reader(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connect()
+        return conn
+
+    # === Writes (all applied on the writer thread) ===
+    def append(self, source, end_offset, text, ts=None):
+        self.queue.put(("line", source, end_offset, text, ts or time.time()))
+
+    def backfill(self):
+        self.queue.put(("backfill",))
+
+    def forget(self, source):
+        self.queue.put(("forget", source_name(source)))
+
+    def rename(self, old, new):
+        self.queue.put(("rename", source_name(old), source_name(new)))
+
+    def flush(self, timeout=None):
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def _writer(self):
+        conn = self.connect()
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._apply(conn, batch)
+            except Exception:
+                logger.exception("Write failed")
+                conn.rollback()
+
+    def _apply(self, conn, batch):
+        offsets = {}
+        rows = []
+        waiters = []
+        gap = False
+
+        def offset_of(source):
+            if source not in offsets:
+                row = conn.execute(
+                    "SELECT offset FROM sources WHERE source = ?", (source,)
+                ).fetchone()
+                offsets[source] = row[0] if row else 0
+            return offsets[source]
+
+        with conn:
+            for item in batch:
+                kind = item[0]
+                if kind == "line":
+                    _, source, end_offset, text, ts = item
+                    # Skip lines a backfill already picked up from disk
+                    if end_offset <= offset_of(source):
+                        continue
+                    # Only extend a source contiguously; if bytes before this
+                    # line were never indexed, leave the offset where it is
+                    # and let a backfill read the gap and this line from disk
+                    start = end_offset - len(text.encode("utf-8")) - 1
+                    if start != offset_of(source):
+                        gap = True
+                        continue
+                    parsed = parse_log_name(source)
+                    if not parsed:
+                        continue
+                    prev = (ts, "LOG")
+                    for line in text.split("\n"):
+                        prev = parse_line(line, parsed[1], prev)
+                        rows.append((prev[0], parsed[0], prev[1], source, line))
+                    offsets[source] = end_offset
+                elif kind == "backfill":
+                    self._flush_rows(conn, rows, offsets)
+                    self._backfill(conn, offsets)
+                elif kind == "forget":
+                    self._flush_rows(conn, rows, offsets)
+                    offsets.pop(item[1], None)
+                    conn.execute("DELETE FROM lines WHERE source = ?", (item[1],))
+                    conn.execute("DELETE FROM sources WHERE source = ?", (item[1],))
+                elif kind == "rename":
+                    _, old, new = item
+                    self._flush_rows(conn, rows, offsets)
+                    offsets.pop(old, None)
+                    offsets.pop(new, None)
+                    conn.execute("UPDATE lines SET source = ? WHERE source = ?", (new, old))
+                    conn.execute("DELETE FROM sources WHERE source = ?", (new,))
+                    conn.execute(
+                        "UPDATE sources SET source = ? WHERE source = ?", (new, old)
+                    )
+                elif kind == "flush":
+                    waiters.append(item[1])
+            self._flush_rows(conn, rows, offsets)
+            if gap:
+                self._backfill(conn, offsets)
+        for done in waiters:
+            done.set()
+
+    def _flush_rows(self, conn, rows, offsets):
+        if rows:
+            conn.executemany(
+                "INSERT INTO lines (ts, server, level, source, message)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            rows.clear()
+        conn.executemany(
+            "INSERT INTO sources (source, offset) VALUES (?, ?)"
+            " ON CONFLICT(source) DO UPDATE SET offset = excluded.offset",
+            offsets.items(),
+        )
+
+    def _backfill(self, conn, offsets):
+        for fname in list_logs(self.log_dir):
+            server, date = parse_log_name(fname)
+            source = source_name(fname)
+            path = os.path.join(self.log_dir, fname)
+            compressed = is_compressed(fname)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            row = conn.execute(
+                "SELECT offset, sealed FROM sources WHERE source = ?", (source,)
+            ).fetchone()
+            offset, sealed = row if row else (0, 0)
+            # Compressed segments never change, so they're read at most once
+            if sealed or (not compressed and size == offset):
+                continue
+            if not compressed and size < offset:
+                # File was truncated or replaced; re-index it from scratch
+                conn.execute("DELETE FROM lines WHERE source = ?", (source,))
+                offset = 0
+            prev = None
+            with open_log(path) as f:
+                f.seek(offset)
+                pending = b""
+                while True:
+                    chunk = f.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    data = pending + chunk
+                    end = data.rfind(b"\n") + 1
+                    pending = data[end:]
+                    if not end:
+                        continue
+                    rows = []
+                    for raw in data[:end].decode("utf-8", errors="replace").splitlines():
+                        prev = parse_line(raw, date, prev)
+                        rows.append((prev[0], server, prev[1], source, raw))
+                    offset += end
+                    offsets[source] = offset
+                    self._flush_rows(conn, rows, offsets)
+            if compressed:
+                offsets[source] = offset
+                self._flush_rows(conn, [], offsets)
+                conn.execute(
+                    "UPDATE sources SET sealed = 1 WHERE source = ?", (source,)
+                )
+
+    # === Queries (safe from any thread) ===
+    def search(self, text, server=None, level=None, since=None, until=None, limit=500):
+        clauses = ["lines_fts MATCH ?"]
+        params = []
+        for clause, value in (
+            ("l.server = ?", server),
+            ("l.level = ?", level),
+            ("l.ts >= ?", since),
+            ("l.ts < ?", until),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        sql = (
+            "SELECT l.ts, l.server, l.level,"
+            f" highlight(lines_fts, 0, '{MARK_START}', '{MARK_END}')"
+            " FROM lines_fts JOIN lines l ON l.id = lines_fts.rowid"
+            f" WHERE {' AND '.join(clauses)}"
+            " ORDER BY l.ts DESC, l.id DESC LIMIT ?"
+        )
+        conn = self.reader()
+        try:
+            return conn.execute(sql, [text, *params, limit]).fetchall()
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax; fall back to matching the plain terms
+            quoted = " ".join('"%s"' % t.replace('"', '""') for t in text.split())
+            if not quoted:
+                return []
+            return conn.execute(sql, [quoted, *params, limit]).fetchall()
+
+    def servers(self):
+        rows = self.reader().execute("SELECT DISTINCT server FROM lines").fetchall()
+        return sorted(r[0] for r in rows)
+
+
+def format_ts(ts):
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+get_store = lazy_singleton(LogStore)
@@ -0,0 +1,380 @@
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+
+from lib.log_files import is_compressed, open_log
+
+# Only every CHECKPOINT-th line start is kept, so the index stays small
+# even for multi-million line files.
+CHECKPOINT = 64
+SCAN_CHUNK = 8 * 1024 * 1024
+FOLLOW_INTERVAL = 1000
+
+TIME_RE = re.compile(rb"^\[(\d{2}):(\d{2}):(\d{2})\]")
+NEWLINE_RE = re.compile(rb"\n")
+
+
+class PagedLogView:
+    def __init__(self, master, bg="#252526", fg="white", font=("Consolas", 10)):
+        self.frame = tk.Frame(master, bg="#1e1e1e")
+        self.path = None
+        self.file = None
+        self.mm = None
+        self.size = 0
+        self.checkpoints = array("Q", [0])
+        self.line_count = 0
+        self.indexed_to = 0
+        self.last_start = 0
+        self.indexing = False
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.top_line = 0
+        self.rendered = None
+        self.pending = None
+        self.inflating = False
+        self.poll_job = None
+        self.follow = tk.BooleanVar(value=False)
+        self.font = tkfont.Font(font=font)
+
+        toolbar = tk.Frame(self.frame, bg="#1e1e1e")
+        toolbar.pack(fill="x", pady=(0, 4))
+
+        def small_entry(width):
+            return tk.Entry(
+                toolbar,
+                width=width,
+                font=("Segoe UI", 10),
+                bg="#2b2b2b",
+                fg="white",
+                insertbackground="white",
+            )
+
+        tk.Label(toolbar, text="Line:", bg="#1e1e1e", fg="white").pack(side="left")
+        self.line_entry = small_entry(8)
+        self.line_entry.pack(side="left", padx=(2, 8))
+        self.line_entry.bind("<Return>", lambda e: self.jump_to_line_entry())
+        tk.Label(toolbar, text="Time:", bg="#1e1e1e", fg="white").pack(side="left")
+        self.time_entry = small_entry(8)
+        self.time_entry.pack(side="left", padx=(2, 8))
+        self.time_entry.bind("<Return>", lambda e: self.jump_to_time_entry())
+        tk.Checkbutton(
+            toolbar,
+            text="Follow",
+            variable=self.follow,
+            command=self.on_follow_toggle,
+            bg="#1e1e1e",
+            fg="white",
+            selectcolor="#1e1e1e",
+            font=("Segoe UI", 10),
+        ).pack(side="left")
+        self.status = tk.Label(
+            toolbar, text="", fg="#bbbbbb", bg="#1e1e1e", font=("Segoe UI", 9)
+        )
+        self.status.pack(side="right")
+
+        body = tk.Frame(self.frame, bg="#1e1e1e")
+        body.pack(fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        # Read-only; disabled Text doesn't take focus on click, so grab it
+        # explicitly to keep the paging keys working
+        self.text = tk.Text(
+            body, height=14, bg=bg, fg=fg, font=self.font, wrap="none", state="disabled"
+        )
+        self.text.pack(side="left", fill="both", expand=True)
+        self.text.bind("<Button-1>", lambda e: self.text.focus_set(), add="+")
+        self.text.tag_config("highlight", background="#444444", foreground="yellow")
+
+        self.text.bind("<Configure>", lambda e: self.render())
+        self.text.bind("<MouseWheel>", self.on_wheel)
+        self.text.bind("<Button-4>", lambda e: self.scroll_lines(-3))
+        self.text.bind("<Button-5>", lambda e: self.scroll_lines(3))
+        self.text.bind("<Prior>", lambda e: self.scroll_lines(-self.page_size()))
+        self.text.bind("<Next>", lambda e: self.scroll_lines(self.page_size()))
+        self.text.bind("<Control-Home>", lambda e: self.jump_to_line(1))
+        self.text.bind("<Control-End>", lambda e: self.jump_to_line(self.line_count))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
+    # === File handling ===
+    def open(self, path):
+        self.close()
+        self.path = path
+        self.top_line = 0
+        if is_compressed(path):
+            # Rotated segments are inflated into a temp file and mapped from there
+            self.status.config(text="Decompressing...")
+            generation = self.generation
+            self.inflating = True
+            threading.Thread(
+                target=self.inflate, args=(path, generation), daemon=True
+            ).start()
+            self.schedule_poll()
+            return
+        self.attach(open(path, "rb"))
+
+    def reopen(self):
+        # The file shrank or was replaced (e.g. rotated); map it afresh
+        path, top = self.path, self.top_line
+        self.open(path)
+        self.top_line = top
+        self.render()
+
+    def replaced(self):
+        # True when the mapped file is now shorter than the mapping (reading
+        # past its end would fault) or the path points at a different file
+        if not self.file or not self.path or is_compressed(self.path):
+            return False
+        try:
+            mapped = os.fstat(self.file.fileno())
+            current = os.stat(self.path)
+        except OSError:
+            return False
+        return mapped.st_size < self.size or (
+            mapped.st_ino and mapped.st_ino != current.st_ino
+        )
+
+    def inflate(self, path, generation):
+        try:
+            tmp = tempfile.TemporaryFile()
+            with open_log(path) as src:
+                shutil.copyfileobj(src, tmp, 1024 * 1024)
+            tmp.flush()
+            self.pending = (generation, tmp)
+        except Exception as e:
+            self.pending = (generation, e)
+
+    def attach(self, file):
+        self.file = file
+        self.remap()
+        self.render()
+        self.schedule_poll()
+
+    def close(self):
+        with self.lock:
+            if self.mm:
+                self.mm.close()
+            if self.file:
+                self.file.close()
+            self.path = self.file = self.mm = None
+            self.size = self.line_count = self.indexed_to = self.last_start = 0
+            self.checkpoints = array("Q", [0])
+            self.generation += 1
+            self.indexing = False
+        self.inflating = False
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.config(state="disabled")
+        self.status.config(text="")
+
+    def remap(self):
+        size = os.fstat(self.file.fileno()).st_size
+        with self.lock:
+            if size > self.size:
+                if self.mm:
+                    self.mm.close()
+                self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+                self.size = size
+            if self.indexed_to < self.size and not self.indexing:
+                self.indexing = True
+                threading.Thread(
+                    target=self.build_index, args=(self.generation,), daemon=True
+                ).start()
+
+    def build_index(self, generation):
+        while True:
+            with self.lock:
+                start = self.indexed_to
+                end = min(start + SCAN_CHUNK, self.size)
+                if generation != self.generation:
+                    return
+                if start >= end:
+                    self.indexing = False
+                    return
+                chunk = self.mm[start:end]
+            count = self.line_count
+            added = array("Q")
+            last = -1
+            for match in NEWLINE_RE.finditer(chunk):
+                last = match.end()
+                count += 1
+                if count % CHECKPOINT == 0:
+                    added.append(start + last)
+            with self.lock:
+                if generation != self.generation:
+                    return
+                self.checkpoints.extend(added)
+                self.line_count = count
+                self.indexed_to = end
+                if last >= 0:
+                    self.last_start = start + last
+
+    def total_lines(self):
+        # A trailing line without a newline still counts as a line
+        partial = 1 if self.last_start < self.indexed_to else 0
+        return self.line_count + partial
+
+    def line_offset(self, line):
+        index = min(line // CHECKPOINT, len(self.checkpoints) - 1)
+        start = self.checkpoints[index]
+        for _ in range(line - index * CHECKPOINT):
+            nl = self.mm.find(b"\n", start)
+            if nl < 0:
+                return self.size
+            start = nl + 1
+        return start
+
+    def read_lines(self, first, count):
+        with self.lock:
+            if not self.mm:
+                return []
+            start = self.line_offset(first)
+            lines = []
+            while len(lines) < count and start < self.size:
+                nl = self.mm.find(b"\n", start)
+                end = self.size if nl < 0 else nl
+                lines.append(self.mm[start:end])
+                start = end + 1
+            return lines
+
+    # === Rendering and navigation ===
+    def page_size(self):
+        height = self.text.winfo_height()
+        return max(1, height // self.font.metrics("linespace"))
+
+    def render(self):
+        if self.replaced():
+            self.reopen()
+            return
+        total = self.total_lines()
+        page = self.page_size()
+        self.top_line = max(0, min(self.top_line, total - page))
+        lines = self.read_lines(self.top_line, page)
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.insert(
+            "1.0", b"\n".join(lines).decode("utf-8", errors="replace").replace("\r", "")
+        )
+        self.text.config(state="disabled")
+        if total:
+            self.scrollbar.set(self.top_line / total, (self.top_line + page) / total)
+            state = " (indexing...)" if self.indexing else ""
+            self.status.config(
+                text=f"Lines {self.top_line + 1}-{min(total, self.top_line + page)}"
+                f" of {total}{state}"
+            )
+        else:
+            self.scrollbar.set(0, 1)
+        self.rendered = (total, self.indexing)
+
+    def scroll_lines(self, delta):
+        self.top_line += delta
+        if delta < 0:
+            self.follow.set(False)
+        self.render()
+        return "break"
+
+    def on_wheel(self, event):
+        return self.scroll_lines(-3 if event.delta > 0 else 3)
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.top_line = int(float(args[0]) * self.total_lines())
+            self.follow.set(False)
+            self.render()
+        elif action == "scroll":
+            amount = int(args[0])
+            step = self.page_size() if args[1] == "pages" else 1
+            self.scroll_lines(amount * step)
+
+    def jump_to_line(self, line):
+        self.top_line = max(0, line - 1)
+        self.render()
+
+    def jump_to_line_entry(self):
+        try:
+            self.jump_to_line(int(self.line_entry.get()))
+        except ValueError:
+            pass
+
+    def line_time(self, line):
+        # Seconds since midnight of the first timestamped line at/after `line`
+        for raw in self.read_lines(line, CHECKPOINT):
+            match = TIME_RE.match(raw)
+            if match:
+                h, m, s = map(int, match.groups())
+                return h * 3600 + m * 60 + s
+        return None
+
+    def jump_to_time(self, target):
+        lo, hi = 0, self.total_lines()
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self.line_time(mid)
+            if value is None or value >= target:
+                hi = mid
+            else:
+                lo = mid + 1
+        self.top_line = lo
+        self.render()
+
+    def jump_to_time_entry(self):
+        parts = self.time_entry.get().strip().split(":")
+        try:
+            values = [int(p) for p in parts] + [0] * (3 - len(parts))
+        except ValueError:
+            return
+        self.jump_to_time(values[0] * 3600 + values[1] * 60 + values[2])
+
+    def on_follow_toggle(self):
+        if self.follow.get():
+            self.top_line = self.total_lines()
+            self.render()
+            self.schedule_poll()
+
+    def schedule_poll(self):
+        if self.poll_job is None:
+            self.poll_job = self.frame.after(FOLLOW_INTERVAL, self.poll)
+
+    def poll(self):
+        # Only runs while there's something to wait for: a decompression,
+        # an index still being built, or Follow being on
+        self.poll_job = None
+        if not self.frame.winfo_exists():
+            return
+        if self.pending:
+            generation, result = self.pending
+            self.pending = None
+            if generation != self.generation:
+                if not isinstance(result, Exception):
+                    result.close()
+            elif isinstance(result, Exception):
+                self.inflating = False
+                self.status.config(text=f"[ERROR] {result}")
+            else:
+                self.inflating = False
+                self.attach(result)
+        if self.file:
+            try:
+                if self.replaced():
+                    self.reopen()
+                self.remap()
+                if self.follow.get():
+                    self.top_line = self.total_lines()
+                if (self.total_lines(), self.indexing) != self.rendered:
+                    self.render()
+            except Exception as e:
+                self.status.config(text=f"[ERROR] {e}")
+        stale = self.file and (self.total_lines(), self.indexing) != self.rendered
+        if self.inflating or self.indexing or stale or (self.file and self.follow.get()):
+            self.schedule_poll()
@@ -1,9 +1,18 @@
 import os
 import json
+import time
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
 from lib.server_tab import ServerTab
 from lib.features_tab import create_features_tab
+from lib.fleet_dashboard import get_frame as fleet_dashboard_frame
+from lib.provisioning import open_provision_dialog
+from lib.rcon_console import get_frame as rcon_console_frame
+from lib.log_retention import get_retention
+from lib.log_store import get_store
+from lib.port_allocator import get_allocator
+from lib.scheduler import get_scheduler
+from lib.shutdown import FLEET_BUDGET, KILL_TIMEOUT, FleetShutdown
 
 BG_COLOR = "#1e1e1e"
 FG_COLOR = "#d4d4d4"
@@ -77,6 +86,12 @@ class HMWServerManager:
         features_menu.add_command(
             label="📂 Open Features Tab", command=self.open_features_tab
         )
+        features_menu.add_command(
+            label="🛰 Open Fleet Dashboard", command=self.open_fleet_tab
+        )
+        features_menu.add_command(
+            label="📣 Open Fleet RCON", command=self.open_rcon_tab
+        )
         features_btn.config(menu=features_menu)
 
         server_menu = tk.Menu(
@@ -88,6 +103,9 @@ class HMWServerManager:
             activeforeground=FG_COLOR,
         )
         server_menu.add_command(label="➕ Add New Server", command=self.add_server_tab)
+        server_menu.add_command(
+            label="🏭 Provision Servers...", command=lambda: open_provision_dialog(self)
+        )
         server_menu.add_command(
             label="✏️ Rename Current Tab", command=self.rename_current_tab
         )
@@ -120,42 +138,75 @@ class HMWServerManager:
 
         self.notebook = ttk.Notebook(root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        # Tabs throttle their refresh while hidden; catch up as soon as shown
+        get_scheduler(root)
+        self.notebook.bind(
+            "<<NotebookTabChanged>>", lambda _: get_scheduler().refresh(), add="+"
+        )
 
         self.tabs = []
+        get_store().backfill()
+        get_retention().request_sweep()
         self.load_sessions()
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def add_server_tab(self, name=None, config=None):
+    def add_server_tab(self, name=None, config=None, save=True, batch=False):
+        # With `batch`, the caller assigns ports for all new tabs at once
         name = name or f"Server {len(self.tabs) + 1}"
         tab = ServerTab(self, name, config)
         self.tabs.append(tab)
-        self.notebook.add(tab.frame, text=f"🖥 {name}")
-        self.notebook.select(len(self.tabs) - 1)
-        self.save_sessions()  # ✅ Save immediately
+        if tab.needs_port and not batch:
+            self.assign_ports([tab])
+        # Server tabs stay ahead of the Features/Fleet tabs so indexes match self.tabs
+        index = len(self.tabs) - 1
+        if index < self.notebook.index("end"):
+            self.notebook.insert(index, tab.frame, text=f"🖥 {name}")
+        else:
+            self.notebook.add(tab.frame, text=f"🖥 {name}")
+        self.notebook.select(tab.frame)
+        if save:
+            self.save_sessions()  # ✅ Save immediately
+        return tab
 
-    def rename_current_tab(self):
+    def current_tab_index(self):
+        # None when a non-server tab (Features, Fleet) is selected
+        if not self.notebook.select():
+            return None
         index = self.notebook.index(self.notebook.select())
+        return index if index < len(self.tabs) else None
+
+    def rename_current_tab(self):
+        index = self.current_tab_index()
+        if index is None:
+            return
         name = simpledialog.askstring(
             "Rename Server", "New name:", initialvalue=self.tabs[index].name
         )
         if name:
             self.tabs[index].name = name
+            self.tabs[index].register_config()
             self.notebook.tab(index, text=f"🖥 {name}")
             self.save_sessions()  # ✅ Save on rename
 
     def close_current_tab(self):
-        index = self.notebook.index(self.notebook.select())
-        if index >= 0:
+        index = self.current_tab_index()
+        if index is not None:
             tab = self.tabs[index]
             if tab.process and tab.process.poll() is None:
                 if not messagebox.askyesno(
                     "Close Server", "Server is running. Stop and close?"
                 ):
                     return
-                tab.process.terminate()
-            self.notebook.forget(index)
-            self.tabs.pop(index)
+                # Escalation carries on in the background after the tab is gone
+                tab.stop_server()
+            self.remove_tab(tab)
+
+    def remove_tab(self, tab, save=True):
+        tab.release_resources()
+        self.notebook.forget(tab.frame)
+        self.tabs.remove(tab)
+        if save:
             self.save_sessions()  # ✅ Save on close
 
     def save_sessions(self):
@@ -174,21 +225,86 @@ class HMWServerManager:
         with open(SESSION_FILE, "w") as f:
             json.dump(session_data, f, indent=4)
 
+    def assign_ports(self, tabs):
+        # Auto-assigns free ports with a single socket-table read for the batch
+        if not tabs:
+            return
+        ports = get_allocator().next_free_block([id(tab) for tab in tabs])
+        for tab, port in zip(tabs, ports or []):
+            tab.server_port.set(str(port))
+            tab.needs_port = False
+        if ports is None:
+            for tab in tabs:
+                tab.server_port.set("27016")
+                tab.log("[WARN] No free port in the pool; set one before starting.")
+
     def load_sessions(self):
         if os.path.exists(SESSION_FILE):
             with open(SESSION_FILE, "r") as f:
-                for tab_data in json.load(f):
-                    self.add_server_tab(tab_data["name"], tab_data)
+                tabs = [
+                    self.add_server_tab(tab_data["name"], tab_data, save=False, batch=True)
+                    for tab_data in json.load(f)
+                ]
+            self.assign_ports([tab for tab in tabs if tab.needs_port])
 
     def on_close(self):
+        if getattr(self, "_shutdown", None):
+            return  # already stopping the fleet
+        running = [tab for tab in self.tabs if tab.is_running()]
+        if running:
+            choice = messagebox.askyesnocancel(
+                "Exit",
+                f"{len(running)} server(s) are still running.\n\n"
+                "Yes: stop them (RCON quit, then terminate/kill) and exit\n"
+                "No: leave them running and exit\n"
+                "Cancel: keep the manager open",
+            )
+            if choice is None:
+                return
+            if choice:
+                self.shutdown_fleet(running)
+                return
         self.save_sessions()
         self.root.destroy()
 
+    def shutdown_fleet(self, tabs, budget=FLEET_BUDGET):
+        # Sessions are saved first so auto-restart settings survive the stop
+        self.save_sessions()
+        for tab in tabs:
+            tab.manual_stop = True
+        self._shutdown = FleetShutdown(
+            [(id(tab), tab.process, tab.quit_sender()) for tab in tabs], budget
+        )
+        names = {id(tab): tab.name for tab in tabs}
+        deadline = time.monotonic() + budget + KILL_TIMEOUT + 1
+
+        win = tk.Toplevel(self.root)
+        win.title("Stopping Servers")
+        win.configure(bg=BG_COLOR, padx=20, pady=20)
+        win.protocol("WM_DELETE_WINDOW", lambda: None)
+        status = tk.Label(
+            win, text="", bg=BG_COLOR, fg=FG_COLOR, font=("Consolas", 10), justify="left"
+        )
+        status.pack(anchor="w")
+
+        def poll():
+            stages = self._shutdown.snapshot()
+            status.config(
+                text="\n".join(f"{names[key]}: {stage}" for key, stage in stages.items())
+            )
+            if self._shutdown.done() or time.monotonic() > deadline:
+                self.root.destroy()
+                return
+            self.root.after(200, poll)
+
+        poll()
+
     def restart_all_servers(self):
         for tab in self.tabs:
             if tab.process and tab.process.poll() is None:
-                tab.stop_server()
-            tab.start_server()
+                tab.stop_server(on_stopped=tab.start_server)
+            else:
+                tab.start_server()
 
     def open_logs_folder(self):
         import subprocess
@@ -209,4 +325,16 @@ class HMWServerManager:
             create_features_tab(features_tab)
             self.notebook.add(features_tab, text="🧩 Features")
             self._features_tab_created = True
-            self.notebook.select(len(self.tabs))
+            self.notebook.select(features_tab)
+
+    def open_fleet_tab(self):
+        if not hasattr(self, "_fleet_tab"):
+            self._fleet_tab = fleet_dashboard_frame(self.notebook, self)
+            self.notebook.add(self._fleet_tab, text="🛰 Fleet")
+        self.notebook.select(self._fleet_tab)
+
+    def open_rcon_tab(self):
+        if not hasattr(self, "_rcon_tab"):
+            self._rcon_tab = rcon_console_frame(self.notebook, self)
+            self.notebook.add(self._rcon_tab, text="📣 Fleet RCON")
+        self.notebook.select(self._rcon_tab)
@@ -0,0 +1,165 @@
+import os
+import socket
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MAX_WORKERS = 32
+MAX_IN_FLIGHT = 256
+PROC_TABLES = (
+    ("udp", "/proc/net/udp"),
+    ("udp", "/proc/net/udp6"),
+    ("tcp", "/proc/net/tcp"),
+    ("tcp", "/proc/net/tcp6"),
+)
+TCP_LISTEN = "0A"
+
+SocketEntry = namedtuple(
+    "SocketEntry", "proto ip port state tx_queue rx_queue inode drops pid"
+)
+PortStatus = namedtuple("PortStatus", "port udp_free tcp_free owners")
+
+
+def decode_address(value):
+    # "0100007F:6984" -> ("127.0.0.1", 27012); IPv6 words are little-endian too
+    host, port = value.split(":")
+    raw = bytes.fromhex(host)
+    if len(raw) == 4:
+        ip = socket.inet_ntop(socket.AF_INET, raw[::-1])
+    else:
+        words = b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4))
+        ip = socket.inet_ntop(socket.AF_INET6, words)
+    return ip, int(port, 16)
+
+
+def read_proc_table(proto, path):
+    entries = []
+    try:
+        with open(path, "r") as f:
+            next(f, None)
+            for line in f:
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                ip, port = decode_address(fields[1])
+                tx_queue, rx_queue = (int(v, 16) for v in fields[4].split(":"))
+                drops = int(fields[12]) if proto == "udp" and len(fields) > 12 else 0
+                entries.append(
+                    SocketEntry(
+                        proto, ip, port, fields[3], tx_queue, rx_queue,
+                        int(fields[9]), drops, None,
+                    )
+                )
+    except (OSError, ValueError):
+        pass
+    return entries
+
+
+def read_socket_table():
+    # Kernel view of bound sockets: /proc/net on Linux, psutil elsewhere
+    if os.path.exists(PROC_TABLES[0][1]):
+        entries = []
+        for proto, path in PROC_TABLES:
+            entries.extend(read_proc_table(proto, path))
+        return entries
+    if psutil is None:
+        return []
+    entries = []
+    try:
+        connections = psutil.net_connections(kind="inet")
+    except (psutil.Error, OSError):
+        return []
+    for conn in connections:
+        if not conn.laddr:
+            continue
+        proto = "udp" if conn.type == socket.SOCK_DGRAM else "tcp"
+        state = TCP_LISTEN if conn.status == psutil.CONN_LISTEN else conn.status
+        entries.append(
+            SocketEntry(
+                proto, conn.laddr.ip, conn.laddr.port, state, 0, 0, None, 0, conn.pid
+            )
+        )
+    return entries
+
+
+def bound_ports(entries):
+    # {(proto, port): [entries]} for sockets that actually occupy the port
+    bound = {}
+    for entry in entries:
+        if entry.proto == "tcp" and entry.state != TCP_LISTEN:
+            continue
+        bound.setdefault((entry.proto, entry.port), []).append(entry)
+    return bound
+
+
+def probe_bind(port, host="0.0.0.0", proto="udp"):
+    kind = socket.SOCK_DGRAM if proto == "udp" else socket.SOCK_STREAM
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, kind)
+    try:
+        if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
+            # Windows would otherwise let the probe share a port in use
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        sock.bind((host, port))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def check_port(port, host="0.0.0.0", bound=None):
+    # The socket table is checked first; the bind probe catches anything the
+    # snapshot missed (or platforms where no table is available)
+    bound = bound or {}
+    udp_owners = bound.get(("udp", port), [])
+    tcp_owners = bound.get(("tcp", port), [])
+    udp_free = not udp_owners and probe_bind(port, host, "udp")
+    tcp_free = not tcp_owners and probe_bind(port, host, "tcp")
+    return PortStatus(port, udp_free, tcp_free, udp_owners + tcp_owners)
+
+
+def scan_ports(ports, host="0.0.0.0", on_result=None, cancel=None,
+               workers=MAX_WORKERS):
+    # Runs on the caller's (worker) thread; results stream via on_result as
+    # they complete. The semaphore caps queued probes so huge ranges don't
+    # allocate a future per port up front.
+    bound = bound_ports(read_socket_table())
+    slots = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+    results = []
+
+    def done(future):
+        slots.release()
+        try:
+            status = future.result()
+        except Exception:
+            return
+        results.append(status)
+        if on_result:
+            on_result(status)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for port in ports:
+            if cancel is not None and cancel.is_set():
+                break
+            slots.acquire()
+            pool.submit(check_port, port, host, bound).add_done_callback(done)
+    return results
+
+
+def describe_owners(owners):
+    parts = []
+    for entry in owners:
+        label = f"{entry.proto.upper()} {entry.ip}"
+        if entry.pid and psutil is not None:
+            try:
+                label += f" pid {entry.pid} ({psutil.Process(entry.pid).name()})"
+            except psutil.Error:
+                label += f" pid {entry.pid}"
+        parts.append(label)
+    return ", ".join(parts)
@@ -0,0 +1,297 @@
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.path.join("cfg", "player_sessions.db")
+BATCH_SIZE = 500
+BATCH_WAIT = 1.0
+HOUR = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    map TEXT,
+    gametype TEXT,
+    started REAL NOT NULL,
+    ended REAL
+);
+CREATE INDEX IF NOT EXISTS matches_server_started ON matches(server, started);
+CREATE INDEX IF NOT EXISTS matches_map ON matches(map);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    server TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    client INTEGER NOT NULL,
+    match_id INTEGER,
+    map TEXT,
+    joined REAL NOT NULL,
+    left REAL,
+    kills INTEGER NOT NULL DEFAULT 0,
+    deaths INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_joined ON sessions(joined);
+CREATE INDEX IF NOT EXISTS sessions_server_joined ON sessions(server, joined);
+CREATE INDEX IF NOT EXISTS sessions_guid ON sessions(guid);
+CREATE INDEX IF NOT EXISTS sessions_match ON sessions(match_id);
+"""
+
+# games_mp-style event lines, optionally behind a "  12:34 " game-time prefix
+EVENT_RE = re.compile(r"^\s*(?:\d+:\d\d\s+)?(J;|Q;|K;|InitGame:|ShutdownGame:)(.*)$")
+DVAR_RE = re.compile(r"\\(mapname|g_gametype)\\([^\\]*)")
+
+
+def parse_event(line):
+    # -> (kind, fields) or None; kind is "J", "Q", "K", "InitGame" or "ShutdownGame"
+    match = EVENT_RE.match(line)
+    if not match:
+        return None
+    tag, rest = match.groups()
+    if tag.endswith(";"):
+        fields = rest.split(";")
+        if tag == "K;" and len(fields) < 8:
+            return None
+        if tag != "K;" and (len(fields) < 3 or not fields[1].strip().isdigit()):
+            return None
+        return tag[0], fields
+    if tag == "InitGame:":
+        return "InitGame", dict(DVAR_RE.findall(rest))
+    return "ShutdownGame", None
+
+
+class SessionStore:
+    # Player sessions parsed from server output. Lines are queued from the
+    # reader threads and parsed, tracked and inserted in batches on one writer
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.queue = queue.Queue()
+        self.local = threading.local()
+        # Writer-thread state: server -> {client: (session id, guid)} and the
+        # current (match id, map) per server
+        self.open_sessions = defaultdict(dict)
+        self.matches = {}
+        self.counts = {}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            # Sessions still open from a previous run have no known end
+            conn.execute("UPDATE sessions SET left = joined WHERE left IS NULL")
+            conn.execute("UPDATE matches SET ended = started WHERE ended IS NULL")
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reader(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connect()
+        return conn
+
+    # === Writes (all applied on the writer thread) ===
+    def feed(self, server, line, ts=None):
+        # Cheap enough to call for every stdout line; only events are queued
+        event = parse_event(line)
+        if event:
+            self.queue.put((server, ts or time.time(), *event))
+
+    def end_server(self, server, ts=None):
+        # The process exited: close whatever it left open
+        self.queue.put((server, ts or time.time(), "End", None))
+
+    def flush(self, timeout=None):
+        done = threading.Event()
+        self.queue.put((None, None, "Flush", done))
+        return done.wait(timeout)
+
+    def _writer(self):
+        conn = self.connect()
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            waiters = []
+            try:
+                with conn:
+                    for server, ts, kind, data in batch:
+                        if kind == "Flush":
+                            waiters.append(data)
+                        else:
+                            self._apply(conn, server, ts, kind, data)
+                    self._write_counts(conn)
+            except Exception:
+                logger.exception("Write failed")
+                # In-memory state may point at rows that were rolled back
+                self.open_sessions.clear()
+                self.matches.clear()
+                self.counts.clear()
+            for done in waiters:
+                done.set()
+
+    def _apply(self, conn, server, ts, kind, data):
+        sessions = self.open_sessions[server]
+        if kind == "J":
+            guid, client, name = data[0], int(data[1]), ";".join(data[2:])
+            previous = sessions.get(client)
+            if previous and previous[1] == guid:
+                return  # already tracked in this match
+            if previous:
+                self._close(conn, server, client, ts)
+            match_id, map_name = self.matches.get(server, (None, None))
+            cursor = conn.execute(
+                "INSERT INTO sessions (server, guid, name, client, match_id, map, joined)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (server, guid, name, client, match_id, map_name, ts),
+            )
+            sessions[client] = (cursor.lastrowid, guid)
+        elif kind == "Q":
+            self._close(conn, server, int(data[1]), ts)
+        elif kind == "K":
+            # K;victim guid;victim num;team;name;attacker guid;attacker num;...
+            victim, attacker = data[1].strip(), data[5].strip()
+            for client, index in ((attacker, 0), (victim, 1)):
+                if index == 0 and attacker == victim:
+                    continue  # suicides only count as a death
+                session = sessions.get(int(client)) if client.isdigit() else None
+                if session:
+                    self.counts.setdefault(session[0], [0, 0])[index] += 1
+        elif kind == "InitGame":
+            # Players are re-announced with J; lines after every map load, so
+            # each session covers one match
+            self._end_match(conn, server, ts)
+            cursor = conn.execute(
+                "INSERT INTO matches (server, map, gametype, started) VALUES (?, ?, ?, ?)",
+                (server, data.get("mapname"), data.get("g_gametype"), ts),
+            )
+            self.matches[server] = (cursor.lastrowid, data.get("mapname"))
+        elif kind in ("ShutdownGame", "End"):
+            self._end_match(conn, server, ts)
+
+    def _close(self, conn, server, client, ts):
+        session = self.open_sessions[server].pop(client, None)
+        if session:
+            conn.execute(
+                "UPDATE sessions SET left = ? WHERE id = ?", (ts, session[0])
+            )
+
+    def _end_match(self, conn, server, ts):
+        for client in list(self.open_sessions[server]):
+            self._close(conn, server, client, ts)
+        match = self.matches.pop(server, None)
+        if match:
+            conn.execute("UPDATE matches SET ended = ? WHERE id = ?", (ts, match[0]))
+
+    def _write_counts(self, conn):
+        if self.counts:
+            conn.executemany(
+                "UPDATE sessions SET kills = kills + ?, deaths = deaths + ? WHERE id = ?",
+                [(kills, deaths, sid) for sid, (kills, deaths) in self.counts.items()],
+            )
+            self.counts.clear()
+
+    # === Queries (safe from any thread) ===
+    def _filters(self, server, since, until, clauses=None):
+        clauses, params = list(clauses or []), []
+        if server is not None:
+            clauses.append("server = ?")
+            params.append(server)
+        if since is not None:
+            clauses.append("(left IS NULL OR left >= ?)")
+            params.append(since)
+        if until is not None:
+            clauses.append("joined < ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def concurrent(self, since, until=None, server=None, bucket=HOUR):
+        # Peak concurrent players per bucket, swept from session start/end
+        until = until or time.time()
+        where, params = self._filters(server, since, until)
+        rows = self.reader().execute(
+            f"SELECT joined, left FROM sessions{where}", params
+        ).fetchall()
+        events = []
+        for joined, left in rows:
+            events.append((max(joined, since), 1))
+            events.append((min(left if left is not None else until, until), -1))
+        # Leaves sort ahead of joins at the same instant
+        events.sort()
+        peaks = []
+        current = position = 0
+        start = since // bucket * bucket
+        while start < until:
+            end = start + bucket
+            peak = current
+            while position < len(events) and events[position][0] < end:
+                current += events[position][1]
+                peak = max(peak, current)
+                position += 1
+            peaks.append((start, peak))
+            start = end
+        return peaks
+
+    def hourly_profile(self, since, until=None, server=None):
+        # Average of the hourly peaks for each hour of the day (local time)
+        totals = defaultdict(list)
+        for start, peak in self.concurrent(since, until, server):
+            totals[time.localtime(start).tm_hour].append(peak)
+        return [
+            (hour, sum(totals[hour]) / len(totals[hour]) if totals[hour] else 0.0,
+             max(totals[hour], default=0))
+            for hour in range(24)
+        ]
+
+    def repeat_players(self, since=None, limit=100):
+        where, params = self._filters(None, since, None)
+        return self.reader().execute(
+            "SELECT guid, MAX(name), COUNT(DISTINCT date(joined, 'unixepoch', 'localtime'))"
+            " AS days, COUNT(*), SUM(COALESCE(left, joined) - joined), MAX(joined)"
+            f" FROM sessions{where} GROUP BY guid HAVING days > 1"
+            " ORDER BY days DESC, COUNT(*) DESC LIMIT ?",
+            [*params, limit],
+        ).fetchall()
+
+    def map_population(self, since=None, server=None):
+        # (map, matches, unique players, average players per match)
+        where, params = self._filters(server, since, None, clauses=["map IS NOT NULL"])
+        return self.reader().execute(
+            "SELECT map, COUNT(DISTINCT match_id), COUNT(DISTINCT guid),"
+            " CAST(COUNT(DISTINCT guid || ':' || match_id) AS REAL)"
+            " / MAX(COUNT(DISTINCT match_id), 1)"
+            f" FROM sessions{where} GROUP BY map ORDER BY 4 DESC",
+            params,
+        ).fetchall()
+
+    def totals(self, since=None, server=None):
+        where, params = self._filters(server, since, None)
+        return self.reader().execute(
+            f"SELECT COUNT(*), COUNT(DISTINCT guid) FROM sessions{where}", params
+        ).fetchone()
+
+    def servers(self):
+        rows = self.reader().execute("SELECT DISTINCT server FROM sessions").fetchall()
+        return sorted(r[0] for r in rows)
+
+
+get_sessions = lazy_singleton(SessionStore)
@@ -0,0 +1,193 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from lib.player_sessions import get_sessions
+
+ALL = "All"
+RANGES = (("Last 24 hours", 1), ("Last 7 days", 7), ("Last 30 days", 30))
+CHART_HEIGHT = 140
+
+
+def get_frame(master):
+    frame = tk.Frame(master, bg="#1e1e1e", padx=20, pady=20)
+
+    tk.Label(
+        frame,
+        text="👥 Player Sessions",
+        font=("Segoe UI", 14, "bold"),
+        fg="white",
+        bg="#1e1e1e",
+    ).pack(pady=(0, 10))
+
+    store = get_sessions()
+
+    # === Filters ===
+    filter_frame = tk.Frame(frame, bg="#1e1e1e")
+    filter_frame.pack(fill="x", pady=(0, 5))
+    range_var = tk.StringVar(value=RANGES[1][0])
+    server_var = tk.StringVar(value=ALL)
+
+    tk.Label(filter_frame, text="Range:", bg="#1e1e1e", fg="white").pack(side="left")
+    range_menu = tk.OptionMenu(
+        filter_frame,
+        range_var,
+        *[label for label, _ in RANGES],
+        command=lambda _: refresh(),
+    )
+    range_menu.config(bg="#2b2b2b", fg="white", highlightthickness=0)
+    range_menu.pack(side="left", padx=(3, 10))
+
+    tk.Label(filter_frame, text="Server:", bg="#1e1e1e", fg="white").pack(side="left")
+    server_menu = tk.OptionMenu(filter_frame, server_var, ALL)
+    server_menu.config(bg="#2b2b2b", fg="white", highlightthickness=0)
+    server_menu.pack(side="left", padx=(3, 10))
+
+    tk.Button(
+        filter_frame,
+        text="🔄 Refresh",
+        command=lambda: refresh(),
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 9),
+    ).pack(side="left")
+
+    summary_label = tk.Label(
+        frame, text="", fg="lime", bg="#1e1e1e", font=("Segoe UI", 11)
+    )
+    summary_label.pack(anchor="w", pady=(5, 5))
+
+    # === Concurrent players by hour of day ===
+    tk.Label(
+        frame,
+        text="Concurrent players by hour of day (bar: average hourly peak, tick: max)",
+        bg="#1e1e1e",
+        fg="#bbbbbb",
+    ).pack(anchor="w")
+    chart = tk.Canvas(frame, height=CHART_HEIGHT, bg="#252526", highlightthickness=0)
+    chart.pack(fill="x", pady=(0, 10))
+
+    # === Tables ===
+    tables = tk.Frame(frame, bg="#1e1e1e")
+    tables.pack(fill="both", expand=True)
+
+    def table(parent, columns):
+        tree = ttk.Treeview(
+            parent, columns=[c for c, _, _ in columns], show="headings", height=10
+        )
+        for column, heading, width in columns:
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, stretch=column in ("map", "name"))
+        return tree
+
+    maps_frame = tk.Frame(tables, bg="#1e1e1e")
+    maps_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
+    tk.Label(maps_frame, text="Per-map population", bg="#1e1e1e", fg="#bbbbbb").pack(
+        anchor="w"
+    )
+    maps_tree = table(
+        maps_frame,
+        (
+            ("map", "Map", 140),
+            ("matches", "Matches", 70),
+            ("players", "Players", 70),
+            ("average", "Avg / Match", 90),
+        ),
+    )
+    maps_tree.pack(fill="both", expand=True)
+
+    players_frame = tk.Frame(tables, bg="#1e1e1e")
+    players_frame.pack(side="left", fill="both", expand=True, padx=(5, 0))
+    tk.Label(
+        players_frame, text="Repeat players", bg="#1e1e1e", fg="#bbbbbb"
+    ).pack(anchor="w")
+    players_tree = table(
+        players_frame,
+        (
+            ("name", "Name", 140),
+            ("days", "Days", 50),
+            ("sessions", "Sessions", 70),
+            ("hours", "Hours", 60),
+            ("last", "Last Seen", 120),
+        ),
+    )
+    players_tree.pack(fill="both", expand=True)
+
+    def draw_chart(profile):
+        chart.delete("all")
+        width = max(chart.winfo_width(), 480)
+        top = max([peak for _, _, peak in profile] + [1])
+        slot = width / 24
+        usable = CHART_HEIGHT - 30
+        for hour, average, peak in profile:
+            x = hour * slot
+            bar = average / top * usable
+            chart.create_rectangle(
+                x + 3,
+                CHART_HEIGHT - 18 - bar,
+                x + slot - 3,
+                CHART_HEIGHT - 18,
+                fill="#0db9d7",
+                outline="",
+            )
+            y = CHART_HEIGHT - 18 - peak / top * usable
+            chart.create_line(x + 3, y, x + slot - 3, y, fill="lime")
+            chart.create_text(
+                x + slot / 2,
+                CHART_HEIGHT - 8,
+                text=f"{hour:02d}",
+                fill="#888888",
+                font=("Consolas", 8),
+            )
+        chart.create_text(
+            4, 4, text=f"max {top}", anchor="nw", fill="#888888", font=("Consolas", 8)
+        )
+
+    def refresh():
+        days = dict(RANGES)[range_var.get()]
+        since = time.time() - days * 86400
+        servers = store.servers()
+        server_menu["menu"].delete(0, "end")
+        for option in [ALL] + servers:
+            server_menu["menu"].add_command(
+                label=option, command=lambda o=option: (server_var.set(o), refresh())
+            )
+        if server_var.get() not in [ALL] + servers:
+            server_var.set(ALL)
+        server = None if server_var.get() == ALL else server_var.get()
+
+        try:
+            sessions, unique = store.totals(since, server)
+            hourly = store.concurrent(since, server=server)
+            profile = store.hourly_profile(since, server=server)
+            maps = store.map_population(since, server)
+            repeat = store.repeat_players(since)
+        except Exception as e:
+            summary_label.config(text=f"[ERROR] {e}", fg="red")
+            return
+
+        peak = max([count for _, count in hourly] + [0])
+        summary_label.config(
+            text=f"{sessions} sessions, {unique} unique players, peak {peak} concurrent",
+            fg="lime",
+        )
+        draw_chart(profile)
+        maps_tree.delete(*maps_tree.get_children())
+        for name, matches, players, average in maps:
+            maps_tree.insert("", "end", values=(name, matches, players, f"{average:.1f}"))
+        players_tree.delete(*players_tree.get_children())
+        for guid, name, days_seen, count, played, last in repeat:
+            players_tree.insert(
+                "",
+                "end",
+                values=(
+                    name,
+                    days_seen,
+                    count,
+                    f"{(played or 0) / 3600:.1f}",
+                    time.strftime("%Y-%m-%d %H:%M", time.localtime(last)),
+                ),
+            )
+
+    frame.bind("<Map>", lambda _: refresh())
+    return frame
@@ -0,0 +1,99 @@
+import threading
+
+from lib.net_probe import bound_ports, describe_owners, probe_bind, read_socket_table
+from lib.singleton import lazy_singleton
+
+# New tabs are auto-assigned the first free port in this range
+PORT_POOL_START = 27016
+PORT_POOL_END = 27115
+DEFAULT_HOST = "0.0.0.0"
+
+
+class PortAllocator:
+    # Claims: the port each tab is configured with (so auto-assign skips it).
+    # Reservations: ports held exclusively from launch until the process exits.
+    def __init__(self, start=PORT_POOL_START, end=PORT_POOL_END):
+        self.pool = range(start, end + 1)
+        self.lock = threading.Lock()
+        self.claims = {}
+        self.reservations = {}
+
+    def claim(self, key, port):
+        with self.lock:
+            if str(port).isdigit():
+                self.claims[key] = int(port)
+            else:
+                self.claims.pop(key, None)
+
+    def forget(self, key):
+        with self.lock:
+            self.claims.pop(key, None)
+            for port in [p for p, (owner, _) in self.reservations.items() if owner == key]:
+                del self.reservations[port]
+
+    def _os_conflict(self, port, host, bound):
+        owners = bound.get(("udp", port))
+        if owners:
+            return f"in use by {describe_owners(owners)}"
+        if not probe_bind(port, host, "udp"):
+            return "the OS refused a UDP bind"
+        return None
+
+    def next_free_block(self, keys, host=DEFAULT_HOST, start=None, claim=True):
+        # One socket-table read for a whole batch. All-or-nothing: returns None
+        # (claiming nothing) if there aren't enough free ports
+        bound = bound_ports(read_socket_table())
+        ports = range(start, 65536) if start else self.pool
+        with self.lock:
+            taken = set(self.reservations)
+            taken.update(p for k, p in self.claims.items() if k not in keys)
+            found = []
+            for port in ports:
+                if len(found) == len(keys):
+                    break
+                if port in taken or self._os_conflict(port, host, bound):
+                    continue
+                found.append(port)
+            if len(found) < len(keys):
+                return None
+            if claim:
+                self.claims.update(zip(keys, found))
+            return found
+
+    def check(self, key, port, host=DEFAULT_HOST):
+        # Same verification as reserve(), without taking the port
+        port = int(port)
+        bound = bound_ports(read_socket_table())
+        with self.lock:
+            holder = self.reservations.get(port)
+            if holder and holder[0] != key:
+                return f"reserved by {holder[1] or 'another server'}"
+            return None if holder else self._os_conflict(port, host, bound)
+
+    def reserve(self, key, port, name=None, host=DEFAULT_HOST):
+        # Returns None on success, otherwise the reason the port can't be used
+        port = int(port)
+        bound = bound_ports(read_socket_table())
+        with self.lock:
+            holder = self.reservations.get(port)
+            if holder and holder[0] != key:
+                return f"reserved by {holder[1] or 'another server'}"
+            conflict = None if holder else self._os_conflict(port, host, bound)
+            if conflict:
+                return conflict
+            self.reservations[port] = (key, name)
+            self.claims[key] = port
+        return None
+
+    def release(self, key, port):
+        with self.lock:
+            holder = self.reservations.get(int(port))
+            if holder and holder[0] == key:
+                del self.reservations[int(port)]
+
+    def reserved(self):
+        with self.lock:
+            return {port: name for port, (_, name) in self.reservations.items()}
+
+
+get_allocator = lazy_singleton(PortAllocator)
@@ -1,8 +1,11 @@
 import tkinter as tk
-import socket
-import asyncio
+import queue
 import threading
 
+from lib.net_probe import describe_owners, scan_ports
+
+POLL_MS = 100
+
 
 def get_frame(master):
     frame = tk.Frame(master, bg="#1e1e1e", padx=20, pady=20)
@@ -29,7 +32,7 @@ def get_frame(master):
     entry.insert(0, "27016-27020")
     entry.pack(fill="x", pady=(0, 5))
 
-    host_var = tk.StringVar(value="127.0.0.1")
+    host_var = tk.StringVar(value="0.0.0.0")
     host_frame = tk.Frame(frame, bg="#1e1e1e")
     host_frame.pack(anchor="w", pady=(5, 10))
 
@@ -43,6 +46,16 @@ def get_frame(master):
     host_menu["menu"].config(bg="#2b2b2b", fg="white")
     host_menu.pack(side="left")
 
+    conflicts_only = tk.BooleanVar(value=False)
+    tk.Checkbutton(
+        host_frame,
+        text="Only show ports in use",
+        variable=conflicts_only,
+        bg="#1e1e1e",
+        fg="white",
+        selectcolor="#1e1e1e",
+    ).pack(side="left", padx=(15, 0))
+
     result_box = tk.Text(
         frame, height=12, bg="#252526", fg="white", font=("Consolas", 10), wrap="none"
     )
@@ -64,23 +77,56 @@ def get_frame(master):
                     ports.add(int(part))
         return sorted(p for p in ports if 1 <= p <= 65535)
 
-    async def scan_port(loop, host, port):
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.setblocking(False)
-            await loop.sock_connect(sock, (host, port))
-            sock.close()
-            return port, False  # False = in use
-        except:
-            return port, True  # True = available
-
-    async def scan_all_ports(host, ports):
-        loop = asyncio.get_event_loop()
-        tasks = [scan_port(loop, host, port) for port in ports]
-        results = await asyncio.gather(*tasks)
-        return results
+    results = queue.Queue()
+    scan = {"cancel": None, "total": 0, "done": 0, "busy": 0, "job": None}
+    progress_label = tk.Label(frame, text="", bg="#1e1e1e", fg="#bbbbbb")
+    progress_label.pack(anchor="w")
+
+    def format_status(status):
+        if status.udp_free and status.tcp_free:
+            return f"[🟢 FREE] Port {status.port} is available (UDP+TCP)\n"
+        busy = [
+            proto
+            for proto, free in (("UDP", status.udp_free), ("TCP", status.tcp_free))
+            if not free
+        ]
+        owners = describe_owners(status.owners)
+        detail = f" by {owners}" if owners else ""
+        return f"[🔴 IN USE] Port {status.port} {'/'.join(busy)} occupied{detail}\n"
+
+    def poll_results():
+        # Drain whatever finished since the last tick in a single insert
+        lines = []
+        while True:
+            try:
+                token, status = results.get_nowait()
+            except queue.Empty:
+                break
+            if token is not scan["cancel"]:
+                continue  # left over from a restarted scan
+            if status is None:
+                scan["cancel"] = None
+                continue
+            scan["done"] += 1
+            if not (status.udp_free and status.tcp_free):
+                scan["busy"] += 1
+            elif conflicts_only.get():
+                continue
+            lines.append(format_status(status))
+        if lines:
+            result_box.insert("end", "".join(lines))
+            result_box.see("end")
+        progress_label.config(
+            text=f"{scan['done']}/{scan['total']} checked, {scan['busy']} in use"
+            + ("" if scan["cancel"] else " - done")
+        )
+        scan["job"] = None
+        if scan["cancel"] and frame.winfo_exists():
+            scan["job"] = frame.after(POLL_MS, poll_results)
 
     def start_async_scan():
+        if scan["cancel"]:
+            scan["cancel"].set()
         result_box.delete("1.0", "end")
         raw = entry.get().strip()
         try:
@@ -92,24 +138,31 @@ def get_frame(master):
             result_box.insert(
                 "end", f"🔎 Scanning {len(ports)} port(s) on {host_var.get()}...\n\n"
             )
+            cancel = threading.Event()
+            scan.update(cancel=cancel, total=len(ports), done=0, busy=0)
+            host = host_var.get()
 
-            async def runner():
-                results = await scan_all_ports(host_var.get(), ports)
-                for port, is_free in results:
-                    if is_free:
-                        result_box.insert(
-                            "end", f"[🟢 FREE] Port {port} is available\n"
-                        )
-                    else:
-                        result_box.insert(
-                            "end", f"[🔴 IN USE] Port {port} is occupied\n"
-                        )
+            def on_result(status):
+                if not cancel.is_set():
+                    results.put((cancel, status))
+
+            def runner():
+                try:
+                    scan_ports(ports, host, on_result=on_result, cancel=cancel)
+                finally:
+                    results.put((cancel, None))
 
-            threading.Thread(target=lambda: asyncio.run(runner())).start()
+            threading.Thread(target=runner, daemon=True).start()
+            if scan["job"] is None:
+                poll_results()
 
         except Exception as e:
             result_box.insert("end", f"[ERROR] {e}\n")
 
+    def stop_scan():
+        if scan["cancel"]:
+            scan["cancel"].set()
+
     def suggest_ports():
         entry.delete(0, "end")
         entry.insert(0, "27016-27020")
@@ -156,6 +209,14 @@ def get_frame(master):
         bg="#3a3a3a",
         fg="white",
         command=scan_all_from_manager,
+    ).pack(side="left", padx=(0, 5))
+    tk.Button(
+        control_frame,
+        text="⏹ Stop",
+        font=("Segoe UI", 10),
+        bg="#3a3a3a",
+        fg="white",
+        command=stop_scan,
     ).pack(side="left")
 
     return frame
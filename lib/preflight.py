@@ -0,0 +1,155 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from lib.cfg_lint import errors, lint_file
+from lib.port_allocator import DEFAULT_HOST, get_allocator
+
+PREFLIGHT_WORKERS = 8
+MIN_FREE_DISK = 1024 ** 3
+MIN_FREE_RAM = 1024 ** 3
+WRITABLE_TTL = 300
+CACHE_SIZE = 256
+
+Check = namedtuple("Check", "name severity message")
+
+# Shared by every tab, so a fleet-wide start queues here instead of on Tk
+_pool = ThreadPoolExecutor(max_workers=PREFLIGHT_WORKERS, thread_name_prefix="preflight")
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def cached(key, stamp, compute):
+    # Reuses a previous result while `stamp` (usually mtime/size) is unchanged.
+    # Least recently used entries are dropped past CACHE_SIZE.
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit and hit[0] == stamp:
+            _cache.move_to_end(key)
+            return hit[1]
+    result = compute()
+    with _cache_lock:
+        _cache[key] = (stamp, result)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def check_executable(exe):
+    def compute():
+        if not os.path.isfile(exe):
+            return [Check("executable", "error", "Executable not found")]
+        if os.path.getsize(exe) == 0:
+            return [Check("executable", "error", "Executable is empty")]
+        if exe.lower().endswith(".exe"):
+            with open(exe, "rb") as f:
+                if f.read(2) != b"MZ":
+                    return [Check("executable", "error", "Not a valid Windows executable")]
+        elif not os.access(exe, os.X_OK):
+            return [Check("executable", "error", "File is not executable")]
+        return [Check("executable", "ok", os.path.basename(exe))]
+
+    return cached(("exe", exe), file_stamp(exe), compute)
+
+
+def check_config(cfg, game_dir=None):
+    if not os.path.isfile(cfg):
+        return [Check("config", "error", "Config file not found")]
+    # lint_file is cached on the parsed model, keyed by the cfg and include mtimes
+    issues = lint_file(cfg, game_dir)
+    # Errors first; every finding is reported so it can be fixed from the log
+    checks = [
+        Check("config", i.severity, f"{os.path.basename(i.file)}:{i.line}: {i.message}")
+        for i in errors(issues) + [i for i in issues if i.severity != "error"]
+    ]
+    return checks or [Check("config", "ok", "Parsed cleanly")]
+
+
+def check_port(port, key=None, host=DEFAULT_HOST):
+    if not str(port).isdigit() or not 1 <= int(port) <= 65535:
+        return [Check("port", "error", f"Invalid port {port!r}")]
+    conflict = get_allocator().check(key, int(port), host)
+    if conflict:
+        return [Check("port", "error", f"Port {port} is unavailable: {conflict}")]
+    return [Check("port", "ok", f"UDP {port} is free")]
+
+
+def check_disk(directory):
+    try:
+        free = shutil.disk_usage(directory or ".").free
+    except OSError as e:
+        return [Check("disk", "error", str(e))]
+    if free < MIN_FREE_DISK:
+        # A dedicated server needs little disk beyond its logs, so only warn
+        return [Check("disk", "warning", f"Only {free // 1024 ** 2} MB free on disk")]
+    return [Check("disk", "ok", f"{free / 1024 ** 3:.1f} GB free")]
+
+
+def check_memory():
+    if psutil is None:
+        return [Check("memory", "ok", "Skipped (psutil unavailable)")]
+    available = psutil.virtual_memory().available
+    if available < MIN_FREE_RAM:
+        return [
+            Check("memory", "warning", f"Only {available // 1024 ** 2} MB RAM available")
+        ]
+    return [Check("memory", "ok", f"{available / 1024 ** 3:.1f} GB RAM available")]
+
+
+def check_writable(directory):
+    def compute():
+        try:
+            with tempfile.TemporaryFile(dir=directory or "."):
+                pass
+        except OSError as e:
+            return [Check("workdir", "error", f"Working directory not writable: {e}")]
+        return [Check("workdir", "ok", "Writable")]
+
+    # Probing writes a file (touching the dir mtime), so expire by time instead
+    return cached(("writable", directory), int(time.time() // WRITABLE_TTL), compute)
+
+
+def start_preflight(exe, cfg, port, key=None, host=DEFAULT_HOST):
+    # Returns futures; the caller polls them from the Tk thread
+    workdir = os.path.dirname(exe)
+    jobs = (
+        (check_executable, exe),
+        (check_config, cfg, workdir),
+        (check_port, port, key, host),
+        (check_disk, workdir),
+        (check_memory,),
+        (check_writable, workdir),
+    )
+    return [_pool.submit(job[0], *job[1:]) for job in jobs]
+
+
+def collect(futures):
+    checks = []
+    for future in futures:
+        try:
+            checks.extend(future.result())
+        except Exception as e:
+            checks.append(Check("preflight", "error", f"Check crashed: {e}"))
+    return checks
+
+
+def failed(checks):
+    return [c for c in checks if c.severity == "error"]
@@ -0,0 +1,276 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_INTERVAL = 2.0
+# Samples kept per server between drains; hidden tabs only poll every few ticks
+PENDING_SIZE = 60
+USE_PROCFS = sys.platform.startswith("linux") and os.path.isdir("/proc/self")
+# /proc/<pid>/task/<tid>/children needs CONFIG_PROC_CHILDREN; without it the
+# tree is rebuilt from the parent pid field of every /proc/<pid>/stat
+PROC_CHILDREN = USE_PROCFS and os.path.exists(f"/proc/self/task/{os.getpid()}/children")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+ProcSample = namedtuple(
+    "ProcSample", "ts processes rss_mb cpu_pct threads fds read_bytes write_bytes"
+)
+
+
+_warned = set()
+
+
+def warn_once(key, message):
+    if key not in _warned:
+        _warned.add(key)
+        logger.warning(message)
+
+
+def children_by_ppid():
+    # {ppid: [pid, ...]} for every visible process, from one pass over /proc
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+            ppid = int(stat[stat.rindex(b")") + 2:].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+
+def process_tree(pid, children=None):
+    # `children` is a children_by_ppid() map, shared by every tree in one pass
+    if USE_PROCFS and not PROC_CHILDREN:
+        if children is None:
+            children = children_by_ppid()
+        pids, pending = {pid}, [pid]
+        while pending:
+            for child in children.get(pending.pop(), ()):
+                if child not in pids:
+                    pids.add(child)
+                    pending.append(child)
+        return pids
+    if USE_PROCFS:
+        pids, pending = {pid}, [pid]
+        while pending:
+            parent = pending.pop()
+            try:
+                tasks = os.listdir(f"/proc/{parent}/task")
+            except OSError:
+                continue
+            for tid in tasks:
+                try:
+                    with open(f"/proc/{parent}/task/{tid}/children") as f:
+                        children = [int(c) for c in f.read().split()]
+                except (OSError, ValueError):
+                    continue
+                for child in children:
+                    if child not in pids:
+                        pids.add(child)
+                        pending.append(child)
+        return pids
+    if psutil is not None:
+        try:
+            return {pid} | {c.pid for c in psutil.Process(pid).children(recursive=True)}
+        except psutil.Error:
+            pass
+    else:
+        warn_once("tree", "psutil unavailable; child processes are not sampled")
+    return {pid}
+
+
+class ProcFiles:
+    # Keeps /proc/<pid>/{stat,statm,io} open between samples and re-reads them
+    # with pread, so a tick costs three syscalls per process instead of opens
+    NAMES = ("stat", "statm", "io")
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.fds = {}
+        for name in self.NAMES:
+            try:
+                self.fds[name] = os.open(f"/proc/{pid}/{name}", os.O_RDONLY)
+            except OSError:
+                # io needs ptrace access; everything else is mandatory
+                if name != "io":
+                    self.close()
+                    raise
+
+    def read(self, name):
+        fd = self.fds.get(name)
+        if fd is None:
+            return None
+        return os.pread(fd, 4096, 0).decode("ascii", "replace")
+
+    def close(self):
+        for fd in self.fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = {}
+
+
+def parse_procfs(files):
+    # -> (cpu_seconds, rss_bytes, threads, read_bytes, write_bytes)
+    stat = files.read("stat")
+    fields = stat[stat.rindex(")") + 2:].split()
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    threads = int(fields[17])
+    rss = int(files.read("statm").split()[1]) * PAGE_SIZE
+    read_bytes = write_bytes = 0
+    io = files.read("io")
+    if io:
+        for line in io.splitlines():
+            key, _, value = line.partition(":")
+            if key == "read_bytes":
+                read_bytes = int(value)
+            elif key == "write_bytes":
+                write_bytes = int(value)
+    return cpu, rss, threads, read_bytes, write_bytes
+
+
+class ProcSampler:
+    # Samples every tracked process tree in one pass per interval
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.tracked = {}
+        self.pending = {}
+        self.open_files = {}
+        self.processes = {}
+        self.last_cpu = {}
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def track(self, key, pid):
+        with self.lock:
+            self.tracked[key] = pid
+            self.pending.pop(key, None)
+            self.last_cpu.pop(key, None)
+
+    def untrack(self, key):
+        with self.lock:
+            self.tracked.pop(key, None)
+            self.pending.pop(key, None)
+            self.last_cpu.pop(key, None)
+
+    def drain(self, key):
+        # Every sample taken since the last drain, oldest first
+        with self.lock:
+            pending = self.pending.get(key)
+            if not pending:
+                return []
+            samples = list(pending)
+            pending.clear()
+            return samples
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                tracked = dict(self.tracked)
+            try:
+                results = self.sample(tracked)
+            except Exception:
+                logger.exception("Sampling failed")
+                continue
+            with self.lock:
+                for key, sample in results.items():
+                    if key in self.tracked:
+                        if key not in self.pending:
+                            self.pending[key] = deque(maxlen=PENDING_SIZE)
+                        self.pending[key].append(sample)
+
+    def sample(self, tracked):
+        now = time.monotonic()
+        results = {}
+        seen = set()
+        children = None
+        if USE_PROCFS and not PROC_CHILDREN and tracked:
+            children = children_by_ppid()
+        for key, root in tracked.items():
+            totals = [0.0, 0, 0, 0, 0, 0]
+            count = 0
+            for pid in process_tree(root, children):
+                seen.add(pid)
+                values = self._read(pid)
+                if values is None:
+                    continue
+                count += 1
+                for i, value in enumerate(values):
+                    totals[i] += value
+            cpu_seconds, rss, threads, fds, read_bytes, write_bytes = totals
+            previous = self.last_cpu.get(key)
+            self.last_cpu[key] = (now, cpu_seconds)
+            cpu_pct = 0.0
+            if previous and now > previous[0]:
+                cpu_pct = max(0.0, (cpu_seconds - previous[1]) / (now - previous[0]) * 100)
+            results[key] = ProcSample(
+                time.time(), count, rss / 1024 / 1024, cpu_pct, threads, fds,
+                read_bytes, write_bytes,
+            )
+        # Drop cached handles for processes that are gone
+        for pid in set(self.open_files) - seen:
+            self.open_files.pop(pid).close()
+        for pid in set(self.processes) - seen:
+            del self.processes[pid]
+        return results
+
+    def _read(self, pid):
+        # -> (cpu_seconds, rss_bytes, threads, fds, read_bytes, write_bytes)
+        if USE_PROCFS:
+            try:
+                files = self.open_files.get(pid)
+                if files is None:
+                    files = self.open_files[pid] = ProcFiles(pid)
+                cpu, rss, threads, read_bytes, write_bytes = parse_procfs(files)
+                fds = len(os.listdir(f"/proc/{pid}/fd"))
+            except (OSError, ValueError, IndexError):
+                files = self.open_files.pop(pid, None)
+                if files:
+                    files.close()
+                return None
+            return cpu, rss, threads, fds, read_bytes, write_bytes
+        if psutil is None:
+            return None
+        try:
+            proc = self.processes.get(pid)
+            if proc is None:
+                proc = self.processes[pid] = psutil.Process(pid)
+            with proc.oneshot():
+                times = proc.cpu_times()
+                rss = proc.memory_info().rss
+                threads = proc.num_threads()
+                if hasattr(proc, "num_handles"):
+                    fds = proc.num_handles()
+                else:
+                    fds = proc.num_fds()
+                try:
+                    io = proc.io_counters()
+                    read_bytes, write_bytes = io.read_bytes, io.write_bytes
+                except (psutil.AccessDenied, AttributeError):
+                    read_bytes = write_bytes = 0
+        except psutil.Error:
+            self.processes.pop(pid, None)
+            return None
+        return times.user + times.system, rss, threads, fds, read_bytes, write_bytes
+
+
+get_sampler = lazy_singleton(ProcSampler)
@@ -0,0 +1,352 @@
+import functools
+import itertools
+import logging
+import os
+import re
+import secrets
+import tkinter as tk
+from collections import namedtuple
+from tkinter import filedialog, ttk
+
+from lib.cfg_parser import get_dvar
+from lib.file_utils import atomic_write
+from lib.log_files import safe_server_name
+from lib.port_allocator import get_allocator
+from lib.preflight import file_stamp
+
+logger = logging.getLogger(__name__)
+
+# Template placeholders look like {{port}} or {{ hostname }}
+PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+TEMPLATE_VARS = ("n", "name", "port", "hostname", "playlist", "rcon_password")
+MAX_SERVERS = 200
+
+Server = namedtuple("Server", "name cfg values state")
+
+
+# Keyed on the template's mtime/size, so an edited template is re-read. Kept
+# apart from the pre-flight cache so a large preview can't evict its results.
+@functools.lru_cache(maxsize=4)
+def _read_template(path, stamp):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=MAX_SERVERS)
+def _render(path, stamp, items):
+    values = dict(items)
+
+    def substitute(match):
+        name = match.group(1)
+        if name not in values:
+            raise ValueError(f"Unknown template variable {{{{{name}}}}}")
+        return str(values[name])
+
+    return PLACEHOLDER_RE.sub(substitute, _read_template(path, stamp))
+
+
+def read_template(path):
+    return _read_template(path, file_stamp(path))
+
+
+def render(path, values):
+    # Re-provisioning only re-renders servers whose variables changed
+    return _render(path, file_stamp(path), tuple(sorted(values.items())))
+
+
+def format_pattern(pattern, values):
+    try:
+        return pattern.format(**values)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Bad pattern {pattern!r}: {e}")
+
+
+def plan_keys(count):
+    return [("provision", i) for i in range(count)]
+
+
+def release_plan(servers):
+    # Provisioned tabs claim their own ports once created
+    for key in plan_keys(len(servers)):
+        get_allocator().forget(key)
+
+
+def plan_servers(template, out_dir, count, name_pattern, hostname_pattern,
+                 playlists=(), rcon_password="", start_port=None, claim=False,
+                 passwords=None):
+    # One entry per (playlist x count). Ports are only claimed with `claim`,
+    # so a preview doesn't hold anything; claimed plans need release_plan().
+    # `passwords` (cfg path -> generated password) is filled in and reused, so
+    # previewing and creating from one dialog agree on the passwords.
+    combos = list(itertools.product(playlists or [""], range(count)))
+    if not combos or len(combos) > MAX_SERVERS:
+        raise ValueError(f"Between 1 and {MAX_SERVERS} servers can be provisioned at once")
+    keys = plan_keys(len(combos))
+    ports = get_allocator().next_free_block(keys, start=start_port, claim=claim)
+    if ports is None:
+        raise ValueError(f"Not enough free ports for {len(combos)} server(s)")
+    try:
+        return build_servers(template, out_dir, combos, ports, name_pattern,
+                             hostname_pattern, rcon_password, passwords)
+    except Exception:
+        if claim:
+            for key in keys:
+                get_allocator().forget(key)
+        raise
+
+
+def build_servers(template, out_dir, combos, ports, name_pattern, hostname_pattern,
+                  rcon_password, passwords=None):
+    passwords = {} if passwords is None else passwords
+    servers = []
+    for n, ((playlist, _), port) in enumerate(zip(combos, ports), start=1):
+        values = dict(n=n, port=port, playlist=playlist)
+        values["name"] = format_pattern(name_pattern, values)
+        values["hostname"] = format_pattern(hostname_pattern, values)
+        cfg = os.path.join(out_dir, f"{safe_server_name(values['name'])}.cfg")
+        password = rcon_password
+        if not password:
+            # Keep a previously generated password so re-runs don't churn it
+            password = get_dvar(cfg, "rcon_password") if os.path.exists(cfg) else None
+            password = password or passwords.get(cfg) or secrets.token_hex(6)
+            passwords[cfg] = password
+        values["rcon_password"] = password
+        text = render(template, values)
+        state = "new"
+        if os.path.exists(cfg):
+            with open(cfg, "r", encoding="utf-8", errors="replace") as f:
+                state = "unchanged" if f.read() == text else "changed"
+        servers.append(Server(values["name"], cfg, values, state))
+    return servers
+
+
+def provision(manager, servers, template, exe, auto_restart=False, overwrite=False):
+    # Writes every config and creates every tab, then saves sessions once.
+    # Any failure undoes the whole batch.
+    taken = {tab.name for tab in manager.tabs}
+    names = [s.name for s in servers]
+    duplicates = sorted({n for n in names if names.count(n) > 1 or n in taken})
+    if duplicates:
+        raise ValueError(f"Server name(s) already in use: {', '.join(duplicates)}")
+    changed = [s.cfg for s in servers if s.state == "changed"]
+    if changed and not overwrite:
+        raise ValueError(
+            f"{len(changed)} existing config(s) differ from the template,"
+            f" e.g. {changed[0]}"
+        )
+
+    originals = {}
+    tabs = []
+    try:
+        for server in servers:
+            if server.state == "unchanged":
+                continue
+            text = render(template, server.values)
+            if server.state == "changed":
+                with open(server.cfg, "rb") as f:
+                    originals[server.cfg] = f.read()
+            else:
+                originals[server.cfg] = None
+            atomic_write(server.cfg, text.encode("utf-8"))
+        for server in servers:
+            tabs.append(
+                manager.add_server_tab(
+                    server.name,
+                    {
+                        "exe": exe,
+                        "cfg": server.cfg,
+                        "port": str(server.values["port"]),
+                        "auto_restart": auto_restart,
+                    },
+                    save=False,
+                )
+            )
+        manager.save_sessions()
+    except Exception:
+        for tab in tabs:
+            manager.remove_tab(tab, save=False)
+        for path, data in originals.items():
+            try:
+                if data is None:
+                    os.remove(path)
+                else:
+                    atomic_write(path, data)
+            except OSError as e:
+                logger.error("Rollback of %s failed: %s", path, e)
+        raise
+    return tabs
+
+
+def open_provision_dialog(manager):
+    win = tk.Toplevel(manager.root)
+    win.title("Provision Servers")
+    win.configure(bg="#1e1e1e", padx=10, pady=10)
+
+    fields = {}
+    # Generated once per dialog, so repeated previews render (and cache) the
+    # same values instead of a fresh random password every time
+    passwords = {}
+
+    def browse(key, title, filetypes):
+        path = filedialog.askopenfilename(parent=win, title=title, filetypes=filetypes)
+        if path:
+            fields[key].set(path)
+            if key == "template" and not fields["out_dir"].get():
+                fields["out_dir"].set(os.path.dirname(path))
+
+    for row, (key, label, default, browse_args) in enumerate(
+        (
+            ("template", "Template cfg:", "", ("Select cfg template", [("Config Files", "*.cfg")])),
+            ("exe", "Executable:", "", ("Select hmw-mod.exe", [("Executable", "*.exe")])),
+            ("out_dir", "Output folder:", "", None),
+            ("name", "Name pattern:", "Event {n}", None),
+            ("hostname", "Hostname pattern:", "HMW Event #{n}", None),
+            ("playlists", "Playlists (comma separated):", "", None),
+            ("count", "Servers per playlist:", "1", None),
+            ("start_port", "First port (blank = auto):", "", None),
+            ("rcon_password", "RCON password (blank = generate):", "", None),
+        )
+    ):
+        tk.Label(win, text=label, bg="#1e1e1e", fg="white", anchor="w").grid(
+            row=row, column=0, sticky="w", pady=2
+        )
+        var = tk.StringVar(value=default)
+        tk.Entry(
+            win, textvariable=var, bg="#2b2b2b", fg="white", insertbackground="white"
+        ).grid(row=row, column=1, sticky="ew", pady=2)
+        if browse_args:
+            tk.Button(
+                win,
+                text="Browse",
+                command=lambda k=key, a=browse_args: browse(k, *a),
+                bg="#3a3a3a",
+                fg="white",
+            ).grid(row=row, column=2, padx=(5, 0))
+        fields[key] = var
+
+    options = tk.Frame(win, bg="#1e1e1e")
+    options.grid(row=len(fields), column=0, columnspan=3, sticky="w", pady=(5, 5))
+    auto_restart = tk.BooleanVar(value=False)
+    overwrite = tk.BooleanVar(value=False)
+    for text, var in (
+        ("Auto-restart", auto_restart),
+        ("Overwrite configs that differ", overwrite),
+    ):
+        tk.Checkbutton(
+            options,
+            text=text,
+            variable=var,
+            bg="#1e1e1e",
+            fg="white",
+            selectcolor="#1e1e1e",
+        ).pack(side="left", padx=(0, 15))
+    tk.Label(
+        win,
+        text="Template variables: " + ", ".join("{{%s}}" % v for v in TEMPLATE_VARS),
+        bg="#1e1e1e",
+        fg="#888888",
+        font=("Segoe UI", 9),
+    ).grid(row=len(fields) + 1, column=0, columnspan=3, sticky="w")
+
+    tree = ttk.Treeview(
+        win,
+        columns=("name", "port", "playlist", "hostname", "cfg", "state"),
+        show="headings",
+        height=10,
+    )
+    for column, heading, width in (
+        ("name", "Name", 120),
+        ("port", "Port", 60),
+        ("playlist", "Playlist", 70),
+        ("hostname", "Hostname", 160),
+        ("cfg", "Config", 160),
+        ("state", "Config State", 90),
+    ):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, stretch=column in ("hostname", "cfg"))
+    tree.grid(row=len(fields) + 2, column=0, columnspan=3, sticky="nsew", pady=(8, 2))
+    status = tk.Label(win, text="", bg="#1e1e1e", fg="#bbbbbb", anchor="w")
+    status.grid(row=len(fields) + 3, column=0, columnspan=3, sticky="w")
+    win.columnconfigure(1, weight=1)
+    win.rowconfigure(len(fields) + 2, weight=1)
+
+    def read_plan(claim=False):
+        template = fields["template"].get().strip()
+        if not os.path.isfile(template):
+            raise ValueError("Pick a template cfg")
+        out_dir = fields["out_dir"].get().strip() or os.path.dirname(template)
+        if not os.path.isdir(out_dir):
+            raise ValueError(f"Output folder does not exist: {out_dir}")
+        count = fields["count"].get().strip()
+        start_port = fields["start_port"].get().strip()
+        if not count.isdigit() or (start_port and not start_port.isdigit()):
+            raise ValueError("Count and first port must be numbers")
+        playlists = [p.strip() for p in fields["playlists"].get().split(",") if p.strip()]
+        return template, plan_servers(
+            template,
+            out_dir,
+            int(count),
+            fields["name"].get(),
+            fields["hostname"].get(),
+            playlists,
+            fields["rcon_password"].get().strip(),
+            int(start_port) if start_port else None,
+            claim,
+            passwords,
+        )
+
+    def show(servers):
+        tree.delete(*tree.get_children())
+        for s in servers:
+            tree.insert(
+                "",
+                "end",
+                values=(
+                    s.name,
+                    s.values["port"],
+                    s.values["playlist"] or "-",
+                    s.values["hostname"],
+                    os.path.basename(s.cfg),
+                    s.state,
+                ),
+            )
+
+    def preview():
+        try:
+            _, servers = read_plan()
+        except (OSError, ValueError) as e:
+            status.config(text=f"[ERROR] {e}", fg="red")
+            return
+        show(servers)
+        status.config(text=f"{len(servers)} server(s) planned", fg="#bbbbbb")
+
+    def create():
+        exe = fields["exe"].get().strip()
+        if not os.path.isfile(exe):
+            status.config(text="[ERROR] Pick the server executable", fg="red")
+            return
+        try:
+            template, servers = read_plan(claim=True)
+        except (OSError, ValueError) as e:
+            status.config(text=f"[ERROR] {e}", fg="red")
+            return
+        show(servers)
+        try:
+            tabs = provision(
+                manager, servers, template, exe, auto_restart.get(), overwrite.get()
+            )
+        except (OSError, ValueError) as e:
+            status.config(text=f"[ERROR] {e}", fg="red")
+            return
+        finally:
+            release_plan(servers)
+        status.config(text=f"✅ Created {len(tabs)} server(s)", fg="lime")
+
+    buttons = tk.Frame(win, bg="#1e1e1e")
+    buttons.grid(row=len(fields) + 4, column=0, columnspan=3, sticky="ew", pady=(8, 0))
+    tk.Button(
+        buttons, text="🔍 Preview", command=preview, bg="#3a3a3a", fg="white"
+    ).pack(side="left", padx=(0, 5))
+    tk.Button(
+        buttons, text="🏭 Create Servers", command=create, bg="#0db9d7", fg="white"
+    ).pack(side="left")
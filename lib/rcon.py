@@ -0,0 +1,125 @@
+import selectors
+import socket
+import time
+from collections import namedtuple
+
+RCON_HOST = "127.0.0.1"
+RCON_TIMEOUT = 2.0
+# Replies can span several datagrams; one is complete once it goes quiet
+REPLY_QUIET = 0.25
+
+HEADER = b"\xff\xff\xff\xff"
+PRINT_HEADER = HEADER + b"print\n"
+
+Target = namedtuple("Target", "key name host port password")
+Reply = namedtuple("Reply", "key name text error latency")
+
+
+def build_packet(password, command):
+    return HEADER + f"rcon {password} {command}\n".encode("utf-8")
+
+
+def strip_header(data):
+    if data.startswith(PRINT_HEADER):
+        return data[len(PRINT_HEADER):]
+    return data
+
+
+def broadcast(targets, command, timeout=RCON_TIMEOUT, quiet=REPLY_QUIET, on_reply=None):
+    # Sends `command` to every target at once and waits on all of their
+    # sockets together, so the whole fleet costs roughly one round trip.
+    # on_reply(Reply) is called from this thread as each server finishes.
+    replies = {}
+    pending = {}
+    selector = selectors.DefaultSelector()
+    started = time.monotonic()
+
+    def finish(target, text="", error=None, latency=None):
+        reply = Reply(target.key, target.name, text, error, latency)
+        replies[target.key] = reply
+        if on_reply:
+            on_reply(reply)
+
+    def close(sock):
+        target, state = pending.pop(sock)
+        selector.unregister(sock)
+        sock.close()
+        return target, state
+
+    for target in targets:
+        if not target.password:
+            finish(target, error="No RCON password set.")
+            continue
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.setblocking(False)
+            # Connected, so only this server's datagrams (or its ICMP
+            # "port unreachable") arrive on the socket
+            sock.connect((target.host, int(target.port)))
+            sock.send(build_packet(target.password, command))
+        except (OSError, ValueError) as e:
+            sock.close()
+            finish(target, error=str(e))
+            continue
+        state = {"parts": [], "first": None, "last": None}
+        pending[sock] = (target, state)
+        selector.register(sock, selectors.EVENT_READ)
+
+    deadline = started + timeout
+    try:
+        while pending:
+            now = time.monotonic()
+            for sock, (target, state) in list(pending.items()):
+                if state["last"] is not None and now - state["last"] >= quiet:
+                    close(sock)
+                    finish(
+                        target,
+                        b"".join(state["parts"]).decode("utf-8", errors="ignore"),
+                        latency=state["first"] - started,
+                    )
+            if not pending or now >= deadline:
+                break
+            wait = deadline - now
+            for _, state in pending.values():
+                if state["last"] is not None:
+                    wait = min(wait, state["last"] + quiet - now)
+            for key, _ in selector.select(max(0.0, wait)):
+                sock = key.fileobj
+                target, state = pending[sock]
+                while True:
+                    try:
+                        data = sock.recv(65535)
+                    except BlockingIOError:
+                        break
+                    except OSError as e:
+                        close(sock)
+                        finish(target, error=str(e) or "Connection refused")
+                        break
+                    received = time.monotonic()
+                    if state["first"] is None:
+                        state["first"] = received
+                    state["last"] = received
+                    state["parts"].append(strip_header(data))
+    finally:
+        for sock in list(pending):
+            target, state = close(sock)
+            if state["parts"]:
+                finish(
+                    target,
+                    b"".join(state["parts"]).decode("utf-8", errors="ignore"),
+                    latency=state["first"] - started,
+                )
+            else:
+                finish(target, error="No reply (timed out)")
+        selector.close()
+    return replies
+
+
+def send_command(port, password, command, host=RCON_HOST, timeout=RCON_TIMEOUT):
+    # Single-server helper with the same return convention the tabs always
+    # used: the reply text, or a string starting with "[ERROR]"
+    target = Target(None, None, host, port, password)
+    reply = broadcast([target], command, timeout)[None]
+    if reply.error:
+        return f"[ERROR] {reply.error}"
+    return reply.text
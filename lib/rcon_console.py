@@ -0,0 +1,271 @@
+import logging
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from lib.diff_view import open_diff_window
+from lib.rcon import RCON_TIMEOUT, broadcast
+
+logger = logging.getLogger(__name__)
+
+POLL_MS = 100
+SIDE_BY_SIDE = 4
+TIMEOUTS = ("1", "2", "5", "10")
+
+
+def summarize(reply):
+    if reply.error:
+        return reply.error
+    lines = [line for line in reply.text.splitlines() if line.strip()]
+    if not lines:
+        return "(empty reply)"
+    first = lines[0].strip()
+    return first if len(lines) == 1 else f"{first}  (+{len(lines) - 1} lines)"
+
+
+def get_frame(master, manager):
+    frame = tk.Frame(master, bg="#1e1e1e", padx=20, pady=20)
+
+    tk.Label(
+        frame,
+        text="📣 Fleet RCON",
+        font=("Segoe UI", 14, "bold"),
+        fg="white",
+        bg="#1e1e1e",
+    ).pack(anchor="w", pady=(0, 10))
+
+    top = tk.Frame(frame, bg="#1e1e1e")
+    top.pack(fill="x")
+
+    # === Target selection ===
+    targets_frame = tk.Frame(top, bg="#1e1e1e")
+    targets_frame.pack(side="left", fill="y", padx=(0, 10))
+    tk.Label(targets_frame, text="Servers:", bg="#1e1e1e", fg="#bbbbbb").pack(
+        anchor="w"
+    )
+    server_list = tk.Listbox(
+        targets_frame,
+        selectmode="extended",
+        height=8,
+        width=28,
+        bg="#2b2b2b",
+        fg="white",
+        font=("Consolas", 10),
+        exportselection=False,
+    )
+    server_list.pack(fill="y", expand=True)
+    listed = []
+
+    def refresh_targets():
+        selected = {listed[i].name for i in server_list.curselection()}
+        listed[:] = [
+            tab for tab in manager.tabs if tab.process and tab.process.poll() is None
+        ]
+        server_list.delete(0, "end")
+        for i, tab in enumerate(listed):
+            server_list.insert("end", f"{tab.name}  :{tab.server_port.get()}")
+            if tab.name in selected:
+                server_list.selection_set(i)
+
+    buttons = tk.Frame(targets_frame, bg="#1e1e1e")
+    buttons.pack(fill="x", pady=(5, 0))
+    for text, command in (
+        ("All", lambda: server_list.selection_set(0, "end")),
+        ("None", lambda: server_list.selection_clear(0, "end")),
+        ("🔄 Refresh", refresh_targets),
+    ):
+        tk.Button(
+            buttons,
+            text=text,
+            command=command,
+            bg="#3a3a3a",
+            fg="white",
+            font=("Segoe UI", 9),
+        ).pack(side="left", padx=(0, 5))
+
+    # === Command ===
+    command_frame = tk.Frame(top, bg="#1e1e1e")
+    command_frame.pack(side="left", fill="both", expand=True)
+    tk.Label(command_frame, text="Command:", bg="#1e1e1e", fg="#bbbbbb").pack(
+        anchor="w"
+    )
+    entry = tk.Entry(
+        command_frame,
+        font=("Consolas", 10),
+        bg="#2b2b2b",
+        fg="white",
+        insertbackground="white",
+    )
+    entry.insert(0, "status")
+    entry.pack(fill="x", pady=(0, 5))
+
+    options = tk.Frame(command_frame, bg="#1e1e1e")
+    options.pack(fill="x")
+    tk.Label(options, text="Timeout (s):", bg="#1e1e1e", fg="white").pack(side="left")
+    timeout_var = tk.StringVar(value=str(int(RCON_TIMEOUT)))
+    timeout_menu = tk.OptionMenu(options, timeout_var, *TIMEOUTS)
+    timeout_menu.config(
+        bg="#2b2b2b", fg="white", font=("Segoe UI", 10), highlightthickness=0
+    )
+    timeout_menu["menu"].config(bg="#2b2b2b", fg="white")
+    timeout_menu.pack(side="left", padx=(5, 15))
+    send_btn = tk.Button(
+        options,
+        text="📣 Send to Selected",
+        command=lambda: send(),
+        bg="#0db9d7",
+        fg="white",
+        font=("Segoe UI", 10),
+    )
+    send_btn.pack(side="left")
+    progress_label = tk.Label(options, text="", bg="#1e1e1e", fg="#bbbbbb")
+    progress_label.pack(side="left", padx=10)
+
+    # === Replies ===
+    tree = ttk.Treeview(
+        frame,
+        columns=("server", "result", "latency", "summary"),
+        show="headings",
+        height=8,
+    )
+    for column, heading, width in (
+        ("server", "Server", 160),
+        ("result", "Result", 70),
+        ("latency", "ms", 60),
+        ("summary", "Reply", 420),
+    ):
+        tree.heading(column, text=heading)
+        tree.column(column, width=width, stretch=column == "summary")
+    tree.pack(fill="x", pady=(10, 5))
+
+    actions = tk.Frame(frame, bg="#1e1e1e")
+    actions.pack(fill="x", pady=(0, 5))
+    diff_btn = tk.Button(
+        actions,
+        text="🔍 Diff Selected",
+        command=lambda: diff_selected(),
+        bg="#3a3a3a",
+        fg="white",
+        font=("Segoe UI", 9),
+        state="disabled",
+    )
+    diff_btn.pack(side="left")
+    tk.Label(
+        actions,
+        text=f"Select up to {SIDE_BY_SIDE} replies to view them side by side",
+        bg="#1e1e1e",
+        fg="#888888",
+        font=("Segoe UI", 9),
+    ).pack(side="left", padx=10)
+
+    panes = tk.PanedWindow(frame, orient="horizontal", bg="#1e1e1e", sashwidth=4)
+    panes.pack(fill="both", expand=True)
+
+    replies = {}
+    results = queue.Queue()
+    run = {"token": None, "total": 0, "done": 0, "job": None, "error": None}
+
+    def show_selected(_=None):
+        for pane in panes.panes():
+            panes.forget(pane)
+        chosen = [replies[item] for item in tree.selection()[:SIDE_BY_SIDE]]
+        for reply in chosen:
+            column = tk.Frame(panes, bg="#1e1e1e")
+            tk.Label(
+                column, text=reply.name, bg="#1e1e1e", fg="white", font=("Segoe UI", 9)
+            ).pack(anchor="w")
+            text = tk.Text(
+                column, bg="#252526", fg="white", font=("Consolas", 10), wrap="none"
+            )
+            text.insert("1.0", f"[ERROR] {reply.error}" if reply.error else reply.text)
+            text.config(state="disabled")
+            text.pack(fill="both", expand=True)
+            panes.add(column, stretch="always")
+        diff_btn.config(state="normal" if len(tree.selection()) == 2 else "disabled")
+
+    def diff_selected():
+        items = tree.selection()
+        if len(items) != 2:
+            return
+        old, new = replies[items[0]], replies[items[1]]
+        open_diff_window(
+            frame, old.text, new.text, title=f"RCON: {old.name} ↔ {new.name}"
+        )
+
+    tree.bind("<<TreeviewSelect>>", show_selected)
+
+    def poll_results():
+        while True:
+            try:
+                token, reply = results.get_nowait()
+            except queue.Empty:
+                break
+            if token is not run["token"]:
+                continue
+            if reply is None:
+                run["token"] = None
+                continue
+            if isinstance(reply, Exception):
+                run["error"] = reply
+                continue
+            run["done"] += 1
+            item = tree.insert(
+                "",
+                "end",
+                values=(
+                    reply.name,
+                    "error" if reply.error else "ok",
+                    "-" if reply.latency is None else f"{reply.latency * 1000:.0f}",
+                    summarize(reply),
+                ),
+            )
+            replies[item] = reply
+        progress_label.config(
+            text=f"{run['done']}/{run['total']} replied"
+            + ("" if run["token"] else " - done")
+            + (f" (failed: {run['error']})" if run["error"] else "")
+        )
+        run["job"] = None
+        if run["token"] and frame.winfo_exists():
+            run["job"] = frame.after(POLL_MS, poll_results)
+        else:
+            send_btn.config(state="normal")
+
+    def send():
+        command = entry.get().strip()
+        chosen = [listed[i] for i in server_list.curselection()]
+        if not command or not chosen:
+            progress_label.config(text="Pick at least one server and a command.")
+            return
+        tree.delete(*tree.get_children())
+        replies.clear()
+        show_selected()
+        targets = [tab.rcon_target() for tab in chosen]
+        token = object()
+        run.update(token=token, total=len(targets), done=0, error=None)
+        send_btn.config(state="disabled")
+        timeout = float(timeout_var.get())
+
+        def worker():
+            try:
+                broadcast(
+                    targets,
+                    command,
+                    timeout,
+                    on_reply=lambda reply: results.put((token, reply)),
+                )
+            except Exception as e:
+                logger.exception("Broadcast failed")
+                results.put((token, e))
+            finally:
+                results.put((token, None))
+
+        threading.Thread(target=worker, daemon=True).start()
+        if run["job"] is None:
+            poll_results()
+
+    entry.bind("<Return>", lambda _: send())
+    frame.bind("<Map>", lambda _: refresh_targets())
+    refresh_targets()
+    return frame
@@ -6,6 +6,8 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import os
 
+from lib.scheduler import MINIMIZED, NORMAL, get_scheduler
+
 
 def get_frame(master):
     frame = tk.Frame(master, bg="#1e1e1e", padx=20, pady=20)
@@ -100,6 +102,8 @@ def get_frame(master):
             text=f"🧠 CPU Avg: {cpu_avg:.1f}% (Max: {cpu_max:.1f}%)   💾 RAM Avg: {mem_avg:.1f}% (Max: {mem_max:.1f}%)"
         )
 
+        if not get_scheduler().visible(frame):
+            return
         if show_graph.get():
             canvas_widget.pack(fill="x", pady=(0, 10))
             mem_line.set_data(range(len(mem_data)), mem_data)
@@ -135,8 +139,6 @@ def get_frame(master):
         else:
             canvas_widget.forget()
 
-        frame.after(2000, update)
-
     def export_stats():
         try:
             os.makedirs("logs", exist_ok=True)
@@ -158,5 +160,11 @@ def get_frame(master):
         font=("Segoe UI", 10),
     ).pack()
 
-    update()
+    # Keeps the 60-sample window filling in the background, just more slowly
+    get_scheduler(frame).add(
+        ("resource_averages", id(frame)),
+        update,
+        lambda: NORMAL if get_scheduler().visible(frame) else MINIMIZED,
+        widget=frame,
+    )
     return frame
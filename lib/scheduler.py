@@ -0,0 +1,145 @@
+import logging
+import time
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+# Tasks due within this window of each other run in the same wakeup
+COALESCE_WINDOW = 0.25
+MIN_INTERVAL = 0.05
+
+# Shared interval tiers (seconds)
+FAST = 1.0
+NORMAL = 2.0
+HIDDEN = 10.0
+IDLE = 15.0
+MINIMIZED = 30.0
+
+
+class Task:
+    __slots__ = ("callback", "interval", "owner", "widget", "due", "once")
+
+    def __init__(self, callback, interval, owner, widget, due, once=False):
+        self.callback = callback
+        self.interval = interval
+        self.owner = owner
+        self.widget = widget
+        self.due = due
+        self.once = once
+
+
+class Scheduler:
+    # Drives every periodic UI task from a single Tk timer. Each task's
+    # interval is re-evaluated after it runs, so it can slow down while its
+    # widget is hidden, the window is minimized or its server is stopped.
+    def __init__(self, root):
+        self.root = root
+        self.tasks = {}
+        self.job = None
+        self.job_due = None
+        self.counter = 0
+        root.bind("<Map>", self.on_map, add="+")
+        root.bind("<Unmap>", self.on_map, add="+")
+
+    # === Registration ===
+    def add(self, key, callback, interval, owner=None, widget=None, delay=0.0):
+        # `interval` is seconds or a callable returning seconds
+        self.tasks[key] = Task(
+            callback, interval, owner, widget, time.monotonic() + delay
+        )
+        self.arm()
+
+    def once(self, delay, callback, owner=None):
+        self.counter += 1
+        key = ("once", self.counter)
+        self.tasks[key] = Task(
+            callback, None, owner, None, time.monotonic() + delay, once=True
+        )
+        self.arm()
+        return key
+
+    def remove(self, key):
+        self.tasks.pop(key, None)
+
+    def remove_owner(self, owner):
+        for key in [k for k, t in self.tasks.items() if t.owner == owner]:
+            del self.tasks[key]
+
+    # === Visibility ===
+    def minimized(self):
+        try:
+            return self.root.state() in ("iconic", "withdrawn")
+        except tk.TclError:
+            return False
+
+    def visible(self, widget):
+        try:
+            return not self.minimized() and bool(widget.winfo_viewable())
+        except tk.TclError:
+            return False
+
+    def on_map(self, event):
+        if event.widget is self.root:
+            self.refresh()
+
+    def refresh(self):
+        # Pull tasks forward whose interval shrank (tab shown, window restored)
+        now = time.monotonic()
+        for task in self.tasks.values():
+            if not task.once:
+                task.due = min(task.due, now + self.interval_of(task))
+        self.arm()
+
+    # === Timer ===
+    def interval_of(self, task):
+        try:
+            value = task.interval() if callable(task.interval) else task.interval
+        except Exception:
+            logger.exception("Interval of a task failed")
+            value = IDLE
+        return max(MIN_INTERVAL, value)
+
+    def arm(self):
+        if not self.tasks:
+            return
+        due = min(task.due for task in self.tasks.values())
+        if self.job is not None:
+            if self.job_due <= due:
+                return
+            self.root.after_cancel(self.job)
+        delay = max(0, int((due - time.monotonic()) * 1000))
+        self.job_due = due
+        self.job = self.root.after(delay, self.tick)
+
+    def tick(self):
+        self.job = None
+        now = time.monotonic()
+        for key, task in list(self.tasks.items()):
+            if task.due > now + COALESCE_WINDOW or self.tasks.get(key) is not task:
+                continue
+            if task.widget is not None and not task.widget.winfo_exists():
+                del self.tasks[key]
+                continue
+            if task.once:
+                del self.tasks[key]
+            try:
+                task.callback()
+            except Exception:
+                logger.exception("Task %s failed", key)
+            if not task.once:
+                task.due = time.monotonic() + self.interval_of(task)
+        self.arm()
+
+
+_scheduler = None
+
+
+def get_scheduler(widget=None):
+    # Created on the Tk thread by the first caller, which must pass a widget
+    # so the timer is bound to that widget's root window
+    global _scheduler
+    if _scheduler is None:
+        if widget is None:
+            raise RuntimeError("get_scheduler() needs a widget before the scheduler exists")
+        _scheduler = Scheduler(widget._root())
+    return _scheduler
@@ -1,6 +1,5 @@
 import os
-import re
-import socket
+import queue
 import subprocess
 import threading
 import time
@@ -8,19 +7,49 @@ from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog, scrolledtext
 
-import psutil
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import mplcursors
 
-LOG_DIR = "logs"
-used_ports = set()
+from lib.backup_store import get_backup_store
+from lib.cfg_parser import get_dvar
+from lib.cfg_watcher import get_watcher
+from lib.crash_analyzer import format_exit_code, get_analyzer
+from lib.crash_bundles import get_bundles
+from lib.file_utils import file_sha256
+from lib.log_export import open_export_dialog
+from lib.log_files import LOG_DIR, safe_server_name
+from lib.log_retention import get_retention
+from lib.log_store import get_store
+from lib.player_sessions import get_sessions
+from lib.port_allocator import get_allocator
+from lib.preflight import collect, failed, start_preflight
+from lib.proc_sampler import get_sampler
+from lib.rcon import RCON_HOST, REPLY_QUIET, Target, send_command
+from lib.scheduler import FAST, HIDDEN, IDLE, NORMAL, get_scheduler
+from lib.shutdown import DETACHED, FleetShutdown
+from lib.socket_monitor import get_monitor
 
 BG_COLOR = "#1e1e1e"
 FG_COLOR = "#d4d4d4"
 BTN_COLOR = "#3a3a3a"
 ACCENT_COLOR = "#0db9d7"
 
+STARTUP_WINDOW = 60
+RCON_INTERVAL = 30
+RCON_SUSPECT_INTERVAL = 10
+QUIT_SEND_TIMEOUT = 0.5
+WATCH_DELAY = 500
+
+
+def count_status_players(reply):
+    # Player rows in an rcon "status" reply follow the "---" separator line
+    lines = reply.splitlines()
+    for i, line in enumerate(lines):
+        if line.strip().startswith("---"):
+            return sum(1 for row in lines[i + 1:] if row.strip()[:1].isdigit())
+    return None
+
 
 class ServerTab:
     def __init__(self, manager, name, config=None):
@@ -35,44 +64,162 @@ class ServerTab:
         self.failed_rcon_pings = 0
         self.rcon_warning_count = 0
         self.current_log_date = datetime.now().strftime("%Y-%m-%d")
+        self.log_lock = threading.Lock()
 
         self.auto_restart = tk.BooleanVar(
             value=config.get("auto_restart", False) if config else False
         )
         self.process = None
+        self.exited_process = None
+        self.started_at = None
+        self.last_cmd = []
+        self.cfg_hash = None
+        self.preflight = None
+        self.launched_at = None
+        self.rcon_busy = False
+        self.stopping = None
+        self.players = None
+        self.last_restart = None
         self.log_data = []
         self.manual_stop = False
+        self.registered_cfg = None
+        self.watch_job = None
 
         self.mem_data = []
         self.cpu_data = []
+        self.net_data = []
+        self.net_events = queue.Queue()
+        self.net_status = tk.StringVar(value="-")
+        self.proc_data = []
+        self.plots_stale = False
+        self.proc_status = tk.StringVar(value="-")
         self.mem_max_points = 60
 
+        # Tabs without a saved port get one from the manager, which reads the
+        # socket table once for every tab it is creating (see assign_ports)
+        self.needs_port = not (config and config.get("port"))
         if config:
             self.executable_path.set(config.get("exe", ""))
             self.config_path.set(config.get("cfg", ""))
-            self.server_port.set(config.get("port", "27016"))
             self.parse_rcon_password(config.get("cfg", ""))
+        if not self.needs_port:
+            self.server_port.set(config["port"])
+            get_allocator().claim(id(self), self.server_port.get())
+        self.server_port.trace_add(
+            "write", lambda *_: get_allocator().claim(id(self), self.server_port.get())
+        )
+        self.config_path.trace_add("write", lambda *_: self.schedule_watch())
+        self.watch_config()
 
         self.create_widgets()
-        self.auto_refresh_status()
-        self.update_resource_plots()
+        self.register_config()
+        self.schedule_tasks()
+
+    # === Periodic work (see lib/scheduler.py) ===
+    def schedule_tasks(self):
+        scheduler = get_scheduler(self.frame)
+        key = id(self)
+        scheduler.add((key, "status"), self.auto_refresh_status, self.status_interval, key)
+        scheduler.add((key, "plots"), self.update_resource_plots, self.plots_interval, key)
+        scheduler.add(
+            (key, "rcon"), self.rcon_tick, self.rcon_interval, key, delay=RCON_INTERVAL
+        )
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def starting_up(self):
+        return self.preflight is not None or (
+            self.launched_at is not None
+            and time.time() - self.launched_at < STARTUP_WINDOW
+        )
+
+    def status_interval(self):
+        # Exit detection (and auto-restart) and the samples the fleet
+        # dashboard reads keep the normal rate in hidden tabs; only the
+        # plots slow down
+        if self.starting_up():
+            return FAST
+        if self.is_running():
+            return NORMAL
+        return IDLE
+
+    def plots_interval(self):
+        if not self.is_running() and not self.starting_up():
+            return IDLE
+        return NORMAL if get_scheduler().visible(self.frame) else HIDDEN
+
+    def rcon_interval(self):
+        if self.is_running() and (self.failed_rcon_pings or self.rcon_warning_count):
+            return RCON_SUSPECT_INTERVAL
+        return RCON_INTERVAL
+
+    def register_config(self):
+        # Attributes backups of this cfg to the server. Only runs for a path
+        # the user settled on (Browse, Return, focus-out) that exists, so
+        # half-typed paths never end up in the backup store.
+        path = self.config_path.get().strip()
+        if path == self.registered_cfg or not os.path.isfile(path):
+            return
+        try:
+            get_backup_store().assign_server(path, self.name)
+            self.registered_cfg = path
+        except Exception as e:
+            self.log(f"[ERROR] Could not register config for backups: {e}")
+
+    def schedule_watch(self):
+        # Typing into the path entry fires on every keystroke; wait for a pause
+        if self.watch_job:
+            self.frame.after_cancel(self.watch_job)
+        self.watch_job = self.frame.after(WATCH_DELAY, self.watch_config)
+
+    def watch_config(self):
+        # Snapshots outside edits of the cfg; nothing is watched until it exists
+        self.watch_job = None
+        path = self.config_path.get().strip()
+        if os.path.isfile(path):
+            get_watcher().watch(id(self), path, self.name)
+        else:
+            get_watcher().unwatch(id(self))
+
+    def release_resources(self):
+        if self.watch_job:
+            self.frame.after_cancel(self.watch_job)
+            self.watch_job = None
+        get_watcher().unwatch(id(self))
+        get_allocator().forget(id(self))
+        get_monitor().untrack(id(self))
+        get_sampler().untrack(id(self))
+        get_scheduler().remove_owner(id(self))
+
+    def on_net_event(self, kind, payload):
+        # Called from the socket monitor thread; handled on the Tk thread by
+        # drain_net_events
+        self.net_events.put((kind, payload))
+
+    def drain_net_events(self):
+        while True:
+            try:
+                kind, payload = self.net_events.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "conflict":
+                self.log(f"[WARN] {payload}")
+            elif kind == "sample":
+                self.net_data.append(payload)
+                if len(self.net_data) > self.mem_max_points:
+                    self.net_data.pop(0)
 
     def get_daily_log_path(self):
-        safe_name = re.sub(r'[\\/*?:"<>|]', "_", self.name)
         return os.path.join(
-            LOG_DIR, f"{safe_name.replace(' ', '_')}_{self.current_log_date}.log"
+            LOG_DIR, f"{safe_server_name(self.name)}_{self.current_log_date}.log"
         )
 
-
     def parse_rcon_password(self, cfg_path):
         try:
-            if not cfg_path or not os.path.isfile(cfg_path):
-                return
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            match = re.search(r'set\s+rcon_password\s+"([^"]+)"', content)
-            if match:
-                self.rcon_password = match.group(1)
+            password = get_dvar(cfg_path, "rcon_password")
+            if password:
+                self.rcon_password = password
         except Exception:
             self.rcon_password = ""
 
@@ -121,7 +268,10 @@ class ServerTab:
         ).pack(pady=(0, 10), fill="x")
 
         label("Config File:").pack(anchor="w")
-        entry(self.config_path).pack(fill="x")
+        config_entry = entry(self.config_path)
+        config_entry.pack(fill="x")
+        config_entry.bind("<Return>", lambda _: self.register_config())
+        config_entry.bind("<FocusOut>", lambda _: self.register_config())
         tk.Button(
             control_frame,
             text="Browse",
@@ -224,6 +374,26 @@ class ServerTab:
         self.cpu_canvas = FigureCanvasTkAgg(self.fig_cpu, master=control_frame)
         self.cpu_canvas.get_tk_widget().pack(fill="x", pady=(0, 5))
 
+        label("Process Tree:").pack(anchor="w", pady=(5, 0))
+        tk.Label(
+            control_frame,
+            textvariable=self.proc_status,
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            anchor="w",
+            font=("Consolas", 9),
+        ).pack(anchor="w")
+
+        label("Network (UDP):").pack(anchor="w", pady=(5, 0))
+        tk.Label(
+            control_frame,
+            textvariable=self.net_status,
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            anchor="w",
+            font=("Consolas", 9),
+        ).pack(anchor="w")
+
         # Log + RCON
         log_frame = tk.Frame(main_pane, bg=BG_COLOR)
         main_pane.add(log_frame)
@@ -259,17 +429,25 @@ class ServerTab:
         ).pack(side="right")
 
     def log(self, message):
-        timestamp = datetime.now().strftime("[%H:%M:%S] ")
-        line = timestamp + message
-
-        # Rotate log file if date changed
-        today = datetime.now().strftime("%Y-%m-%d")
-        if today != self.current_log_date:
-            self.current_log_date = today
-
-        os.makedirs(LOG_DIR, exist_ok=True)
-        with open(self.get_daily_log_path(), "a", encoding="utf-8") as f:
-            f.write(line + "\n")
+        now = datetime.now()
+        line = now.strftime("[%H:%M:%S] ") + message
+
+        with self.log_lock:
+            # Rotate log file if date changed
+            today = now.strftime("%Y-%m-%d")
+            if today != self.current_log_date:
+                self.current_log_date = today
+                get_retention().request_sweep()
+
+            os.makedirs(LOG_DIR, exist_ok=True)
+            path = self.get_daily_log_path()
+            with open(path, "ab") as f:
+                f.write((line + "\n").encode("utf-8"))
+                end_offset = f.tell()
+            get_store().append(
+                os.path.basename(path), end_offset, line, now.timestamp()
+            )
+            get_retention().maybe_rotate(path, end_offset)
 
         self.log_data.append(line)
         if len(self.log_data) > 500:
@@ -289,96 +467,123 @@ class ServerTab:
             self.log("[WARN] No RCON command entered.")
             return
         self.log(f"[RCON] Sending: {command}")
-        result = self.send_rcon_command(command)
-        self.log(f"[RCON] Response:\n{result}")
+        result = {}
 
-    def export_log(self):
-        os.makedirs(LOG_DIR, exist_ok=True)
-        safe_name = re.sub(r'[\\/*?:"<>|]', "_", self.name)
-        file_path = os.path.join(
-            LOG_DIR, f"{safe_name.replace(' ', '_')}_manual_export.txt"
+        def send():
+            result["reply"] = self.send_rcon_command(command)
+
+        threading.Thread(target=send, daemon=True).start()
+        get_scheduler().once(
+            REPLY_QUIET + 0.1, lambda: self.log_custom_reply(result), id(self)
         )
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(self.log_data))
-        self.log(f"[INFO] Log exported to {file_path}")
+
+    def log_custom_reply(self, result):
+        # Runs on Tk; the worker thread only fills in `result`
+        if "reply" not in result:
+            get_scheduler().once(0.25, lambda: self.log_custom_reply(result), id(self))
+            return
+        self.log(f"[RCON] Response:\n{result['reply']}")
+
+    def export_log(self):
+        open_export_dialog(self.frame, safe_server_name(self.name), self.log)
 
     def send_rcon_command(self, command):
-        try:
-            host = "127.0.0.1"
-            port = int(self.server_port.get())
-            password = self.rcon_password
-            if not password:
-                return "[ERROR] No RCON password set."
-
-            packet = b"\xff\xff\xff\xff" + f"rcon {password} {command}\n".encode(
-                "utf-8"
-            )
-            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            sock.settimeout(2.0)
-            sock.sendto(packet, (host, port))
+        return send_command(self.server_port.get(), self.rcon_password, command)
 
-            response = b""
-            while True:
-                try:
-                    part, _ = sock.recvfrom(4096)
-                    response += part
-                except socket.timeout:
-                    break
-            sock.close()
-
-            if response.startswith(b"\xff\xff\xff\xffprint\n"):
-                response = response[10:]
-            return response.decode("utf-8", errors="ignore")
-        except Exception as e:
-            return f"[ERROR] {e}"
+    def rcon_target(self):
+        return Target(id(self), self.name, RCON_HOST, self.server_port.get(), self.rcon_password)
+
+    def rcon_tick(self):
+        # The ping can block until the RCON timeout, so it runs on a worker
+        # thread and its reply is picked up back on Tk
+        if not self.is_running() or self.rcon_busy:
+            return
+        self.rcon_busy = True
+        result = {}
 
-    def start_rcon_ping(self):
-        def rcon_loop():
+        def ping():
+            result["reply"] = self.send_rcon_command("status")
+
+        threading.Thread(target=ping, daemon=True).start()
+        get_scheduler().once(
+            REPLY_QUIET + 0.1, lambda: self.handle_rcon_reply(result), id(self)
+        )
+
+    def handle_rcon_reply(self, result):
+        if "reply" not in result:
+            get_scheduler().once(0.5, lambda: self.handle_rcon_reply(result), id(self))
+            return
+        self.rcon_busy = False
+        if not self.is_running():
+            return
+        ok = result["reply"]
+        if "[ERROR]" in ok or not ok.strip():
+            self.failed_rcon_pings += 1
+            if self.failed_rcon_pings >= 3:
+                self.rcon_warning_count += 1
+                self.failed_rcon_pings = 0
+                self.set_status("🟠 Timeout (No RCON)", "orange")
+                self.log(
+                    f"[WARN] RCON ping failed 3x. Server may be frozen. ({self.rcon_warning_count}/3)"
+                )
+
+                if self.rcon_warning_count >= 3:
+                    self.log("[ERROR] RCON frozen warning hit 3x. Restarting server.")
+                    self.last_restart = (time.time(), "RCON unresponsive")
+                    # No point asking a frozen server to quit over RCON
+                    self.stop_server(on_stopped=self.start_server, graceful=False)
+        else:
+            self.players = count_status_players(ok)
+            if self.rcon_warning_count > 0:
+                self.log("[INFO] RCON ping recovered.")
             self.failed_rcon_pings = 0
             self.rcon_warning_count = 0
-            while self.process and self.process.poll() is None:
-                ok = self.send_rcon_command("status")
-                if "[ERROR]" in ok or not ok.strip():
-                    self.failed_rcon_pings += 1
-                    if self.failed_rcon_pings >= 3:
-                        self.rcon_warning_count += 1
-                        self.failed_rcon_pings = 0
-                        self.set_status("🟠 Timeout (No RCON)", "orange")
-                        self.log(
-                            f"[WARN] RCON ping failed 3x. Server may be frozen. ({self.rcon_warning_count}/3)"
-                        )
-
-                        if self.rcon_warning_count >= 3:
-                            self.log(
-                                "[ERROR] RCON frozen warning hit 3x. Restarting server."
-                            )
-                            self.stop_server()
-                            time.sleep(2)
-                            self.start_server()
-                            return
-                else:
-                    if self.rcon_warning_count > 0:
-                        self.log("[INFO] RCON ping recovered.")
-                    self.failed_rcon_pings = 0
-                    self.rcon_warning_count = 0
-                time.sleep(30)
-
-        threading.Thread(target=rcon_loop, daemon=True).start()
 
     def start_server(self):
         exe = self.executable_path.get()
         cfg = self.config_path.get()
         port = self.server_port.get()
 
-        if not os.path.isfile(exe) or not os.path.isfile(cfg):
-            self.log("[ERROR] Executable or config path invalid.")
+        if self.preflight:
+            self.log("[WARN] Pre-flight checks already running.")
+            return
+        if self.stopping:
+            self.log("[WARN] Server is still stopping.")
             return
+        if self.process and self.process.poll() is None:
+            self.log("[WARN] Server is already running.")
+            return
+
+        # Checks run on the shared pre-flight pool; launch() resumes on Tk
+        self.set_status("🔄 Checking...", "gray")
+        self.preflight = start_preflight(exe, cfg, port, id(self))
+        self.poll_preflight(exe, cfg, port)
+        get_scheduler().refresh()
 
-        if port in used_ports:
-            self.log(f"[ERROR] Port {port} is already in use.")
+    def poll_preflight(self, exe, cfg, port):
+        if not all(f.done() for f in self.preflight):
+            self.frame.after(50, self.poll_preflight, exe, cfg, port)
+            return
+        checks = collect(self.preflight)
+        self.preflight = None
+        for check in checks:
+            if check.severity == "error":
+                self.log(f"[ERROR] {check.name}: {check.message}")
+            elif check.severity == "warning":
+                self.log(f"[WARN] {check.name}: {check.message}")
+        if failed(checks):
+            self.log("[ERROR] Pre-flight checks failed. Not starting.")
+            self.set_status("🔴 Offline", "red")
+            return
+        self.launch(exe, cfg, port)
+
+    def launch(self, exe, cfg, port):
+        conflict = get_allocator().reserve(id(self), port, self.name)
+        if conflict:
+            self.log(f"[ERROR] Port {port} is unavailable: {conflict}.")
+            self.set_status("🔴 Offline", "red")
             return
 
-        used_ports.add(port)
         self.parse_rcon_password(cfg)
         working_dir = os.path.dirname(exe)
 
@@ -394,80 +599,239 @@ class ServerTab:
             "+map_rotate",
         ]
 
+        self.last_cmd = cmd
+        self.cfg_hash = file_sha256(cfg)
+        self.launched_at = time.time()
+        self.players = None
+        self.failed_rcon_pings = 0
+        self.rcon_warning_count = 0
         self.log(f"[CMD] {' '.join(cmd)}")
         self.set_status("🔄 Starting...", "gray")
         self.log(f"[INFO] Launching on port {port}...")
 
         def run():
+            process = None
+            server = safe_server_name(self.name)
             try:
-                self.process = subprocess.Popen(
+                process = self.process = subprocess.Popen(
                     cmd,
                     cwd=working_dir,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     text=True,
+                    **DETACHED,
+                )
+                self.started_at = time.time()
+                self.net_data = []
+                self.proc_data = []
+                get_sampler().track(id(self), process.pid)
+                get_monitor().track(
+                    id(self), self.name, port, process.pid, self.on_net_event
                 )
-                self.start_rcon_ping()
                 for line in self.process.stdout:
                     line = line.strip()
                     self.log(line)
+                    get_sessions().feed(server, line)
                     if "Server started!" in line:
                         self.set_status("🟢 Online", "green")
-                used_ports.discard(port)
             except Exception as e:
                 self.log(f"[ERROR] {e}")
-                used_ports.discard(port)
                 self.set_status("🟠 Crashed", "orange")
+            finally:
+                if process is not None:
+                    get_sessions().end_server(server)
+                # An auto-restart may already hold the port for a newer process
+                if process is None or self.process in (None, process):
+                    get_allocator().release(id(self), port)
+                    get_monitor().untrack(id(self))
+                    get_sampler().untrack(id(self))
 
         threading.Thread(target=run, daemon=True).start()
+        get_scheduler().refresh()
+
+    def quit_sender(self):
+        # RCON "quit" for the graceful first stage; None skips straight to terminate
+        if not self.rcon_password:
+            return None
+        port, password = self.server_port.get(), self.rcon_password
+        return lambda: send_command(port, password, "quit", timeout=QUIT_SEND_TIMEOUT)
 
-    def stop_server(self):
+    def stop_server(self, on_stopped=None, graceful=True):
+        # Non-blocking: the quit/terminate/kill escalation runs off the Tk thread
         self.manual_stop = True
         self.auto_restart.set(False)
-        if self.process and self.process.poll() is None:
-            self.process.terminate()
+        if self.stopping:
+            return
+        process = self.process
+        if not (process and process.poll() is None):
+            self.set_status("⏹ Stopped", "gray")
+            self.process = None
+            if on_stopped:
+                on_stopped()
+            return
+        self.log("[ACTION] Stopping server...")
+        self.set_status("⏳ Stopping...", "gray")
+        sender = self.quit_sender() if graceful else None
+        self.stopping = FleetShutdown([(id(self), process, sender)], budget=None)
+        self.poll_stop(on_stopped)
+
+    def poll_stop(self, on_stopped):
+        if not self.stopping.done():
+            get_scheduler().once(0.25, lambda: self.poll_stop(on_stopped), id(self))
+            return
+        result = self.stopping.results[id(self)]
+        self.stopping = None
+        if result == "quit":
+            self.log("[ACTION] Server manually stopped (RCON quit).")
+        elif result == "terminate":
             self.log("[ACTION] Server manually stopped.")
-            try:
-                self.process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.log("[WARN] Server didn't terminate cleanly. Force killed.")
+        elif result == "kill":
+            self.log("[WARN] Server didn't terminate cleanly. Force killed.")
+        elif result == "alive":
+            self.log("[ERROR] Server process did not exit after kill.")
         self.set_status("⏹ Stopped", "gray")
         self.process = None
+        if on_stopped:
+            on_stopped()
+
+    def collect_samples(self):
+        self.drain_net_events()
+        if self.process and self.process.poll() is None:
+            # Whole process tree, sampled for every server in one pass
+            for sample in get_sampler().drain(id(self)):
+                self.record_sample(sample)
+                self.plots_stale = True
 
     def update_resource_plots(self):
+        self.collect_samples()
         if self.process and self.process.poll() is None:
-            try:
-                proc = psutil.Process(self.process.pid)
-                mem = proc.memory_info().rss / 1024 / 1024
-                cpu = proc.cpu_percent(interval=None)
-                self.mem_data.append(mem)
-                self.cpu_data.append(cpu)
-                if len(self.mem_data) > self.mem_max_points:
-                    self.mem_data.pop(0)
-                    self.cpu_data.pop(0)
-                x = range(len(self.mem_data))
-                self.mem_line.set_data(x, self.mem_data)
-                self.mem_max_line.set_data(x, [max(self.mem_data)] * len(self.mem_data))
-                self.ax_mem.set_ylim(0, max(64, max(self.mem_data) * 1.25))
-                self.mem_canvas.draw()
-                self.cpu_line.set_data(x, self.cpu_data)
-                self.cpu_canvas.draw()
-            except Exception as e:
-                self.log(f"[ERROR] Resource monitor: {e}")
-        self.frame.after(2000, self.update_resource_plots)
+            # Hidden tabs only skip the redraw; samples are still collected
+            # at the status rate
+            if self.plots_stale and get_scheduler().visible(self.frame):
+                try:
+                    self.draw_plots()
+                    self.plots_stale = False
+                except Exception as e:
+                    self.log(f"[ERROR] Resource monitor: {e}")
+            if self.net_data:
+                sample = self.net_data[-1]
+                self.net_status.set(
+                    f"{sample.sockets} socket(s), rx queue {sample.rx_queue} B,"
+                    f" drops {sample.drops}"
+                )
+        else:
+            self.net_status.set("-")
+            self.proc_status.set("-")
+
+    def record_sample(self, sample):
+        previous = self.proc_data[-1] if self.proc_data else sample
+        self.proc_data.append(sample)
+        self.mem_data.append(sample.rss_mb)
+        self.cpu_data.append(sample.cpu_pct)
+        if len(self.mem_data) > self.mem_max_points:
+            self.mem_data.pop(0)
+            self.cpu_data.pop(0)
+            self.proc_data.pop(0)
+        elapsed = max(sample.ts - previous.ts, 1e-6)
+        read_rate = max(0, sample.read_bytes - previous.read_bytes) / elapsed
+        write_rate = max(0, sample.write_bytes - previous.write_bytes) / elapsed
+        self.proc_status.set(
+            f"{sample.processes} proc, {sample.threads} threads, {sample.fds} handles\n"
+            f"disk R {read_rate / 1024:.0f} KB/s W {write_rate / 1024:.0f} KB/s"
+        )
+
+    def draw_plots(self):
+        x = range(len(self.mem_data))
+        self.mem_line.set_data(x, self.mem_data)
+        self.mem_max_line.set_data(x, [max(self.mem_data)] * len(self.mem_data))
+        self.ax_mem.set_ylim(0, max(64, max(self.mem_data) * 1.25))
+        self.mem_canvas.draw()
+        self.cpu_line.set_data(x, self.cpu_data)
+        self.cpu_canvas.draw()
 
     def auto_refresh_status(self):
-        if self.process and self.process.poll() is not None:
+        self.collect_samples()
+        if (
+            self.process
+            and self.process.poll() is not None
+            and self.process is not self.exited_process
+        ):
+            self.exited_process = self.process
             if self.manual_stop:
                 self.set_status("⏹ Stopped", "gray")
             else:
                 self.set_status("🟠 Crashed", "orange")
+                self.record_crash(self.process.returncode)
                 if self.auto_restart.get():
                     self.log("[INFO] Server crashed. Restarting after delay.")
-                    self.manager.root.after(3000, self.start_server)
+                    self.last_restart = (
+                        time.time(),
+                        f"crash ({format_exit_code(self.process.returncode)})",
+                    )
+                    get_scheduler().once(3, self.start_server, id(self))
             self.manual_stop = False
-        self.frame.after(2000, self.auto_refresh_status)
+
+    def run_worker(self, work, on_done, poll=0.25):
+        # Runs work() on a thread and hands (result, error) to on_done on Tk
+        outcome = {}
+
+        def run():
+            try:
+                outcome["result"] = work()
+            except Exception as e:
+                outcome["error"] = e
+
+        def check():
+            if not outcome:
+                get_scheduler().once(poll, check, id(self))
+                return
+            on_done(outcome.get("result"), outcome.get("error"))
+
+        threading.Thread(target=run, daemon=True).start()
+        get_scheduler().once(poll, check, id(self))
+
+    def record_crash(self, exit_code):
+        server = safe_server_name(self.name)
+        uptime = time.time() - self.started_at if self.started_at else None
+        snapshot = dict(
+            server=server,
+            exit_code=exit_code,
+            log_tail=list(self.log_data),
+            metrics={
+                "mem_mb": list(self.mem_data),
+                "cpu_pct": list(self.cpu_data),
+                "net": [sample._asdict() for sample in self.net_data],
+                "proc": [sample._asdict() for sample in self.proc_data],
+            },
+            cmd=list(self.last_cmd),
+            cfg_path=self.config_path.get(),
+            cfg_hash=self.cfg_hash,
+            uptime=uptime,
+        )
+        # Logged after the tail is copied so it doesn't become part of the signature
+        self.log(f"[ERROR] Server exited with code {format_exit_code(exit_code)}")
+
+        def analyze():
+            # Clustering and both file writes stay off the Tk thread
+            messages = []
+            cluster_id = None
+            try:
+                cluster_id = get_analyzer().record(server, exit_code, snapshot["log_tail"])
+                messages.append(f"[INFO] Crash cluster {cluster_id}")
+            except Exception as e:
+                messages.append(f"[ERROR] Crash analysis failed: {e}")
+            try:
+                name = get_bundles().write(cluster=cluster_id, **snapshot)
+                messages.append(f"[INFO] Crash bundle saved: {name}")
+            except Exception as e:
+                messages.append(f"[ERROR] Crash bundle failed: {e}")
+            return messages
+
+        def report(messages, error):
+            for message in messages or [f"[ERROR] Crash analysis failed: {error}"]:
+                self.log(message)
+
+        self.run_worker(analyze, report)
 
     def browse_executable(self):
         path = filedialog.askopenfilename(
@@ -482,7 +846,11 @@ class ServerTab:
         )
         if path:
             self.config_path.set(path)
+            self.register_config()
             self.parse_rcon_password(path)
+            port = get_dvar(path, "net_port")
+            if port and port.isdigit():
+                self.server_port.set(port)
 
     def set_status(self, status_text, color):
         self.server_status.set(status_text)
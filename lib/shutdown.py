@@ -0,0 +1,114 @@
+import logging
+import os
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Per-stage caps; a global budget can shorten them further
+QUIT_TIMEOUT = 10.0
+TERMINATE_TIMEOUT = 5.0
+KILL_TIMEOUT = 2.0
+FLEET_BUDGET = 20.0
+
+# Servers get their own process group/session, so a console Ctrl+C or the
+# manager exiting doesn't take them down with it. Their stdout is still our
+# pipe, so once the manager is gone writes to it fail; on POSIX the child
+# keeps SIGPIPE ignored (restore_signals=False) so that is EPIPE, not death.
+if os.name == "nt":
+    DETACHED = dict(creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+else:
+    DETACHED = dict(start_new_session=True, restore_signals=False)
+
+
+def wait_until(process, deadline):
+    try:
+        process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        return True
+    except subprocess.TimeoutExpired:
+        return False
+
+
+def stop_process(process, send_quit=None, budget=None, on_stage=None):
+    # Escalates RCON quit -> terminate -> kill, each with its own deadline.
+    # Returns the stage that ended the process ("exited" if it already had),
+    # or "alive" if even kill didn't take within KILL_TIMEOUT.
+    started = time.monotonic()
+    end = started + budget if budget else None
+
+    def deadline(timeout, reserve):
+        # Leave at least `reserve` of the budget for the stages after this one
+        now = time.monotonic()
+        if end is None:
+            return now + timeout
+        return min(now + timeout, end - min(reserve, (end - now) / 2))
+
+    def stage(name):
+        if on_stage:
+            on_stage(name)
+
+    if process.poll() is not None:
+        return "exited"
+    if send_quit:
+        stage("quit")
+        try:
+            send_quit()
+        except Exception as e:
+            logger.warning("RCON quit failed: %s", e)
+        if wait_until(process, deadline(QUIT_TIMEOUT, TERMINATE_TIMEOUT + KILL_TIMEOUT)):
+            return "quit"
+    stage("terminate")
+    try:
+        process.terminate()
+    except OSError:
+        pass
+    if wait_until(process, deadline(TERMINATE_TIMEOUT, KILL_TIMEOUT)):
+        return "terminate"
+    stage("kill")
+    try:
+        process.kill()
+    except OSError:
+        pass
+    if wait_until(process, time.monotonic() + KILL_TIMEOUT):
+        return "kill"
+    return "alive"
+
+
+class FleetShutdown:
+    # Stops several servers at once, one thread each, within a shared budget.
+    # Poll done()/stages from the Tk thread.
+    def __init__(self, jobs, budget=FLEET_BUDGET):
+        # jobs: [(key, process, send_quit or None)]
+        self.lock = threading.Lock()
+        self.stages = {key: "pending" for key, _, _ in jobs}
+        self.results = {}
+        self.threads = []
+        for key, process, send_quit in jobs:
+            thread = threading.Thread(
+                target=self._stop, args=(key, process, send_quit, budget), daemon=True
+            )
+            self.threads.append(thread)
+            thread.start()
+
+    def _stop(self, key, process, send_quit, budget):
+        def on_stage(name):
+            with self.lock:
+                self.stages[key] = name
+
+        try:
+            result = stop_process(process, send_quit, budget, on_stage)
+        except Exception:
+            logger.exception("Stopping %s failed", key)
+            result = "alive"
+        with self.lock:
+            self.stages[key] = result
+            self.results[key] = result
+
+    def done(self):
+        with self.lock:
+            return len(self.results) == len(self.stages)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stages)
@@ -0,0 +1,16 @@
+import threading
+
+
+def lazy_singleton(factory):
+    # Returns a getter that builds factory() on first use and then keeps
+    # returning that instance; safe to call from any thread
+    instance = []
+    lock = threading.Lock()
+
+    def get():
+        with lock:
+            if not instance:
+                instance.append(factory())
+            return instance[0]
+
+    return get
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from lib.net_probe import bound_ports, read_socket_table
+from lib.proc_sampler import process_tree
+from lib.singleton import lazy_singleton
+
+logger = logging.getLogger(__name__)
+
+MONITOR_INTERVAL = 5.0
+
+NetSample = namedtuple("NetSample", "ts sockets rx_queue tx_queue drops")
+Tracked = namedtuple("Tracked", "name port pid on_event")
+
+
+def socket_inodes(pids):
+    # inode -> pid for the sockets held by `pids` (Linux /proc/<pid>/fd)
+    inodes = {}
+    for pid in pids:
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                target = os.readlink(os.path.join(fd_dir, fd))
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                inodes[int(target[8:-1])] = pid
+    return inodes
+
+
+def find_inode_owner(inode):
+    # Full /proc scan; only used to name the holder once a conflict is seen
+    try:
+        pids = [int(p) for p in os.listdir("/proc") if p.isdigit()]
+    except OSError:
+        return None
+    for pid in pids:
+        if inode in socket_inodes([pid]):
+            return pid
+    return None
+
+
+def describe_pid(pid):
+    if pid is None:
+        return "an unknown process"
+    if psutil is not None:
+        try:
+            return f"pid {pid} ({psutil.Process(pid).name()})"
+        except psutil.Error:
+            pass
+    return f"pid {pid}"
+
+
+class SocketMonitor:
+    # One socket-table read per interval, shared by every running server
+    def __init__(self, interval=MONITOR_INTERVAL):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.tracked = {}
+        self.alerted = {}
+        self.wake_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def track(self, key, name, port, pid, on_event):
+        # on_event(kind, payload) is called from the monitor thread with
+        # ("sample", NetSample) or ("conflict", message)
+        with self.lock:
+            self.tracked[key] = Tracked(name, int(port), pid, on_event)
+            self.alerted.pop(key, None)
+        self.wake_event.set()
+
+    def untrack(self, key):
+        with self.lock:
+            self.tracked.pop(key, None)
+            self.alerted.pop(key, None)
+
+    def _run(self):
+        while True:
+            self.wake_event.wait(self.interval)
+            self.wake_event.clear()
+            with self.lock:
+                tracked = dict(self.tracked)
+            if not tracked:
+                continue
+            try:
+                self.sample(tracked)
+            except Exception:
+                logger.exception("Sampling failed")
+
+    def sample(self, tracked):
+        bound = bound_ports(read_socket_table())
+        now = time.time()
+        for key, server in tracked.items():
+            tree = process_tree(server.pid)
+            entries = bound.get(("udp", server.port), [])
+            # /proc entries carry inodes; psutil entries carry the pid directly
+            owned = socket_inodes(tree) if any(e.pid is None for e in entries) else {}
+            mine, foreign = [], []
+            for entry in entries:
+                pid = entry.pid if entry.pid is not None else owned.get(entry.inode)
+                (mine if pid in tree else foreign).append(entry)
+
+            conflicts = {entry.inode or entry.pid for entry in foreign}
+            with self.lock:
+                new = conflicts - self.alerted.get(key, set())
+                self.alerted[key] = conflicts
+            for entry in foreign:
+                if (entry.inode or entry.pid) not in new:
+                    continue
+                holder = entry.pid
+                if holder is None and entry.inode:
+                    holder = find_inode_owner(entry.inode)
+                server.on_event(
+                    "conflict",
+                    f"UDP port {server.port} is also bound by {describe_pid(holder)}"
+                    f" on {entry.ip}",
+                )
+
+            server.on_event(
+                "sample",
+                NetSample(
+                    now,
+                    len(mine),
+                    sum(e.rx_queue for e in mine),
+                    sum(e.tx_queue for e in mine),
+                    sum(e.drops for e in mine),
+                ),
+            )
+
+
+get_monitor = lazy_singleton(SocketMonitor)
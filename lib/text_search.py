@@ -0,0 +1,37 @@
+import re
+from bisect import bisect_right
+
+
+def compile_pattern(term, regex=False, case=True):
+    flags = re.MULTILINE if regex else 0
+    if not case:
+        flags |= re.IGNORECASE
+    return re.compile(term if regex else re.escape(term), flags)
+
+
+def find_spans(content, pattern, replacement=None, regex=False):
+    # One pass over the buffer: [(start, end, new_text_or_None), ...]
+    spans = []
+    for match in pattern.finditer(content):
+        if replacement is None:
+            if match.end() > match.start():
+                spans.append((match.start(), match.end(), None))
+        else:
+            new = match.expand(replacement) if regex else replacement
+            if new != match.group(0):
+                spans.append((match.start(), match.end(), new))
+    return spans
+
+
+class TextIndexer:
+    # Maps character offsets in a buffer snapshot to Tk "line.col" indices
+    def __init__(self, content):
+        self.line_starts = [0]
+        pos = content.find("\n")
+        while pos >= 0:
+            self.line_starts.append(pos + 1)
+            pos = content.find("\n", pos + 1)
+
+    def index(self, offset):
+        line = bisect_right(self.line_starts, offset)
+        return f"{line}.{offset - self.line_starts[line - 1]}"
@@ -1,3 +1,4 @@
+import logging
 import os
 import tkinter as tk
 from lib.manager import HMWServerManager
@@ -5,6 +6,11 @@ from lib.manager import HMWServerManager
 if __name__ == "__main__":
     os.makedirs("cfg", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
+    # Background workers report failures through the logging module
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
+    )
     root = tk.Tk()
     app = HMWServerManager(root)
     root.mainloop()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app runs from the repository root and imports `lib` from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,127 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from lib.backup_store import BackupStore
+
+LEGACY_NAME = "server_2024-05-01_12-30-00.cfg"
+
+
+@pytest.fixture
+def backup_dir(tmp_path):
+    return str(tmp_path / "backups")
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    path = tmp_path / "server.cfg"
+    path.write_bytes(b"set sv_hostname one\n")
+    return path
+
+
+def write_legacy(backup_dir, name=LEGACY_NAME, data=b"set sv_hostname legacy\n"):
+    os.makedirs(backup_dir, exist_ok=True)
+    with open(os.path.join(backup_dir, name), "wb") as f:
+        f.write(data)
+
+
+def test_backup_reuses_the_latest_version_for_unchanged_content(backup_dir, cfg):
+    store = BackupStore(backup_dir)
+    first = store.backup(str(cfg))
+    assert store.backup(str(cfg)) == first
+
+    cfg.write_bytes(b"set sv_hostname two\n")
+    second = store.backup(str(cfg))
+    assert second != first
+    assert store.read(first) == b"set sv_hostname one\n"
+    assert store.read_text(second) == "set sv_hostname two\n"
+    assert [r["id"] for r in store.history(os.path.abspath(cfg))] == [second, first]
+
+
+def test_identical_content_shares_one_object(backup_dir, tmp_path):
+    store = BackupStore(backup_dir)
+    a = store.backup(str(tmp_path / "a.cfg"), data=b"same\n")
+    b = store.backup(str(tmp_path / "b.cfg"), data=b"same\n")
+    assert store.get(a)["hash"] == store.get(b)["hash"]
+
+    store.delete(a)
+    assert os.path.exists(store.object_path(store.get(b)["hash"]))
+    digest = store.get(b)["hash"]
+    store.delete(b)
+    assert not os.path.exists(store.object_path(digest))
+    assert store.count() == 0
+
+
+def test_backups_are_attributed_to_the_assigned_server(backup_dir, cfg):
+    store = BackupStore(backup_dir)
+    earlier = store.backup(str(cfg))
+    store.assign_server(str(cfg), "Alpha")
+    assert store.get(earlier)["server"] == "Alpha"
+
+    cfg.write_bytes(b"changed\n")
+    later = store.backup(str(cfg))
+    assert store.get(later)["server"] == "Alpha"
+    assert store.servers() == ["Alpha"]
+    assert store.count(server="Alpha") == 2
+
+
+def test_restore_writes_the_version_back(backup_dir, cfg, tmp_path):
+    store = BackupStore(backup_dir)
+    version = store.backup(str(cfg))
+    dest = tmp_path / "restored.cfg"
+    store.restore(version, str(dest))
+    assert dest.read_bytes() == b"set sv_hostname one\n"
+
+
+def test_listeners_see_additions_and_deletions(backup_dir, cfg):
+    store = BackupStore(backup_dir)
+    events = []
+    store.add_listener(lambda event, payload: events.append(event))
+    version = store.backup(str(cfg))
+    store.delete(version)
+    assert events == ["added", "deleted"]
+
+
+def test_import_legacy_keeps_each_copy_as_its_own_source(backup_dir):
+    write_legacy(backup_dir)
+    write_legacy(backup_dir, "server_2024-05-02_08-00-00.cfg", b"other\n")
+    store = BackupStore(backup_dir)
+
+    rows = store.query()
+    assert len(rows) == 2
+    assert {row["source"] for row in rows} == {
+        store.legacy_source(LEGACY_NAME),
+        store.legacy_source("server_2024-05-02_08-00-00.cfg"),
+    }
+    assert all(row["server"] is None for row in rows)
+    oldest = rows[-1]
+    assert oldest["created"] == datetime(2024, 5, 1, 12, 30).timestamp()
+    assert store.read(oldest["id"]) == b"set sv_hostname legacy\n"
+    # The flat files are left in place
+    assert os.path.exists(os.path.join(backup_dir, LEGACY_NAME))
+
+
+def test_import_legacy_runs_once(backup_dir):
+    write_legacy(backup_dir)
+    BackupStore(backup_dir)
+    store = BackupStore(backup_dir)
+    assert store.count() == 1
+    assert store.import_legacy() == 0
+
+
+def test_import_legacy_ignores_other_files(backup_dir):
+    write_legacy(backup_dir, "notes.txt")
+    write_legacy(backup_dir, "server_2024-13-45_99-99-99.cfg")
+    assert BackupStore(backup_dir).count() == 0
+
+
+def test_deleted_legacy_backup_is_not_reimported(backup_dir):
+    write_legacy(backup_dir)
+    store = BackupStore(backup_dir)
+    (row,) = store.query()
+    store.delete(row["id"])
+    assert store.count() == 0
+
+    assert store.import_legacy() == 0
+    assert BackupStore(backup_dir).count() == 0
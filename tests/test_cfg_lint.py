@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from lib.cfg_lint import errors, lint_file, lint_text
+
+
+def lint(tmp_path, text):
+    return lint_text(text, str(tmp_path / "server.cfg"))
+
+
+def findings(issues):
+    return [(i.severity, i.line, i.message) for i in issues]
+
+
+def test_clean_config_has_no_issues(tmp_path):
+    text = (
+        'set sv_hostname "HMW"\n'
+        "set sv_maxclients 18\n"
+        "set g_gametype war\n"
+        'set sv_mapRotation "gametype war map mp_rust map mp_terminal"\n'
+        "set scr_war_scorelimit 7500\n"
+        "map_rotate\n"
+    )
+    assert lint(tmp_path, text) == []
+
+
+@pytest.mark.parametrize("line, message", [
+    ("set sv_maxclients lots", "sv_maxclients expects an integer, got 'lots'"),
+    ('set sv_mapRotation "gametype war map"', "sv_mapRotation has a dangling token"),
+    ("exec missing", "exec target 'missing' not found"),
+])
+def test_definite_breakage_is_an_error(tmp_path, line, message):
+    assert findings(lint(tmp_path, line + "\n")) == [("error", 1, message)]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("set sv_maxclients 64", "sv_maxclients=64 is outside 1..18"),
+    ("set sv_pure yes", "sv_pure expects 0 or 1, got 'yes'"),
+    ("set g_gametype tdm", "Unknown gametype 'tdm'"),
+    ("set sv_madeup 1", "Unknown dvar sv_madeup"),
+    ('set sv_mapRotation "map mp_nowhere"', "Unknown map 'mp_nowhere'"),
+    ('set sv_mapRotation "mode war"',
+     "Invalid rotation keyword 'mode' (expected gametype/map)"),
+])
+def test_schema_guesses_are_warnings(tmp_path, line, message):
+    assert findings(lint(tmp_path, line + "\n")) == [("warning", 1, message)]
+
+
+def test_override_is_reported_with_the_earlier_line(tmp_path):
+    issues = lint(tmp_path, "set g_gametype war\nset g_gametype dom\n")
+    assert findings(issues) == [
+        ("warning", 2, "g_gametype overrides the value set on line 1")
+    ]
+
+
+def test_map_rotate_without_rotation(tmp_path):
+    issues = lint(tmp_path, "map_rotate\n")
+    assert findings(issues) == [
+        ("warning", 0, "map_rotate used but sv_mapRotation is unset")
+    ]
+
+
+def test_issues_in_includes_sort_after_the_main_file(tmp_path):
+    with open(tmp_path / "extra.cfg", "w", encoding="utf-8") as f:
+        f.write("set sv_fps fast\n")
+    issues = lint(tmp_path, "exec extra\nset sv_madeup 1\n")
+    assert [(os.path.basename(i.file), i.line) for i in issues] == [
+        ("server.cfg", 2),
+        ("extra.cfg", 1),
+    ]
+    assert findings(errors(issues)) == [
+        ("error", 1, "sv_fps expects an integer, got 'fast'")
+    ]
+
+
+def test_lint_file_missing(tmp_path):
+    issues = lint_file(str(tmp_path / "missing.cfg"))
+    assert findings(issues) == [("error", 0, "Config file not found")]
+
+
+def test_lint_file_reuses_issues_until_the_file_changes(tmp_path):
+    path = tmp_path / "server.cfg"
+    path.write_text("set sv_maxclients lots\n", encoding="utf-8")
+    first = lint_file(str(path))
+    assert lint_file(str(path)) is first
+
+    path.write_text("set sv_maxclients 12\n", encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    assert lint_file(str(path)) == []
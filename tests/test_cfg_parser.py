@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from lib.cfg_parser import (
+    exec_candidates,
+    load_cfg,
+    parse_rotation,
+    parse_text,
+    resolve_exec,
+    split_commands,
+)
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return str(path)
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    return str(tmp_path / "game")
+
+
+def test_split_commands_ignores_separators_in_quotes():
+    line = 'set sv_hostname "a;b // c"; seta g_gametype war // comment'
+    assert split_commands(line) == ['set sv_hostname "a;b // c"', "seta g_gametype war"]
+
+
+def test_parse_text_records_dvars_and_commands(tmp_path):
+    model = parse_text(
+        'set sv_hostname "My Server"\nseta SV_MAXCLIENTS 12\nmap_rotate\n',
+        str(tmp_path / "server.cfg"),
+    )
+    assert model.get("sv_hostname") == "My Server"
+    assert model.get("sv_maxclients") == "12"
+    assert model.dvars["sv_maxclients"].line == 2
+    assert [(c.name, c.line) for c in model.commands] == [("map_rotate", 3)]
+
+
+def test_later_assignment_wins(tmp_path):
+    model = parse_text("set g_gametype war\nset g_gametype dom\n", str(tmp_path / "s.cfg"))
+    assert model.get("g_gametype") == "dom"
+    assert len(model.assignments) == 2
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("gametype war map mp_rust map mp_terminal",
+     [("war", "mp_rust"), ("war", "mp_terminal")]),
+    ("map mp_rust gametype dom map mp_crash", [(None, "mp_rust"), ("dom", "mp_crash")]),
+    ("gametype war map", []),
+    ("", []),
+])
+def test_parse_rotation(value, expected):
+    assert parse_rotation(value) == expected
+
+
+def test_map_rotation_reads_sv_maprotation(tmp_path):
+    model = parse_text(
+        'set sv_mapRotation "gametype sd map mp_rust"\n', str(tmp_path / "s.cfg")
+    )
+    assert model.map_rotation == [("sd", "mp_rust")]
+
+
+def test_exec_candidates_try_the_game_folder(tmp_path, game_dir):
+    including = os.path.join(str(tmp_path), "cfgs", "server.cfg")
+    candidates = exec_candidates("dsr", including, game_dir)
+    assert candidates[:2] == [
+        os.path.abspath(os.path.join(str(tmp_path), "cfgs", "dsr.cfg")),
+        os.path.abspath(os.path.join(str(tmp_path), "cfgs", "dsr")),
+    ]
+    assert os.path.abspath(os.path.join(game_dir, "main", "dsr.cfg")) in candidates
+    assert os.path.abspath(os.path.join(game_dir, "players2", "dsr.cfg")) in candidates
+
+
+def test_resolve_exec_prefers_the_including_folder(tmp_path, game_dir):
+    local = write(os.path.join(str(tmp_path), "cfgs", "extra.cfg"), "")
+    write(os.path.join(game_dir, "main", "extra.cfg"), "")
+    resolved, _ = resolve_exec("extra.cfg", os.path.join(str(tmp_path), "cfgs", "s.cfg"), game_dir)
+    assert resolved == os.path.abspath(local)
+
+
+def test_exec_resolves_against_the_game_folder(tmp_path, game_dir):
+    server = write(os.path.join(str(tmp_path), "cfgs", "server.cfg"), "exec rotation\n")
+    included = write(os.path.join(game_dir, "main", "rotation.cfg"), "set g_gametype dom\n")
+
+    model = load_cfg(server, game_dir)
+    assert [e.resolved for e in model.execs] == [os.path.abspath(included)]
+    assert model.get("g_gametype") == "dom"
+    assert model.dvars["g_gametype"].file == os.path.abspath(included)
+
+
+def test_missing_exec_is_picked_up_once_created(tmp_path, game_dir):
+    server = write(os.path.join(game_dir, "server.cfg"), "exec late\n")
+    model = load_cfg(server, game_dir)
+    assert model.execs[0].resolved is None
+
+    write(os.path.join(game_dir, "main", "late.cfg"), "set sv_hostname late\n")
+    model = load_cfg(server, game_dir)
+    assert model.execs[0].resolved is not None
+    assert model.get("sv_hostname") == "late"
+
+
+def test_exec_cycles_are_followed_once(game_dir):
+    a = write(os.path.join(game_dir, "a.cfg"), "set one 1\nexec b\n")
+    write(os.path.join(game_dir, "b.cfg"), "set two 2\nexec a\n")
+
+    model = load_cfg(a, game_dir)
+    assert [d.name for d in model.assignments] == ["one", "two"]
+    assert len(model.execs) == 2
+
+
+def test_load_cfg_is_cached_until_a_file_changes(game_dir):
+    server = write(os.path.join(game_dir, "server.cfg"), "exec extra\n")
+    extra = write(os.path.join(game_dir, "extra.cfg"), "set sv_maxclients 8\n")
+    model = load_cfg(server, game_dir)
+    assert load_cfg(server, game_dir) is model
+
+    write(extra, "set sv_maxclients 12\n")
+    os.utime(extra, ns=(0, 0))
+    reloaded = load_cfg(server, game_dir)
+    assert reloaded is not model
+    assert reloaded.get("sv_maxclients") == "12"
+
+
+def test_load_cfg_missing_file(tmp_path):
+    assert load_cfg(str(tmp_path / "missing.cfg")) is None
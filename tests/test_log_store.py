@@ -0,0 +1,118 @@
+import gzip
+import os
+
+import pytest
+
+from lib.log_store import LogStore
+
+
+def write_log(log_dir, name, lines, mode="w"):
+    with open(os.path.join(log_dir, name), mode, encoding="utf-8", newline="\n") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    path = tmp_path / "logs"
+    path.mkdir()
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path, log_dir):
+    return LogStore(str(tmp_path / "store.db"), log_dir)
+
+
+def backfill(store):
+    store.backfill()
+    assert store.flush(10)
+
+
+def messages(rows):
+    return sorted(row[3] for row in rows)
+
+
+def test_backfill_indexes_logs_on_disk(store, log_dir):
+    write_log(log_dir, "alpha_2024-05-01.log", [
+        "[10:00:00] [INFO] map mp_rust loaded",
+        "[10:00:05] [ERROR] script error in maps/mp/gametypes",
+    ])
+    write_log(log_dir, "beta_2024-05-01.log", ["[11:00:00] [INFO] map mp_terminal loaded"])
+    backfill(store)
+
+    assert store.servers() == ["alpha", "beta"]
+    assert len(store.search("loaded")) == 2
+    rows = store.search("loaded", server="beta")
+    assert [(r[1], r[2]) for r in rows] == [("beta", "INFO")]
+    assert len(store.search("error", level="ERROR")) == 1
+    assert store.search("error", level="INFO") == []
+
+
+def test_search_highlights_matches(store, log_dir):
+    write_log(log_dir, "alpha_2024-05-01.log", ["[10:00:00] [INFO] player joined"])
+    backfill(store)
+
+    (row,) = store.search("joined")
+    assert "\x02joined\x03" in row[3]
+
+
+def test_search_falls_back_on_invalid_fts_syntax(store, log_dir):
+    write_log(log_dir, "alpha_2024-05-01.log", ["[10:00:00] [INFO] bad AND ( query"])
+    backfill(store)
+
+    assert len(store.search("( AND")) == 1
+
+
+def test_backfill_only_reads_new_bytes(store, log_dir):
+    write_log(log_dir, "alpha_2024-05-01.log", ["[10:00:00] [INFO] first"])
+    backfill(store)
+    write_log(log_dir, "alpha_2024-05-01.log", ["[10:00:01] [INFO] second"], mode="a")
+    backfill(store)
+    backfill(store)
+
+    assert len(store.search("first")) == 1
+    assert len(store.search("second")) == 1
+
+
+def test_backfill_reindexes_truncated_file(store, log_dir):
+    write_log(log_dir, "alpha_2024-05-01.log", ["[10:00:00] [INFO] old line one",
+                                                "[10:00:01] [INFO] old line two"])
+    backfill(store)
+    write_log(log_dir, "alpha_2024-05-01.log", ["[12:00:00] [INFO] new"])
+    backfill(store)
+
+    assert store.search("old") == []
+    assert len(store.search("new")) == 1
+
+
+def test_backfill_reads_compressed_segments_once(store, log_dir):
+    with gzip.open(os.path.join(log_dir, "alpha_2024-05-01.1.log.gz"), "wt") as f:
+        f.write("[09:00:00] [INFO] rotated away\n")
+    backfill(store)
+    backfill(store)
+
+    assert len(store.search("rotated")) == 1
+
+
+def test_append_skips_lines_the_backfill_already_read(store, log_dir):
+    line = "[10:00:00] [INFO] live line"
+    write_log(log_dir, "alpha_2024-05-01.log", [line])
+    backfill(store)
+    store.append("alpha_2024-05-01.log", len(line) + 1, line)
+    assert store.flush(10)
+
+    assert len(store.search("live")) == 1
+
+
+def test_append_with_a_gap_backfills_it_from_disk(store, log_dir):
+    lines = ["[10:00:00] [INFO] missed line", "[10:00:01] [INFO] tailed line"]
+    write_log(log_dir, "alpha_2024-05-01.log", lines)
+    end = sum(len(line) + 1 for line in lines)
+    store.append("alpha_2024-05-01.log", end, lines[1])
+    assert store.flush(10)
+
+    assert len(store.search("missed")) == 1
+    assert len(store.search("tailed")) == 1
+    assert messages(store.search("line")) == sorted(
+        line.replace("line", "\x02line\x03") for line in lines
+    )
@@ -0,0 +1,114 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from lib import shutdown
+from lib.shutdown import FleetShutdown, stop_process
+
+# Waits for a line on stdin (the stand-in for RCON "quit"), then exits
+QUITS_ON_STDIN = "import sys; sys.stdin.readline()"
+# Ignores SIGTERM, so only kill stops it
+IGNORES_TERM = (
+    "import signal, sys, time;"
+    " signal.signal(signal.SIGTERM, signal.SIG_IGN);"
+    " print('ready', flush=True);"
+    " time.sleep(60)"
+)
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts(monkeypatch):
+    monkeypatch.setattr(shutdown, "QUIT_TIMEOUT", 2.0)
+    monkeypatch.setattr(shutdown, "TERMINATE_TIMEOUT", 2.0)
+    monkeypatch.setattr(shutdown, "KILL_TIMEOUT", 2.0)
+
+
+@pytest.fixture
+def spawn():
+    processes = []
+
+    def start(code, **kwargs):
+        process = subprocess.Popen([sys.executable, "-c", code], **kwargs)
+        processes.append(process)
+        return process
+
+    yield start
+    for process in processes:
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+        for stream in (process.stdin, process.stdout):
+            if stream:
+                stream.close()
+
+
+def send_line(process):
+    def send_quit():
+        process.stdin.write(b"quit\n")
+        process.stdin.flush()
+
+    return send_quit
+
+
+def test_already_exited(spawn):
+    process = spawn("pass")
+    process.wait()
+    stages = []
+    assert stop_process(process, on_stage=stages.append) == "exited"
+    assert stages == []
+
+
+def test_quit_is_tried_first(spawn):
+    process = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    stages = []
+    assert stop_process(process, send_line(process), on_stage=stages.append) == "quit"
+    assert stages == ["quit"]
+
+
+def test_failed_quit_escalates_to_terminate(spawn):
+    process = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    stages = []
+
+    def send_quit():
+        raise ConnectionRefusedError("no rcon")
+
+    assert stop_process(process, send_quit, on_stage=stages.append) == "terminate"
+    assert stages == ["quit", "terminate"]
+
+
+def test_without_quit_terminate_is_first(spawn):
+    process = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    stages = []
+    assert stop_process(process, on_stage=stages.append) == "terminate"
+    assert stages == ["terminate"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="terminate is already a hard kill on Windows")
+def test_ignored_terminate_escalates_to_kill(spawn):
+    process = spawn(IGNORES_TERM, stdout=subprocess.PIPE)
+    assert process.stdout.readline() == b"ready\n"
+    stages = []
+    assert stop_process(process, on_stage=stages.append) == "kill"
+    assert stages == ["terminate", "kill"]
+
+
+def test_budget_shortens_the_quit_wait(spawn, monkeypatch):
+    monkeypatch.setattr(shutdown, "QUIT_TIMEOUT", 30.0)
+    process = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    started = time.monotonic()
+    assert stop_process(process, lambda: None, budget=2.0) == "terminate"
+    assert time.monotonic() - started < 2.0
+
+
+def test_fleet_shutdown_stops_every_server(spawn):
+    quitting = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    plain = spawn(QUITS_ON_STDIN, stdin=subprocess.PIPE)
+    fleet = FleetShutdown([("a", quitting, send_line(quitting)), ("b", plain, None)])
+    deadline = time.monotonic() + 10
+    while not fleet.done() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert fleet.done()
+    assert fleet.snapshot() == {"a": "quit", "b": "terminate"}